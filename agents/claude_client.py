@@ -13,6 +13,10 @@ The interface is simple:
   send(user_message, image_path=...) → response text (single image)
   send(user_message, image_paths=[...]) → response text (multiple images)
 
+user_message and system_prompt may each be a string or a list of
+content blocks (assemble.render_prompt) — blocks carry cache_control
+breakpoints through to the API. The CLI fallback flattens them.
+
 Everything else (assembly, parsing, ingestion) doesn't care
 how the prompt gets to Claude and back.
 """
@@ -27,7 +31,7 @@ import subprocess
 import tempfile
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Callable
+from typing import Callable, Union
 from urllib.request import Request, urlopen
 from urllib.error import HTTPError, URLError
 
@@ -49,13 +53,27 @@ class ClaudeResponse:
     text: str                         # the response text
     success: bool                     # did it work
     error: str | None = None          # error message if not
+    usage: dict | None = None         # API usage: input/output tokens, cache reads/writes
+
+
+# A prompt part: plain text, or content blocks (text blocks, cache_control)
+Content = Union[str, list[dict]]
+
+
+def flatten_content(content: Content | None) -> str:
+    """Blocks → the plain text they carry. Strings pass through."""
+    if content is None:
+        return ""
+    if isinstance(content, str):
+        return content
+    return "".join(b.get("text", "") for b in content if b.get("type") == "text")
 
 
 def send(
-    user_message: str,
+    user_message: Content,
     config: ClaudeConfig | None = None,
     image_path: Path | None = None,
-    system_prompt: str | None = None,
+    system_prompt: Content | None = None,
     image_paths: list[Path] | None = None,
 ) -> ClaudeResponse:
     """
@@ -82,9 +100,9 @@ def send(
             return _send_api(user_message, c, images, system_prompt)
         else:
             # CLI fallback — system prompt gets folded into the user message
-            full = user_message
+            full = flatten_content(user_message)
             if system_prompt:
-                full = system_prompt + "\n\n---\n\n" + user_message
+                full = flatten_content(system_prompt) + "\n\n---\n\n" + full
             return _send_cli(full, c, images[0] if images else None)
     except Exception as e:
         return ClaudeResponse(
@@ -95,10 +113,10 @@ def send(
 
 
 def send_streaming(
-    user_message: str,
+    user_message: Content,
     config: ClaudeConfig | None = None,
     image_path: Path | None = None,
-    system_prompt: str | None = None,
+    system_prompt: Content | None = None,
     on_chunk: Callable[[str], None] | None = None,
     image_paths: list[Path] | None = None,
 ) -> ClaudeResponse:
@@ -159,30 +177,31 @@ def _encode_image(image_path: Path) -> dict | None:
     }
 
 
-def _send_api(
-    user_message: str,
+def _build_body(
+    user_message: Content,
     config: ClaudeConfig,
-    image_paths: list[Path] | None = None,
-    system_prompt: str | None = None,
-) -> ClaudeResponse:
-    """Send via Anthropic Messages API using raw HTTP. No third-party deps."""
-    api_key = config.api_key or os.environ.get("ANTHROPIC_API_KEY")
-    if not api_key:
-        raise RuntimeError(
-            "No API key. Set ANTHROPIC_API_KEY or api_key in config."
-        )
-
-    # Build user content — text, optionally with images
-    content: list[dict] = []
-
+    image_paths: list[Path] | None,
+    system_prompt: Content | None,
+) -> dict:
+    """Messages API request body. Images go after any cached prefix."""
+    images: list[dict] = []
     for img_path in (image_paths or []):
         block = _encode_image(img_path)
         if block:
-            content.append(block)
-
-    content.append({"type": "text", "text": user_message})
+            images.append(block)
+
+    if isinstance(user_message, str):
+        content = images + [{"type": "text", "text": user_message}]
+    else:
+        # Blocks: images right after the last cache breakpoint, so the
+        # cached prefix stays byte-identical with or without an image
+        blocks = [dict(b) for b in user_message]
+        cut = 0
+        for i, b in enumerate(blocks):
+            if "cache_control" in b:
+                cut = i + 1
+        content = blocks[:cut] + images + blocks[cut:]
 
-    # Build the request body
     body: dict = {
         "model": config.model,
         "max_tokens": config.max_tokens,
@@ -192,6 +211,24 @@ def _send_api(
     if system_prompt:
         body["system"] = system_prompt
 
+    return body
+
+
+def _send_api(
+    user_message: Content,
+    config: ClaudeConfig,
+    image_paths: list[Path] | None = None,
+    system_prompt: Content | None = None,
+) -> ClaudeResponse:
+    """Send via Anthropic Messages API using raw HTTP. No third-party deps."""
+    api_key = config.api_key or os.environ.get("ANTHROPIC_API_KEY")
+    if not api_key:
+        raise RuntimeError(
+            "No API key. Set ANTHROPIC_API_KEY or api_key in config."
+        )
+
+    body = _build_body(user_message, config, image_paths, system_prompt)
+
     data = json.dumps(body).encode("utf-8")
 
     req = Request(
@@ -220,14 +257,14 @@ def _send_api(
         if block.get("type") == "text":
             text += block.get("text", "")
 
-    return ClaudeResponse(text=text, success=True)
+    return ClaudeResponse(text=text, success=True, usage=result.get("usage"))
 
 
 def _send_api_streaming(
-    user_message: str,
+    user_message: Content,
     config: ClaudeConfig,
     image_paths: list[Path] | None = None,
-    system_prompt: str | None = None,
+    system_prompt: Content | None = None,
     on_chunk: Callable[[str], None] | None = None,
 ) -> ClaudeResponse:
     """Stream via Anthropic Messages API with SSE."""
@@ -235,25 +272,8 @@ def _send_api_streaming(
     if not api_key:
         raise RuntimeError("No API key.")
 
-    # Build content (same as _send_api)
-    content: list[dict] = []
-
-    for img_path in (image_paths or []):
-        block = _encode_image(img_path)
-        if block:
-            content.append(block)
-
-    content.append({"type": "text", "text": user_message})
-
-    body: dict = {
-        "model": config.model,
-        "max_tokens": config.max_tokens,
-        "messages": [{"role": "user", "content": content}],
-        "stream": True,
-    }
-
-    if system_prompt:
-        body["system"] = system_prompt
+    body = _build_body(user_message, config, image_paths, system_prompt)
+    body["stream"] = True
 
     data = json.dumps(body).encode("utf-8")
 
@@ -269,6 +289,7 @@ def _send_api_streaming(
     )
 
     full_text = ""
+    usage: dict = {}
 
     try:
         with urlopen(req, timeout=config.timeout_seconds) as resp:
@@ -289,7 +310,15 @@ def _send_api_streaming(
 
                 etype = event.get("type", "")
 
-                if etype == "content_block_delta":
+                if etype == "message_start":
+                    # Input side, including cache reads/writes
+                    usage.update(event.get("message", {}).get("usage") or {})
+
+                elif etype == "message_delta":
+                    # Output token count arrives at the end
+                    usage.update(event.get("usage") or {})
+
+                elif etype == "content_block_delta":
                     delta = event.get("delta", {})
                     if delta.get("type") == "text_delta":
                         text = delta.get("text", "")
@@ -313,7 +342,7 @@ def _send_api_streaming(
     except URLError as e:
         raise RuntimeError(f"Network error: {e.reason}")
 
-    return ClaudeResponse(text=full_text, success=True)
+    return ClaudeResponse(text=full_text, success=True, usage=usage or None)
 
 
 def _guess_media_type(path: Path) -> str:
@@ -25,6 +25,10 @@ from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
 
+from ingest.bulk import BulkMessage, write_batch
+from ingest.parse import ParsedMessage
+from wake.display import project_event
+
 from .runner import Agent, AgentResult
 
 
@@ -318,22 +322,14 @@ def _upsert_fragment(
     now: str,
     inventory: str | None = None,
 ) -> None:
-    """Insert or update a fragment."""
-    existing = conn.execute(
-        "SELECT key FROM fragments WHERE key = ?", (key,)
-    ).fetchone()
-
-    if existing:
-        conn.execute("""
-            UPDATE fragments
-            SET ambient = ?, recognition = ?, inventory = ?, updated_at = ?
-            WHERE key = ?
-        """, (ambient, recognition, inventory, now, key))
-    else:
-        conn.execute("""
-            INSERT INTO fragments (key, ambient, recognition, inventory, created_at, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (key, ambient, recognition, inventory, now, now))
+    """Insert or update a fragment — one statement, no existence check."""
+    conn.execute("""
+        INSERT INTO fragments (key, ambient, recognition, inventory, created_at, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT(key) DO UPDATE SET
+            ambient = excluded.ambient, recognition = excluded.recognition,
+            inventory = excluded.inventory, updated_at = excluded.updated_at
+    """, (key, ambient, recognition, inventory, now, now))
 
 
 # --- Event ingestion ---
@@ -357,27 +353,21 @@ def _ingest_as_events(
     # Try to split on natural boundaries
     chunks = _chunk_text(text)
 
-    for i, chunk in enumerate(chunks):
-        cursor = conn.execute(
-            "INSERT INTO ev.events (ts, content, actor) VALUES (?, ?, ?)",
-            (now, chunk, actor),
-        )
-        event_id = cursor.lastrowid
-
-        # Tag with source info
-        conn.execute(
-            "INSERT OR IGNORE INTO ev.event_tags (event_id, tag) VALUES (?, ?)",
-            (event_id, source_tag),
-        )
-
-        # Add any user-specified tags
-        for tag in spec.tags:
-            conn.execute(
-                "INSERT OR IGNORE INTO ev.event_tags (event_id, tag) VALUES (?, ?)",
-                (event_id, tag),
+    # One batch: events, source + user tags, display rows. Chunks are
+    # stored as-is — no working memory, no turn.
+    written = write_batch(
+        conn,
+        [
+            BulkMessage(
+                parsed=ParsedMessage(actor=actor, raw=chunk, untagged=chunk),
+                ts=now,
+                tags=[source_tag, *spec.tags],
             )
-
-        result.events_created += 1
+            for chunk in chunks
+        ],
+        apply_lifecycle=False,
+    )
+    result.events_created += written.messages
 
     result.notes.append(
         f"Events from {spec.path.name}: {len(chunks)} chunk(s)"
@@ -444,3 +434,4 @@ def _log_source_event(
         "INSERT OR IGNORE INTO ev.event_tags (event_id, tag) VALUES (?, ?)",
         (event_id, f"file:{spec.path.name}"),
     )
+    project_event(conn, event_id)
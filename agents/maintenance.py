@@ -16,6 +16,9 @@ import sqlite3
 from datetime import datetime, timezone
 from pathlib import Path
 
+from wake.display import project_event
+from wake.key_registry import key_exists
+
 from .claude_client import ClaudeConfig, send as claude_send
 from .runner import Agent, AgentResult
 
@@ -167,10 +170,11 @@ class MaintenanceAgent(Agent):
 
         if reasoning:
             now = datetime.now(timezone.utc).isoformat()
-            conn.execute(
+            cursor = conn.execute(
                 "INSERT INTO ev.events (ts, content, actor) VALUES (?, ?, ?)",
                 (now, f"[maintenance/{self.run_type}] {reasoning}", "system"),
             )
+            project_event(conn, cursor.lastrowid)
             result.events_created += 1
 
         return result
@@ -352,11 +356,7 @@ def _apply_create_fragment(
     key = op["key"]
 
     # Try INSERT; if key exists, fall back to UPDATE
-    existing = conn.execute(
-        "SELECT key FROM fragments WHERE key = ?", (key,)
-    ).fetchone()
-
-    if existing:
+    if key_exists(conn, key):
         # Fall back to update
         result.notes.append(
             f"CREATE_FRAGMENT '{key}' already exists, updating instead."
@@ -459,6 +459,7 @@ def _link_source_events(
     result: AgentResult | None = None,
 ) -> None:
     """Link fragment to source events, filtering to known valid IDs."""
+    links = []
     for eid in source_events:
         if not isinstance(eid, int):
             if result:
@@ -468,11 +469,12 @@ def _link_source_events(
             if result:
                 result.errors.append(f"source_event {eid} not in valid window, skipping")
             continue
-        conn.execute(
-            """INSERT OR IGNORE INTO fragment_sources
-               (fragment_key, event_id) VALUES (?, ?)""",
-            (fragment_key, eid),
-        )
+        links.append((fragment_key, eid))
+    conn.executemany(
+        """INSERT OR IGNORE INTO fragment_sources
+           (fragment_key, event_id) VALUES (?, ?)""",
+        links,
+    )
 
 
 class BootstrapAgent(Agent):
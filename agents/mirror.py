@@ -22,6 +22,7 @@ from .claude_client import ClaudeConfig, send as claude_send
 from .runner import Agent, AgentResult
 from wake.schema import connect
 from wake.summaries_schema import connect_summaries, migrate_summaries
+from wake.tags import tokenize
 
 
 # Models for each pipeline pass
@@ -52,8 +53,10 @@ PASS_MAX_TOKENS = {
 def calculate_do_density(events: list[sqlite3.Row]) -> float:
     """Calculate DO-density: chars inside <do> tags / total display tag chars.
 
-    Uses regex to find display tag content. Mono's messages (actor != 'claude')
-    are excluded from density calculation since they don't have display tags.
+    Per-tag character counts come from the event's stored tag scan
+    (event_spans.tag_chars, when the row carries it), else one
+    tokenize() pass. Mono's messages (actor != 'claude') are excluded
+    from density calculation since they don't have display tags.
     """
     do_chars = 0
     display_chars = 0
@@ -76,14 +79,11 @@ def calculate_do_density(events: list[sqlite3.Row]) -> float:
             continue
 
         # Count chars inside display tags for Claude's responses
+        stored = event["tag_chars"] if "tag_chars" in event.keys() else None
+        tag_chars = json.loads(stored) if stored else tokenize(content).tag_chars
         for tag in ("say", "do", "narrate"):
-            for match in re.finditer(
-                rf"<{tag}>(.*?)</{tag}>", content, re.DOTALL
-            ):
-                tag_content = match.group(1)
-                display_chars += len(tag_content)
-                if tag == "do":
-                    do_chars += len(tag_content)
+            display_chars += tag_chars.get(tag, 0)
+        do_chars += tag_chars.get("do", 0)
 
     if display_chars == 0:
         return 0.0
@@ -209,9 +209,11 @@ def should_fire_mirror(mem_conn: sqlite3.Connection, sum_conn: sqlite3.Connectio
 
     # Load new events for analysis
     new_events = mem_conn.execute("""
-        SELECT id, content, actor, ts
-        FROM ev.events WHERE id > ?
-        ORDER BY id ASC
+        SELECT e.id, e.content, e.actor, e.ts, s.tag_chars
+        FROM ev.events e
+        LEFT JOIN ev.event_spans s ON s.event_id = e.id
+        WHERE e.id > ?
+        ORDER BY e.id ASC
     """, (since_id,)).fetchall()
 
     # High-intensity override — check recent events only
@@ -309,9 +311,10 @@ class MirrorAgent(Agent):
         # Load uncompressed events
         events = conn.execute("""
             SELECT e.id, e.ts, e.content, e.actor,
-                   GROUP_CONCAT(t.tag) as tags
+                   GROUP_CONCAT(t.tag) as tags, s.tag_chars
             FROM ev.events e
             LEFT JOIN ev.event_tags t ON t.event_id = e.id
+            LEFT JOIN ev.event_spans s ON s.event_id = e.id
             WHERE e.id > ?
             GROUP BY e.id
             ORDER BY e.id ASC
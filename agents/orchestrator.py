@@ -10,28 +10,49 @@ This is the main pipeline:
   6. Handle any recall requests
   7. Return the response
 
+When streaming, parsing and lookups happen while 4 is still arriving:
+each span is published the moment its closing tag lands, and each
+recall() is looked up as soon as its parenthesis closes. Nothing is
+written until the call returns — then the reply, its lifecycle and the
+recall it asked for go in with one short transaction.
+
+With a ReplyJournal (agents/writebehind.py), that transaction happens
+after the turn returns: the reply is journalled, and applied on a
+background thread before the next turn reads anything.
+
 One function: turn(). Everything else is internal.
 """
 
 from __future__ import annotations
 
-import json
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Callable
+from typing import TYPE_CHECKING, Callable
 
-from wake.assemble import assemble, render_system, render_user, snapshot_manifest, WakeConfig
-from wake.recall import recall, RecallResult, NeighborResult
-from wake.schema import connect, migrate
+from wake.assemble import (
+    assemble, render_prompt, render_system, render_user, snapshot_manifest, WakeConfig,
+)
+from wake.recall import (
+    encode_recall, load_pending_recall, recall_multi, recall_requests,
+    write_pending_recall, RecallResult,
+)
+from wake.schema import ensure_schema
+from wake.session import TurnSession
 from ingest.parse import (
+    ParsedMessage,
+    StreamParser,
+    TaggedSpan,
+    extract_fragment_keys,
     parse_mono_message,
-    parse_response,
     parse_recall_requests,
 )
 from ingest.lifecycle import ingest
 from .claude_client import send, send_streaming, ClaudeConfig, ClaudeResponse
 
+if TYPE_CHECKING:
+    from .writebehind import ReplyJournal
+
 
 @dataclass
 class TurnConfig:
@@ -42,6 +63,10 @@ class TurnConfig:
     ambient_path: Path
     claude_config: ClaudeConfig = field(default_factory=ClaudeConfig)
     context_dir: Path | None = None  # data/context/ — if None, derived from db_path
+    wm_selector: str = "greedy"      # working memory selection: "greedy" or "knapsack"
+    same_turn_recall: bool = False   # recall [keys] in Mono's message into this turn
+    write_behind: ReplyJournal | None = None  # journal Claude's reply, apply it after returning
+    on_error: Callable[[str], None] | None = None  # told about non-fatal failures (snapshot, usage)
 
 
 @dataclass
@@ -55,58 +80,120 @@ class TurnResult:
     recall_results: list[RecallResult] = field(default_factory=list)
     success: bool = True
     error: str | None = None
+    usage: dict | None = None       # API usage, incl. cache_read_input_tokens
 
 
-def _load_recall_results(db_path: Path) -> list[RecallResult]:
-    """Load pending recall results from the state table."""
-    conn = connect(db_path)
-    try:
-        row = conn.execute(
-            "SELECT value FROM state WHERE key = 'pending_recall'"
-        ).fetchone()
-        if not row:
-            return []
-        data = json.loads(row["value"])
-        results = []
-        for item in data:
-            neighbors = [
-                NeighborResult(key=n["key"], ambient=n["ambient"], relation=n["relation"])
-                for n in item.get("neighbors", [])
-            ]
-            results.append(RecallResult(
-                key=item["key"], content=item["content"],
-                depth=item["depth"], neighbors=neighbors,
-            ))
-        return results
-    finally:
-        conn.close()
-
-
-def _save_recall_results(db_path: Path, results: list[RecallResult]) -> None:
+def _report(config: TurnConfig, message: str) -> None:
+    """Pass a non-fatal failure to whoever is listening."""
+    if config.on_error:
+        config.on_error(message)
+
+
+# Most [keys] from one message that are looked up in the same turn
+SAME_TURN_MAX_KEYS = 3
+
+
+def _same_turn_recall(
+    session: TurnSession,
+    message: str,
+    previous: list[RecallResult],
+) -> list[RecallResult]:
+    """Look up the [keys] Mono named, so they land in this turn's context.
+
+    Keys already waiting from last turn's recall are skipped. Unknown
+    keys just don't come back. No API call — this is the Gem only.
+    """
+    seen = {r.key for r in previous}
+    keys = []
+    for key in extract_fragment_keys(message):
+        if key not in seen:
+            seen.add(key)
+            keys.append(key)
+    if not keys:
+        return []
+    return recall_multi(keys[:SAME_TURN_MAX_KEYS], session)
+
+
+def _save_recall_results(session: TurnSession, results: list[RecallResult]) -> None:
     """Persist recall results in state table for next turn, or clear if empty."""
-    conn = connect(db_path)
-    try:
-        if not results:
-            conn.execute("DELETE FROM state WHERE key = 'pending_recall'")
-        else:
-            data = [
-                {
-                    "key": r.key, "content": r.content, "depth": r.depth,
-                    "neighbors": [
-                        {"key": n.key, "ambient": n.ambient, "relation": n.relation}
-                        for n in r.neighbors
-                    ],
-                }
-                for r in results
-            ]
-            now = datetime.now(timezone.utc).isoformat()
-            conn.execute(
-                "INSERT OR REPLACE INTO state (key, value, updated_at) VALUES ('pending_recall', ?, ?)",
-                (json.dumps(data), now),
-            )
-        conn.commit()
-    finally:
-        conn.close()
+    with session.transaction() as conn:
+        write_pending_recall(conn, encode_recall(results))
+
+
+def _store_reply(
+    session: TurnSession,
+    config: TurnConfig,
+    text: str,
+    parsed: ParsedMessage,
+    recall_results: list[RecallResult],
+) -> None:
+    """Ingest the reply and save its recall in one transaction — or journal the lot."""
+    if config.write_behind is not None:
+        config.write_behind.append(text, recall_results)
+        return
+    with session.transaction():
+        ingest(session, parsed, is_claude=True)
+        _save_recall_results(session, recall_results)
+
+
+# Tags the frontend renders — the only spans published mid-stream
+DISPLAY_SPAN_TAGS = ("say", "do", "narrate")
+
+
+class _Reply:
+    """Claude's reply as it arrives: parsed, recalled, published.
+
+    Feed it text deltas (or the whole text at once). Nothing is written
+    here — the Gem's write lock isn't held across the API call. Lookups
+    are reads, so they run as their recall() closes.
+
+    feed() runs inside send_streaming()'s callback, which answers any
+    exception by starting over with a second, non-streaming send(). So
+    a lookup that fails mid-stream doesn't raise: it and every request
+    after it wait for finish(), which runs after the call and may.
+    """
+
+    def __init__(
+        self,
+        session: TurnSession,
+        on_span: Callable[[dict], None] | None = None,
+    ):
+        self.session = session
+        self.on_span = on_span
+        self.parser = StreamParser()
+        self.published = 0
+        self.recall_results: list[RecallResult] = []
+        self.deferred: list[tuple[str, bool]] = []  # lookups left for finish()
+
+    def feed(self, text: str) -> None:
+        spans, recalls = self.parser.feed(text)
+        for span in spans:
+            self._publish(span)
+        if recalls and not self.deferred:
+            try:
+                self._recall(recalls)
+                return
+            except Exception:
+                pass
+        self.deferred.extend(recalls)
+
+    def finish(self) -> ParsedMessage:
+        """Settle whatever the stream left open. Returns the full parse."""
+        parsed = self.parser.close()
+        for span in parsed.spans[self.published:]:
+            self._publish(span)
+        remaining = parse_recall_requests(self.parser.text)[len(self.parser.recalls):]
+        self._recall(self.deferred + remaining)
+        self.deferred = []
+        return parsed
+
+    def _publish(self, span: TaggedSpan) -> None:
+        self.published += 1
+        if self.on_span and span.tag in DISPLAY_SPAN_TAGS:
+            self.on_span({"tag": span.tag, "content": span.content})
+
+    def _recall(self, requests: list[tuple[str, bool]]) -> None:
+        self.recall_results.extend(recall_requests(requests, self.session, suggest=True))
 
 
 def turn(
@@ -116,20 +203,52 @@ def turn(
     tags: list[str] | None = None,
     image_path: str | None = None,
     on_chunk: Callable[[str], None] | None = None,
+    on_span: Callable[[dict], None] | None = None,
 ) -> TurnResult:
     """
     Run a single conversation turn.
 
     Mono sends a message → Claude responds → everything gets stored.
     This is the main entry point for the conversation loop.
+
+    The whole turn runs on one TurnSession. Mono's message commits on
+    its own (it must survive a failed API call); Claude's reply and the
+    recall it asked for commit together once the call has returned — or,
+    with config.write_behind, are journalled together and committed
+    after the turn returns.
+
+    on_chunk gets raw text deltas; on_span gets each completed display
+    span ({"tag", "content"}) as soon as it closes. Either turns on
+    streaming.
     """
-    # Ensure schema is current
-    migrate(config.db_path)
+    # One connection for the whole turn — setup cost paid once
+    with TurnSession(config.db_path) as session:
+        # Migration runs at worker startup; this is a cached header check
+        ensure_schema(session.conn, config.db_path)
+        return _run_turn(
+            session, config, message, actor, tags, image_path, on_chunk, on_span,
+        )
+
+
+def _run_turn(
+    session: TurnSession,
+    config: TurnConfig,
+    message: str,
+    actor: str | None,
+    tags: list[str] | None,
+    image_path: str | None,
+    on_chunk: Callable[[str], None] | None,
+    on_span: Callable[[dict], None] | None,
+) -> TurnResult:
+    # Last turn's reply, if it's still being written behind, goes in
+    # first: it comes before this message, and assembly must see it
+    if config.write_behind is not None:
+        config.write_behind.drain()
 
     # 1. Parse and ingest Mono's message
     mono_parsed = parse_mono_message(message, actor=actor, tags=tags)
     mono_result = ingest(
-        config.db_path, mono_parsed,
+        session, mono_parsed,
         image_path=image_path,
     )
 
@@ -139,31 +258,42 @@ def turn(
         wake_context_path=config.wake_context_path,
         wake_context_image_path=config.wake_context_image_path,
         ambient_path=config.ambient_path,
+        wm_selector=config.wm_selector,
     )
 
     # Format hot context with identity — same convention as Recent section
     hot = f"{actor or 'mono'}: {message}"
 
-    previous_recall = _load_recall_results(config.db_path)
+    previous_recall = load_pending_recall(session.conn)
+    same_turn = None
+    if config.same_turn_recall:
+        same_turn = _same_turn_recall(session, message, previous_recall)
     package = assemble(
         wake_config,
         hot_context=hot,
         current_turn=mono_result.turn,
         recall_results=previous_recall,
         image_path=image_path,
+        session=session,
+        same_turn_recall=same_turn,
     )
 
+    # Content blocks with cache breakpoints; the flat text is the same
+    # prompt, kept for the snapshot
+    system_blocks, user_blocks = render_prompt(package)
     system_prompt = render_system(package)
     user_message = render_user(package)
 
     # Snapshot — record what the Heart sees this turn
+    ctx_path = None
+    snapshot_id = None
     try:
         from wake.context_schema import save_snapshot
         ctx_dir = config.context_dir or config.db_path.parent / "context"
         today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
         ctx_path = ctx_dir / f"{today}.sqlite"
         token_counts, items_included = snapshot_manifest(package)
-        save_snapshot(
+        snapshot_id = save_snapshot(
             ctx_path,
             turn=mono_result.turn,
             system_text=system_prompt,
@@ -171,23 +301,42 @@ def turn(
             token_counts=token_counts,
             items_included=items_included,
         )
-    except Exception:
-        pass  # snapshot failures never break conversation
+    except Exception as e:
+        # Snapshot failures never break conversation, but they get reported
+        _report(config, f"context snapshot failed: {e}")
 
-    # 3. Send to Claude
+    # 3-6. Send to Claude, then ingest the reply and save its recall.
+    # When streaming, spans are published and recall looked up as they
+    # arrive; the writes wait for the call to return.
     img = Path(image_path) if image_path else None
-    if on_chunk:
+    streaming = on_chunk is not None or on_span is not None
+    reply = _Reply(session, on_span)
+
+    def on_delta(text: str) -> None:
+        if on_chunk:
+            on_chunk(text)
+        reply.feed(text)
+
+    if streaming:
         claude_response = send_streaming(
-            user_message, config.claude_config, img,
-            system_prompt=system_prompt,
-            on_chunk=on_chunk,
+            user_blocks, config.claude_config, img,
+            system_prompt=system_blocks or None,
+            on_chunk=on_delta,
         )
     else:
         claude_response = send(
-            user_message, config.claude_config, img,
-            system_prompt=system_prompt,
+            user_blocks, config.claude_config, img,
+            system_prompt=system_blocks or None,
         )
 
+    # Cache hits / writes for this turn, next to what was sent
+    if claude_response.usage and snapshot_id is not None:
+        try:
+            from wake.context_schema import save_usage
+            save_usage(ctx_path, snapshot_id, claude_response.usage)
+        except Exception as e:
+            _report(config, f"saving usage for snapshot {snapshot_id} failed: {e}")
+
     if not claude_response.success:
         return TurnResult(
             response_text="",
@@ -199,31 +348,22 @@ def turn(
             error=claude_response.error,
         )
 
-    # 4. Parse Claude's response
-    response_parsed = parse_response(claude_response.text)
-
-    # 5. Ingest Claude's response
-    ingest(
-        config.db_path, response_parsed,
-        is_claude=True,
-    )
+    if reply.parser.text != claude_response.text:
+        # Not streamed — or the stream broke and send_streaming() fell
+        # back to a plain send. Nothing was written: parse the full text.
+        reply = _Reply(session)
+        reply.feed(claude_response.text)
 
-    # 6. Handle recall requests
-    recall_requests = parse_recall_requests(claude_response.text)
-    recall_results = []
-    for key, deep in recall_requests:
-        result = recall(key, config.db_path, deep=deep)
-        if result:
-            recall_results.append(result)
+    response_parsed = reply.finish()
+    _store_reply(session, config, claude_response.text, response_parsed, reply.recall_results)
 
-    # Save recall results for next turn's context
-    _save_recall_results(config.db_path, recall_results)
+    recall_results = reply.recall_results
 
     # 7. Extract display content for the frontend
     display_spans = []
     display_parts = []
     for span in response_parsed.spans:
-        if span.tag in ("say", "do", "narrate"):
+        if span.tag in DISPLAY_SPAN_TAGS:
             display_parts.append(span.content)
             display_spans.append({"tag": span.tag, "content": span.content})
     display_text = "\n".join(display_parts)
@@ -236,4 +376,5 @@ def turn(
         turn=mono_result.turn,
         recall_results=recall_results,
         success=True,
+        usage=claude_response.usage,
     )
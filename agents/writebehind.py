@@ -0,0 +1,241 @@
+"""
+Write-behind — Claude's reply reaches the Gem after Mono has it.
+
+Without it, turn() ingests the reply, runs its lifecycle and saves the
+recall it asked for before returning, and the worker only completes the
+job after that. With a ReplyJournal in TurnConfig, the turn appends the
+reply to a journal file instead — one line, fsync'd — and returns. A
+background thread applies each entry in its own transaction: the event,
+tags and display row, working memory, pending_recall.
+
+The journal is the durable copy until then. Each entry has a sequence
+number, and the transaction that applies it records that number in
+state, so an entry is applied once however often it is replayed: after
+a crash, whatever the journal holds past the recorded number goes in on
+the next start. Once the queue is empty the file is truncated.
+
+Consistency: drain() blocks until everything journalled is in the Gem.
+turn() calls it before ingesting Mono's next message, so that message
+lands after the reply it answers and assembly sees everything the reply
+changed. If the background apply failed, drain() retries in the
+caller's thread and raises if it still can't — better a failed turn
+than one assembled from half the state.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+
+from ingest.bulk import BulkMessage, write_batch
+from ingest.parse import parse_response
+from wake.recall import RecallResult, encode_recall, write_pending_recall
+from wake.session import TurnSession
+
+
+# Journal file, next to the Gem
+JOURNAL_NAME = "reply_journal.jsonl"
+
+# state key: sequence number of the last entry applied
+STATE_KEY = "writebehind_applied"
+
+
+@dataclass
+class JournalEntry:
+    """One reply waiting to be applied."""
+    seq: int
+    ts: str                             # when the reply arrived (event ts)
+    text: str                           # Claude's full reply
+    recall: list[dict] = field(default_factory=list)  # pending_recall, as stored in state
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _applied(conn: sqlite3.Connection) -> int:
+    row = conn.execute("SELECT value FROM state WHERE key = ?", (STATE_KEY,)).fetchone()
+    return int(row["value"]) if row else 0
+
+
+def apply_entry(db_path: Path, entry: JournalEntry) -> bool:
+    """Apply one entry in its own transaction. False if it was already in.
+
+    The write locks are taken up front: a deferred transaction that has
+    read the Gem can't wait for another writer, it fails at once.
+    """
+    with TurnSession(db_path) as session, session.transaction() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        if _applied(conn) >= entry.seq:
+            return False
+        write_batch(conn, [BulkMessage(parse_response(entry.text), is_claude=True, ts=entry.ts)])
+        write_pending_recall(conn, entry.recall)
+        conn.execute(
+            """INSERT INTO state (key, value, updated_at) VALUES (?, ?, ?)
+               ON CONFLICT(key) DO UPDATE SET value = excluded.value,
+                                              updated_at = excluded.updated_at""",
+            (STATE_KEY, str(entry.seq), _now_iso()),
+        )
+    return True
+
+
+class ReplyJournal:
+    """The journal file and the thread that applies it.
+
+    One per worker process — the worker's lock keeps it to one writer.
+    Entries left from a previous run are queued on construction and
+    applied first.
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        path: Path | None = None,
+        on_error: Callable[[Exception], None] | None = None,
+    ):
+        self.db_path = Path(db_path)
+        self.path = Path(path) if path else self.db_path.parent / JOURNAL_NAME
+        self.on_error = on_error
+        self._cond = threading.Condition()
+        self._pending: deque[JournalEntry] = deque()
+        self._failed: Exception | None = None
+        self._closed = False
+
+        with TurnSession(self.db_path) as session:
+            applied = _applied(session.conn)
+        self._pending.extend(e for e in self._read() if e.seq > applied)
+        self._seq = max([applied] + [e.seq for e in self._pending])
+        # Rewrite without applied entries or a torn last line
+        self._rewrite()
+
+        self._thread = threading.Thread(target=self._run, name="reply-journal", daemon=True)
+        self._thread.start()
+
+    @property
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._pending)
+
+    def append(self, text: str, recall_results: list[RecallResult]) -> JournalEntry:
+        """Journal a reply. Returns once it is on disk."""
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("reply journal is closed")
+            entry = JournalEntry(
+                seq=self._seq + 1, ts=_now_iso(), text=text,
+                recall=encode_recall(recall_results),
+            )
+            created = not self.path.exists()
+            with self.path.open("a", encoding="utf-8") as f:
+                f.write(json.dumps(asdict(entry)) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            if created:
+                self._fsync_dir()
+            self._seq = entry.seq
+            self._pending.append(entry)
+            self._cond.notify_all()
+            return entry
+
+    def drain(self) -> None:
+        """Block until every journalled reply is in the Gem."""
+        with self._cond:
+            while self._pending and self._failed is None:
+                self._cond.wait()
+            if self._failed is None:
+                return
+            # The thread gave up on an entry: try here, raise if it still fails
+            while self._pending:
+                try:
+                    apply_entry(self.db_path, self._pending[0])
+                except Exception as e:
+                    self._failed = e
+                    raise
+                self._pending.popleft()
+            self._failed = None
+            self._truncate()
+
+    def close(self) -> None:
+        """Apply what's queued and stop the thread.
+
+        Whatever can't be applied stays in the journal for the next start.
+        """
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+        try:
+            self.drain()
+        except Exception as e:
+            if self.on_error:
+                self.on_error(e)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while (not self._pending or self._failed is not None) and not self._closed:
+                    self._cond.wait()
+                if not self._pending or self._failed is not None:
+                    return
+                entry = self._pending[0]
+            try:
+                apply_entry(self.db_path, entry)
+            except Exception as e:
+                with self._cond:
+                    self._failed = e
+                    self._cond.notify_all()
+                if self.on_error:
+                    self.on_error(e)
+                continue
+            with self._cond:
+                self._pending.popleft()
+                if not self._pending:
+                    self._truncate()
+                self._cond.notify_all()
+
+    def _read(self) -> list[JournalEntry]:
+        if not self.path.exists():
+            return []
+        entries = []
+        with self.path.open(encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entries.append(JournalEntry(**json.loads(line)))
+                except (ValueError, TypeError):
+                    # A torn write: append never returned, the job never completed
+                    continue
+        return entries
+
+    def _rewrite(self) -> None:
+        if not self._pending:
+            self._truncate()
+            return
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            for entry in self._pending:
+                f.write(json.dumps(asdict(entry)) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        self._fsync_dir()
+
+    def _truncate(self) -> None:
+        # Everything in it is applied; a truncate lost to a crash just
+        # means those entries are skipped again on the next start
+        if self.path.exists():
+            with self.path.open("w", encoding="utf-8"):
+                pass
+
+    def _fsync_dir(self) -> None:
+        fd = os.open(self.path.parent, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Backfill the display projection (event_display) and tag scan
+(event_spans) in events.sqlite.
+
+New events are projected as they are written. This covers events that
+predate either table, in batches with a commit between each, so it
+can run against a live log and be interrupted and resumed.
+
+Usage:
+  python backfill_display.py
+  python backfill_display.py --events data/events.sqlite --batch 2000
+  python backfill_display.py --rebuild     # re-project every event
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Project root — where this script lives
+ROOT = Path(__file__).resolve().parent
+
+# Add project root to path so imports work
+sys.path.insert(0, str(ROOT))
+
+from wake.display import create_display_table, backfill_display
+from wake.tags import create_spans_table
+from wake.events_schema import connect_events
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Project old events into event_display and event_spans."
+    )
+    parser.add_argument(
+        "--events", default=None,
+        help="Path to events.sqlite (default: data/events.sqlite).",
+    )
+    parser.add_argument(
+        "--batch", type=int, default=1000,
+        help="Events per transaction (default: 1000).",
+    )
+    parser.add_argument(
+        "--rebuild", action="store_true",
+        help="Drop existing projections and re-project everything.",
+    )
+
+    args = parser.parse_args()
+
+    events_path = Path(args.events) if args.events else ROOT / "data" / "events.sqlite"
+    if not events_path.exists():
+        print(f"Error: events database not found at {events_path}", file=sys.stderr)
+        return 1
+
+    conn = connect_events(events_path)
+    try:
+        create_display_table(conn, "main")
+        create_spans_table(conn, "main")
+
+        if args.rebuild:
+            conn.execute("DELETE FROM event_display")
+            conn.execute("DELETE FROM event_spans")
+            conn.commit()
+
+        total = 0
+        while True:
+            n = backfill_display(conn, "main", limit=args.batch)
+            conn.commit()
+            if n == 0:
+                break
+            total += n
+            print(f"  projected {total} events...")
+
+        print(f"Done. {total} events projected.")
+    finally:
+        conn.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-fragment score() vs score_batch().
+
+Builds random working-memory-shaped fragments (every persistence type,
+timed and open plans, pressure on), checks that score_batch() matches
+score() to 1e-9, and times both at 1k / 10k / 100k items.
+
+Usage:
+  python bench/bench_decay.py
+  python bench/bench_decay.py --sizes 1000 50000 --repeat 5
+"""
+
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timezone, timedelta
+from pathlib import Path
+
+# Project root — one level up from bench/
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from wake import decay
+from wake.decay import (
+    ContextFragment,
+    DecayParams,
+    Persistence,
+    PERSISTENCE_CODES,
+    score,
+)
+
+
+def make_fragments(n: int, now: datetime, current_turn: int, seed: int) -> list[ContextFragment]:
+    rng = random.Random(seed)
+    kinds = list(Persistence)
+    frags = []
+    for _ in range(n):
+        persistence = rng.choice(kinds)
+        created = now - timedelta(hours=rng.uniform(0, 24 * 30))
+        refreshed = created + timedelta(hours=rng.uniform(0, 24)) if rng.random() < 0.3 else None
+        due = None
+        if persistence == Persistence.PLAN and rng.random() < 0.7:
+            due = created + timedelta(hours=rng.uniform(-12, 24 * 20))
+        frags.append(ContextFragment(
+            content="",
+            timestamp=created,
+            turn_number=rng.randint(0, current_turn),
+            persistence=persistence,
+            refreshed_at=refreshed,
+            due=due,
+        ))
+    return frags
+
+
+def columns(frags: list[ContextFragment]) -> tuple:
+    return (
+        [f.decay_anchor.timestamp() for f in frags],
+        [f.timestamp.timestamp() for f in frags],
+        [f.turn_number for f in frags],
+        [PERSISTENCE_CODES[f.persistence] for f in frags],
+        [f.due.timestamp() if f.due else None for f in frags],
+    )
+
+
+def best_of(repeat: int, fn) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark batch decay scoring.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    now = datetime.now(timezone.utc)
+    current_turn = 2000
+    params = DecayParams(pressure=0.4)
+
+    have_numpy = decay.np is not None
+    print(f"numpy: {'yes' if have_numpy else 'not installed — batch uses the pure-Python path'}")
+    print(f"{'n':>8}  {'score()':>10}  {'batch py':>10}  {'batch np':>10}  {'speedup':>8}  {'max |diff|':>10}")
+
+    for n in args.sizes:
+        frags = make_fragments(n, now, current_turn, args.seed)
+        cols = columns(frags)
+
+        reference = [score(f, now, current_turn, params) for f in frags]
+        py = decay._score_batch_py(*cols, now.timestamp(), current_turn, params)
+        max_diff = max(abs(a - b) for a, b in zip(reference, py))
+        if have_numpy:
+            vec = decay._score_batch_np(*cols, now.timestamp(), current_turn, params)
+            max_diff = max(max_diff, max(abs(a - float(b)) for a, b in zip(reference, vec)))
+
+        t_ref = best_of(args.repeat, lambda: [score(f, now, current_turn, params) for f in frags])
+        t_py = best_of(args.repeat, lambda: decay._score_batch_py(
+            *cols, now.timestamp(), current_turn, params))
+        t_np = None
+        if have_numpy:
+            t_np = best_of(args.repeat, lambda: decay._score_batch_np(
+                *cols, now.timestamp(), current_turn, params))
+
+        fastest = t_np if t_np is not None else t_py
+        print(
+            f"{n:>8}  {t_ref * 1000:>8.1f}ms  {t_py * 1000:>8.1f}ms  "
+            f"{(f'{t_np * 1000:.1f}ms' if t_np is not None else '—'):>10}  "
+            f"{t_ref / fastest:>7.1f}x  {max_diff:>10.2e}"
+        )
+
+        if max_diff > 1e-9:
+            print(f"PARITY FAILED at n={n}: max diff {max_diff:.3e}", file=sys.stderr)
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
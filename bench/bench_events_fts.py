@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Benchmark: events.sqlite size and search latency, standalone vs
+external-content events_fts.
+
+Builds a scratch events.sqlite in the v2 layout (standalone FTS5, its
+own copy of every body), fills it with synthetic turns, and measures
+file size after VACUUM and search_events() latency through the ev
+attachment. Then runs the online rebuild (events_schema v3), measures
+again, and checks both layouts return the same ids and snippets.
+
+Usage:
+  python bench/bench_events_fts.py
+  python bench/bench_events_fts.py --events 200000 --words 120 --repeat 5
+"""
+
+import argparse
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Project root — one level up from bench/
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from wake import events_schema
+from wake.events_schema import connect_events, migrate_events
+from wake.search import search_events
+
+SYLLABLES = ["ka", "ri", "mo", "lu", "na", "shi", "to", "ve", "ra", "en", "ko", "sa", "mi", "el"]
+QUERIES = ["wardrobe", "crochet sweater", '"body training"', "yarn OR desk", "tue*"]
+
+
+def make_word(rng: random.Random) -> str:
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+
+
+def populate(events_path: Path, count: int, words: int, seed: int) -> None:
+    """A v2 events.sqlite — the layout before v3 — with count events."""
+    rng = random.Random(seed)
+    vocab = [make_word(rng) for _ in range(8000)]
+    terms = ["wardrobe", "crochet", "sweater", "body training", "yarn", "desk", "tuesday"]
+
+    conn = connect_events(events_path)
+    events_schema._create_v1(conn)
+    events_schema._migrate_v1_to_v2(conn)
+    conn.execute("CREATE TABLE IF NOT EXISTS schema_version (version INTEGER NOT NULL)")
+    conn.execute("INSERT INTO schema_version (version) VALUES (2)")
+
+    def body() -> str:
+        picked = rng.choices(vocab, k=rng.randint(words // 2, words * 3 // 2))
+        if rng.random() < 0.05:
+            picked.insert(rng.randrange(len(picked)), rng.choice(terms))
+        return " ".join(picked)
+
+    conn.executemany(
+        "INSERT INTO events (ts, content, actor) VALUES (?, ?, ?)",
+        [
+            (f"2026-01-01T00:00:{i:06d}", body(), rng.choice(["mono", "claude"]))
+            for i in range(count)
+        ],
+    )
+    conn.commit()
+    conn.execute("VACUUM")
+    conn.close()
+
+
+def measure(events_path: Path, repeat: int) -> tuple[float, dict]:
+    """(best-of latency per query, results per query) through ev.*"""
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    conn.execute("ATTACH DATABASE ? AS ev", (str(events_path),))
+    timings, results = {}, {}
+    for query in QUERIES:
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            rows = search_events(conn, query)
+            best = min(best, time.perf_counter() - start)
+        timings[query] = best
+        results[query] = [(r["id"], r["snippet"]) for r in rows]
+    conn.close()
+    return timings, results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark events_fts layouts.")
+    parser.add_argument("--events", type=int, default=100_000)
+    parser.add_argument("--words", type=int, default=80, help="mean words per event")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        events_path = Path(tmp) / "events.sqlite"
+        start = time.perf_counter()
+        populate(events_path, args.events, args.words, args.seed)
+        print(f"{args.events} events, built in {time.perf_counter() - start:.1f}s\n")
+
+        size_before = events_path.stat().st_size
+        t_before, r_before = measure(events_path, args.repeat)
+
+        start = time.perf_counter()
+        migrate_events(events_path)
+        t_migrate = time.perf_counter() - start
+        conn = connect_events(events_path)
+        conn.execute("VACUUM")
+        conn.close()
+
+        size_after = events_path.stat().st_size
+        t_after, r_after = measure(events_path, args.repeat)
+
+        print(f"{'':>18}  {'standalone':>12}  {'external':>12}")
+        print(f"{'file size':>18}  {size_before / 1e6:>9.1f} MB  {size_after / 1e6:>9.1f} MB"
+              f"   ({size_after / size_before:.0%})")
+        for query in QUERIES:
+            print(f"{query:>18}  {t_before[query] * 1000:>10.2f}ms  {t_after[query] * 1000:>10.2f}ms"
+                  f"   {len(r_after[query])} hits")
+        print(f"\nonline rebuild: {t_migrate:.1f}s")
+
+        if r_before != r_after:
+            print("MISMATCH: layouts returned different results", file=sys.stderr)
+            return 1
+        print("results identical (ids + snippets)")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Benchmark: multi-hop neighbor expansion over fragment_edges.
+
+Builds a random Gem-shaped graph (fragments with ambient tiers, a few
+edges each, a handful of hubs), then times CSR build and one expand()
+per random seed set for ppr and bfs, against the one-hop SQL pull
+recall() used to do.
+
+Usage:
+  python bench/bench_graph.py
+  python bench/bench_graph.py --nodes 500 5000 --degree 6 --queries 500
+"""
+
+import argparse
+import random
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+# Project root — one level up from bench/
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from wake.fragment_cache import FragmentCache
+from wake.graph import FragmentGraph
+
+
+def make_gem(n: int, degree: int, seed: int) -> sqlite3.Connection:
+    rng = random.Random(seed)
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    conn.executescript("""
+        CREATE TABLE fragments (key TEXT PRIMARY KEY, ambient TEXT, recognition TEXT, inventory TEXT);
+        CREATE TABLE fragment_edges (source_key TEXT, target_key TEXT, relation TEXT,
+                                     PRIMARY KEY (source_key, target_key));
+        CREATE INDEX idx_fragment_edges_source ON fragment_edges(source_key);
+    """)
+    keys = [f"key-{i}" for i in range(n)]
+    conn.executemany(
+        "INSERT INTO fragments VALUES (?, ?, ?, NULL)",
+        [(k, f"{k} " + "word " * rng.randint(5, 40), "rec") for k in keys],
+    )
+    hubs = keys[: max(n // 50, 1)]
+    edges = set()
+    for k in keys:
+        for _ in range(rng.randint(1, degree)):
+            other = rng.choice(hubs) if rng.random() < 0.2 else rng.choice(keys)
+            if other != k:
+                edges.add((k, other))
+    conn.executemany(
+        "INSERT INTO fragment_edges VALUES (?, ?, ?)",
+        [(a, b, rng.choice(["aesthetic-overlap", "domain-inventory", None])) for a, b in edges],
+    )
+    return conn
+
+
+def one_hop_sql(conn: sqlite3.Connection, key: str) -> list:
+    return conn.execute(
+        """SELECT f.key, f.ambient, e.relation FROM fragment_edges e
+           JOIN fragments f ON f.key = e.target_key WHERE e.source_key = ?""",
+        (key,),
+    ).fetchall()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark graph expansion.")
+    parser.add_argument("--nodes", type=int, nargs="+", default=[500, 5_000, 50_000])
+    parser.add_argument("--degree", type=int, default=6)
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--budget", type=int, default=400)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    print(f"{'nodes':>7}  {'edges':>7}  {'build':>8}  {'1-hop sql':>10}  "
+          f"{'ppr':>9}  {'bfs':>9}  {'ppr keys':>8}")
+
+    for n in args.nodes:
+        conn = make_gem(n, args.degree, args.seed)
+        edge_count = conn.execute("SELECT COUNT(*) FROM fragment_edges").fetchone()[0]
+
+        start = time.perf_counter()
+        cache = FragmentCache()
+        cache.load(conn, generation=0)
+        graph = FragmentGraph(cache)
+        build = time.perf_counter() - start
+
+        rng = random.Random(args.seed)
+        seed_sets = [rng.sample(graph.keys, rng.randint(1, 3)) for _ in range(args.queries)]
+
+        start = time.perf_counter()
+        for seeds in seed_sets:
+            for key in seeds:
+                one_hop_sql(conn, key)
+        t_sql = (time.perf_counter() - start) / args.queries
+
+        start = time.perf_counter()
+        picked = 0
+        for seeds in seed_sets:
+            picked += len(graph.expand(seeds, args.budget, method="ppr"))
+        t_ppr = (time.perf_counter() - start) / args.queries
+
+        start = time.perf_counter()
+        for seeds in seed_sets:
+            graph.expand(seeds, args.budget, method="bfs")
+        t_bfs = (time.perf_counter() - start) / args.queries
+
+        print(
+            f"{n:>7}  {edge_count:>7}  {build * 1000:>6.1f}ms  {t_sql * 1e6:>8.0f}µs  "
+            f"{t_ppr * 1e6:>7.0f}µs  {t_bfs * 1e6:>7.0f}µs  {picked / args.queries:>8.1f}"
+        )
+        conn.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Benchmark: importing a message log, ingest() per message vs ingest_many().
+
+Generates a synthetic chat log — Mono's messages and Claude's tagged
+replies, with plans, pins and their done / drop modifiers — and loads
+it into three scratch Gems:
+
+  ingest    — ingest() per message, one transaction each
+  many      — ingest_many(), events_fts kept current by its triggers
+  deferred  — ingest_many(defer_fts=True), events_fts built at the end
+
+Events, tags, display rows, spans, working memory (bar due dates, which
+read the clock), the turn counter and events_fts search results must
+come out the same in all three.
+
+Usage:
+  python bench/bench_ingest_many.py
+  python bench/bench_ingest_many.py --messages 100000 --batch 5000
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Project root — one level up from bench/
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from ingest.bulk import BATCH_SIZE, BulkMessage, ingest_many
+from ingest.lifecycle import ingest
+from ingest.parse import parse_mono_message, parse_response
+from wake.events_schema import migrate_events
+from wake.schema import connect, migrate
+
+SYLLABLES = ["ka", "ri", "mo", "lu", "na", "shi", "to", "ve", "ra", "en", "ko", "sa", "mi", "el"]
+TAGS = ["say", "say", "do", "narrate", "feeling", "thought", "plan", "pin", "desc"]
+QUERIES = ["wardrobe", "crochet sweater", "yarn OR desk", "tue*"]
+
+
+def make_word(rng: random.Random) -> str:
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+
+
+def make_log(count: int, seed: int) -> list[tuple[bool, str, list[str]]]:
+    """(is_claude, text, Mono's frontend tags), alternating-ish turns."""
+    rng = random.Random(seed)
+    vocab = [make_word(rng) for _ in range(4000)] + ["wardrobe", "crochet", "sweater", "yarn", "desk", "tuesday"]
+
+    def words(n: int) -> str:
+        return " ".join(rng.choices(vocab, k=n))
+
+    log = []
+    for _ in range(count):
+        if rng.random() < 0.5:
+            parts = ["<claude>"]
+            for _ in range(rng.randint(1, 4)):
+                tag = rng.choice(TAGS)
+                body = words(rng.randint(3, 20))
+                if tag == "plan" and rng.random() < 0.3:
+                    body = rng.choice(["done ", "cancel "]) + body
+                elif tag == "pin" and rng.random() < 0.3:
+                    body = "drop " + body
+                elif tag == "desc":
+                    body = f"{make_word(rng)}: {body}"
+                parts.append(f"<{tag}>{body}</{tag}>")
+            log.append((True, "".join(parts), []))
+        else:
+            log.append((False, words(rng.randint(2, 30)), rng.choice([[], ["say"], ["do"], ["plan"]])))
+    return log
+
+
+def parsed(is_claude: bool, text: str, tags: list[str]):
+    return parse_response(text) if is_claude else parse_mono_message(text, actor="hasuki", tags=tags)
+
+
+def fresh_gem(directory: Path) -> Path:
+    """A Gem at the current schema with events.sqlite split out."""
+    directory.mkdir()
+    db_path = directory / "silentstar.sqlite"
+    migrate_events(directory / "events.sqlite")
+    migrate(db_path)
+    return db_path
+
+
+def snapshot(db_path: Path) -> dict:
+    conn = connect(db_path)
+    try:
+        out = {
+            "events": conn.execute("SELECT id, ts, content, actor FROM ev.events ORDER BY id").fetchall(),
+            "tags": conn.execute("SELECT event_id, tag FROM ev.event_tags ORDER BY 1, 2").fetchall(),
+            # ts aside: ingest() wrote now there, before the restamp
+            "display": [
+                tuple(row)[:1] + tuple(row)[2:]
+                for row in conn.execute("SELECT * FROM ev.event_display ORDER BY event_id")
+            ],
+            "spans": conn.execute("SELECT * FROM ev.event_spans ORDER BY event_id").fetchall(),
+            "working_memory": conn.execute(
+                """SELECT id, event_id, type, content, subject, actor, status, turn
+                   FROM working_memory ORDER BY id"""
+            ).fetchall(),
+            "turn": conn.execute("SELECT value FROM state WHERE key = 'current_turn'").fetchone(),
+        }
+        for query in QUERIES:
+            out[f"fts {query}"] = conn.execute(
+                "SELECT rowid FROM ev.events_fts WHERE events_fts MATCH ? ORDER BY rowid", (query,)
+            ).fetchall()
+        return {key: [tuple(r) for r in rows] if isinstance(rows, list) else tuple(rows or ())
+                for key, rows in out.items()}
+    finally:
+        conn.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark bulk ingest.")
+    parser.add_argument("--messages", type=int, default=10_000)
+    parser.add_argument("--batch", type=int, default=BATCH_SIZE)
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+
+    log = make_log(args.messages, args.seed)
+    # One timestamp per message, shared by every run, so rows compare equal
+    stamps = [f"2025-03-01T00:00:00.{i:06d}+00:00" for i in range(len(log))]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        snapshots = {}
+        print(f"{args.messages} messages, batch {args.batch}\n")
+
+        db_path = fresh_gem(tmp / "ingest")
+        start = time.perf_counter()
+        for is_claude, text, tags in log:
+            result = ingest(db_path, parsed(is_claude, text, tags), is_claude=is_claude)
+        elapsed = time.perf_counter() - start
+        # ingest() stamps now; restamp so the runs compare
+        conn = connect(db_path)
+        conn.executemany("UPDATE ev.events SET ts = ? WHERE id = ?",
+                         [(ts, i) for i, ts in enumerate(stamps, result.event_id - len(log) + 1)])
+        conn.commit()
+        conn.close()
+        snapshots["ingest"] = snapshot(db_path)
+        print(f"{'ingest':>10}  {elapsed:>7.2f}s  {args.messages / elapsed:>8.0f} msg/s")
+
+        for name, defer in (("many", False), ("deferred", True)):
+            db_path = fresh_gem(tmp / name)
+            messages = (
+                BulkMessage(parsed(is_claude, text, tags), is_claude=is_claude, ts=ts)
+                for (is_claude, text, tags), ts in zip(log, stamps)
+            )
+            result = ingest_many(db_path, messages, batch_size=args.batch, defer_fts=defer)
+            snapshots[name] = snapshot(db_path)
+            extra = f"  ({result.fts_indexed} indexed at the end)" if defer else ""
+            print(f"{name:>10}  {result.seconds:>7.2f}s  {args.messages / result.seconds:>8.0f} msg/s{extra}")
+
+    for name in ("many", "deferred"):
+        for key, rows in snapshots["ingest"].items():
+            if snapshots[name][key] != rows:
+                print(f"MISMATCH {name}: {key}", file=sys.stderr)
+                return 1
+
+    print("\nsame events, tags, display, spans, working memory, turn and search results")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Benchmark: linking WM items to the [keys] they mention.
+
+Fills a scratch Gem with fragments, then ingests pin-heavy messages
+whose pins mention k bracketed keys, some real, some not, and times the
+linking step two ways:
+
+  query     — SELECT 1 FROM fragments WHERE key = ? per key, one INSERT
+              per link (how _create_wm_item did it)
+  registry  — key_registry.existing_keys() for the lot, one executemany
+
+Both must link the same (wm_id, key) pairs. k is stepped up to show
+which one grows with it.
+
+Usage:
+  python bench/bench_key_registry.py
+  python bench/bench_key_registry.py --fragments 50000 --keys 1 8 32 128
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Project root — one level up from bench/
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from ingest.parse import extract_fragment_keys
+from wake.fragment_cache import get_cache
+from wake.key_registry import existing_keys
+from wake.schema import connect, migrate
+
+SYLLABLES = ["ka", "ri", "mo", "lu", "na", "shi", "to", "ve", "ra", "en", "ko", "sa", "mi", "el"]
+
+
+def make_key(rng: random.Random) -> str:
+    return "-".join(
+        "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3)))
+        for _ in range(rng.randint(1, 2))
+    )
+
+
+def link_by_query(conn, wm_id: int, content: str) -> None:
+    for key in extract_fragment_keys(content):
+        if conn.execute("SELECT 1 FROM fragments WHERE key = ?", (key,)).fetchone():
+            conn.execute(
+                "INSERT OR IGNORE INTO working_memory_refs (wm_id, fragment_key) VALUES (?, ?)",
+                (wm_id, key),
+            )
+
+
+def link_by_registry(conn, wm_id: int, content: str) -> None:
+    keys = extract_fragment_keys(content)
+    if keys:
+        found = existing_keys(conn, keys)
+        conn.executemany(
+            "INSERT OR IGNORE INTO working_memory_refs (wm_id, fragment_key) VALUES (?, ?)",
+            [(wm_id, key) for key in dict.fromkeys(keys) if key in found],
+        )
+
+
+def run(conn, link, pins: list[str]) -> tuple[float, list[tuple]]:
+    conn.execute("DELETE FROM working_memory_refs")
+    conn.execute("DELETE FROM working_memory")
+    conn.executemany(
+        """INSERT INTO working_memory (id, type, content, status, created_at, refreshed_at)
+           VALUES (?, 'pin', ?, 'active', '2025-01-01', '2025-01-01')""",
+        list(enumerate(pins, 1)),
+    )
+    conn.commit()
+    start = time.perf_counter()
+    for wm_id, content in enumerate(pins, 1):
+        link(conn, wm_id, content)
+    conn.commit()
+    elapsed = time.perf_counter() - start
+    links = conn.execute("SELECT wm_id, fragment_key FROM working_memory_refs ORDER BY 1, 2").fetchall()
+    return elapsed, [tuple(r) for r in links]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark WM → fragment key linking.")
+    parser.add_argument("--fragments", type=int, default=20_000)
+    parser.add_argument("--keys", type=int, nargs="+", default=[1, 4, 16, 64],
+                        help="bracketed keys per pin, stepped through")
+    parser.add_argument("--pins", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "silentstar.sqlite"
+        migrate(db_path)
+        conn = connect(db_path)
+        keys = list(dict.fromkeys(make_key(rng) for _ in range(args.fragments)))
+        conn.executemany(
+            """INSERT INTO fragments (key, ambient, created_at, updated_at)
+               VALUES (?, ?, '2025-01-01', '2025-01-01')""",
+            [(key, f"about {key}") for key in keys],
+        )
+        conn.commit()
+        get_cache(conn, db_path)  # as a worker has it after the first recall
+
+        print(f"{len(keys)} fragments, {args.pins} pins per run\n")
+        print(f"{'keys/pin':>8}  {'query':>10}  {'registry':>10}  {'links':>7}")
+        for k in args.keys:
+            pins = [
+                " ".join(
+                    f"[{rng.choice(keys) if rng.random() < 0.7 else make_key(rng) + '-x'}]"
+                    for _ in range(k)
+                )
+                for _ in range(args.pins)
+            ]
+            t_query, by_query = run(conn, link_by_query, pins)
+            t_registry, by_registry = run(conn, link_by_registry, pins)
+            if by_query != by_registry:
+                print(f"MISMATCH at {k} keys per pin", file=sys.stderr)
+                return 1
+            print(
+                f"{k:>8}  {t_query / args.pins * 1e6:>8.1f}µs  "
+                f"{t_registry / args.pins * 1e6:>8.1f}µs  {len(by_registry):>7}"
+            )
+        conn.close()
+
+    print("\nsame links both ways")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Benchmark: resolving a plan / pin by description, scan vs word index.
+
+Fills a scratch Gem with active plans and pins, active patterns (what
+the Mirror keeps staging) and resolved history, then times picking the
+item a <plan>done ...</plan> or <pin>drop ...</pin> would take:
+
+  scan   — every active item of the type, word overlap scored in Python
+           (how _match_and_update did it)
+  index  — candidates from working_memory_resolvable_fts, only those
+           scored (lifecycle._rank_candidates)
+
+Both must choose the same item for every query. Then the live set is
+grown and timed again, to show how each scales.
+
+Usage:
+  python bench/bench_resolve.py
+  python bench/bench_resolve.py --active 2000 8000 32000 --queries 500
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Project root — one level up from bench/
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from ingest.lifecycle import MATCH_THRESHOLD, _rank_candidates
+from wake.schema import connect, migrate
+
+SYLLABLES = ["ka", "ri", "mo", "lu", "na", "shi", "to", "ve", "ra", "en", "ko", "sa", "mi", "el"]
+COMMON = ["the", "a", "to", "for", "with", "and", "on", "—", "again", "tea."]
+
+
+def make_word(rng: random.Random) -> str:
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+
+
+def sentence(rng: random.Random, vocab: list[str], n: int) -> str:
+    words = [rng.choice(COMMON) if rng.random() < 0.25 else rng.choice(vocab) for _ in range(n)]
+    return " ".join(w.capitalize() if rng.random() < 0.1 else w for w in words)
+
+
+def populate(conn, rng: random.Random, vocab: list[str], active: int, history: int) -> None:
+    now = datetime.now(timezone.utc).isoformat()
+    rows = []
+    for _ in range(active):
+        wm_type = rng.choice(["plan", "pin", "pattern", "pattern"])
+        rows.append((wm_type, sentence(rng, vocab, rng.randint(3, 14)), "active", now, now))
+    for _ in range(history):
+        wm_type = rng.choice(["plan", "pin", "pattern"])
+        rows.append((wm_type, sentence(rng, vocab, rng.randint(3, 14)), "resolved", now, now))
+    conn.executemany(
+        """INSERT INTO working_memory (type, content, status, created_at, refreshed_at)
+           VALUES (?, ?, ?, ?, ?)""",
+        rows,
+    )
+    conn.commit()
+
+
+def scan(conn, wm_type: str, query: str) -> int | None:
+    """The old _match_and_update choice."""
+    rows = conn.execute(
+        "SELECT id, content FROM working_memory WHERE type = ? AND status = 'active'",
+        (wm_type,),
+    ).fetchall()
+    q_words = set(query.lower().split())
+    best_id, best_score = None, -1.0
+    for row in rows:
+        c_words = set(row["content"].lower().split())
+        score = len(q_words & c_words) / max(len(q_words), len(c_words)) if q_words and c_words else 0.0
+        if score > best_score:
+            best_id, best_score = row["id"], score
+    return best_id if best_score >= MATCH_THRESHOLD else None
+
+
+def index(conn, wm_type: str, query: str) -> int | None:
+    best = _rank_candidates(conn, wm_type, query, 1, MATCH_THRESHOLD)
+    return best[0].id if best and best[0].chosen else None
+
+
+def make_queries(conn, rng: random.Random, vocab: list[str], n: int) -> list[tuple[str, str]]:
+    """Mostly paraphrases of live items, some misses."""
+    live = conn.execute(
+        "SELECT type, content FROM working_memory WHERE status = 'active' AND type IN ('plan', 'pin')"
+    ).fetchall()
+    queries = []
+    for _ in range(n):
+        if live and rng.random() < 0.8:
+            row = rng.choice(live)
+            words = row["content"].split()
+            picked = rng.sample(words, k=max(1, len(words) * rng.randint(2, 4) // 5))
+            picked += [rng.choice(vocab) for _ in range(rng.randint(0, 2))]
+            queries.append((row["type"], " ".join(picked)))
+        else:
+            queries.append((rng.choice(["plan", "pin"]), sentence(rng, vocab, rng.randint(2, 6))))
+    return queries
+
+
+def timed(fn, conn, queries) -> tuple[float, list]:
+    start = time.perf_counter()
+    chosen = [fn(conn, wm_type, query) for wm_type, query in queries]
+    return time.perf_counter() - start, chosen
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark plan/pin resolution.")
+    parser.add_argument("--active", type=int, nargs="+", default=[1000, 4000, 16000],
+                        help="live set sizes to step through (plans, pins, patterns)")
+    parser.add_argument("--history", type=int, default=50_000, help="resolved rows")
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    vocab = [make_word(rng) for _ in range(6000)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "silentstar.sqlite"
+        migrate(db_path)
+        conn = connect(db_path)
+        populate(conn, rng, vocab, 0, args.history)
+
+        print(f"{args.history} resolved rows, {args.queries} queries per size\n")
+        print(f"{'active':>8}  {'scan':>10}  {'index':>10}  {'chosen':>6}")
+        have = 0
+        for size in args.active:
+            populate(conn, rng, vocab, size - have, 0)
+            have = size
+            queries = make_queries(conn, rng, vocab, args.queries)
+
+            t_scan, by_scan = timed(scan, conn, queries)
+            t_index, by_index = timed(index, conn, queries)
+            for (wm_type, query), a, b in zip(queries, by_scan, by_index):
+                if a != b:
+                    print(f"MISMATCH {wm_type} {query!r}: scan {a}, index {b}", file=sys.stderr)
+                    return 1
+
+            print(
+                f"{size:>8}  {t_scan / len(queries) * 1000:>8.3f}ms  "
+                f"{t_index / len(queries) * 1000:>8.3f}ms  "
+                f"{sum(c is not None for c in by_index):>6}"
+            )
+        conn.close()
+
+    print("\nsame item chosen for every query")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Benchmark: the decay sweep, stored bounds vs scoring every row.
+
+Fills a scratch Gem with active working memory written over a busy
+stretch — TURNS_PER_DAY turns a day for --days days — then lets Mono go
+quiet for --idle hours and sweeps two copies of it:
+
+  scored  — score every active row, mark what's below SWEEP_THRESHOLD
+  bounds  — sweep_decayed(): rows past expires_at / expires_turn,
+            re-scored before they're marked
+
+bounds may be late (a row can cross on the product of both axes before
+either bound passes), never early: everything it marks must be below
+threshold, and marked by scored too.
+
+It also pins the idle-user case on its own: one item of each type
+written as the busy stretch ends, then --idle hours with no turns. A
+pin is still at 0.70 after a week of that; whatever is above threshold
+must still be active.
+
+Usage:
+  python bench/bench_sweep.py
+  python bench/bench_sweep.py --items 50000 --idle 171
+"""
+
+import argparse
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Project root — one level up from bench/
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from wake.decay import (
+    SWEEP_THRESHOLD,
+    WM_TYPE_TO_PERSISTENCE,
+    ContextFragment,
+    DecayParams,
+    _sweep_scored,
+    expiry_bounds,
+    score,
+    sweep_decayed,
+)
+from wake.events_schema import migrate_events
+from wake.schema import connect, migrate
+
+TURNS_PER_DAY = 100
+TYPES = ["feeling", "thought", "desc", "pin", "pattern"]
+
+
+def fill(db_path: Path, items: int, days: float, idle: float, seed: int) -> tuple[datetime, int, list[int]]:
+    """Write the busy stretch. Returns (now, current_turn, pinned ids)."""
+    rng = random.Random(seed)
+    now = datetime(2026, 3, 1, tzinfo=timezone.utc)
+    quiet_from = now - timedelta(hours=idle)
+    start = quiet_from - timedelta(days=days)
+    current_turn = int(days * TURNS_PER_DAY)
+
+    conn = connect(db_path)
+    conn.execute(
+        "INSERT INTO ev.events (ts, content, actor) VALUES (?, 'first', 'mono')",
+        (start.isoformat(),),
+    )
+    conn.execute(
+        "INSERT OR REPLACE INTO state (key, value, updated_at) VALUES ('current_turn', ?, ?)",
+        (str(current_turn), now.isoformat()),
+    )
+
+    def row(wm_type: str, created: datetime, turn: int) -> tuple:
+        expires_at, expires_turn = expiry_bounds(WM_TYPE_TO_PERSISTENCE[wm_type], created, created, turn)
+        return (
+            wm_type, f"{wm_type} {turn}", turn, created.isoformat(), created.isoformat(),
+            expires_at.isoformat() if expires_at else None, expires_turn,
+        )
+
+    rows = []
+    for _ in range(items):
+        elapsed = rng.uniform(0, days)
+        rows.append(row(
+            rng.choice(TYPES),
+            start + timedelta(days=elapsed),
+            int(elapsed * TURNS_PER_DAY),
+        ))
+    # Written as the busy stretch ended, then nothing
+    pinned = [row(wm_type, quiet_from, current_turn) for wm_type in TYPES]
+
+    insert = """INSERT INTO working_memory
+                    (type, content, status, turn, created_at, refreshed_at, expires_at, expires_turn)
+                VALUES (?, ?, 'active', ?, ?, ?, ?, ?)"""
+    conn.executemany(insert, rows)
+    first_pinned = conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM working_memory").fetchone()[0]
+    conn.executemany(insert, pinned)
+    conn.commit()
+    conn.close()
+    return now, current_turn, list(range(first_pinned, first_pinned + len(pinned)))
+
+
+def swept(db_path: Path) -> set[int]:
+    conn = connect(db_path)
+    try:
+        return {r[0] for r in conn.execute("SELECT id FROM working_memory WHERE status = 'decayed'")}
+    finally:
+        conn.close()
+
+
+def current_score(db_path: Path, wm_id: int, now: datetime, current_turn: int) -> float:
+    conn = connect(db_path)
+    try:
+        r = conn.execute("SELECT type, turn, created_at FROM working_memory WHERE id = ?", (wm_id,)).fetchone()
+    finally:
+        conn.close()
+    created = datetime.fromisoformat(r["created_at"])
+    return score(ContextFragment(
+        content="", timestamp=created, turn_number=r["turn"],
+        persistence=WM_TYPE_TO_PERSISTENCE[r["type"]], refreshed_at=created,
+    ), now, current_turn)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the decay sweep.")
+    parser.add_argument("--items", type=int, default=20_000)
+    parser.add_argument("--days", type=float, default=30.0, help="busy stretch, at 100 turns a day")
+    parser.add_argument("--idle", type=float, default=171.0, help="hours with no turns since")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        migrate_events(tmp / "events.sqlite")
+        db_path = tmp / "silentstar.sqlite"
+        migrate(db_path)
+        now, current_turn, pinned = fill(db_path, args.items, args.days, args.idle, args.seed)
+
+        copies = {}
+        for name in ("scored", "bounds"):
+            (tmp / name).mkdir()
+            for f in ("silentstar.sqlite", "events.sqlite"):
+                shutil.copy(tmp / f, tmp / name / f)
+            copies[name] = tmp / name / "silentstar.sqlite"
+
+        times = {}
+        for name, sweep in (
+            ("scored", lambda conn: _sweep_scored(conn, now, current_turn, DecayParams())),
+            ("bounds", lambda conn: sweep_decayed(conn, now, current_turn)),
+        ):
+            conn = connect(copies[name])
+            start = time.perf_counter()
+            sweep(conn)
+            conn.commit()
+            times[name] = time.perf_counter() - start
+            conn.close()
+
+        by_score, by_bounds = swept(copies["scored"]), swept(copies["bounds"])
+        print(f"{args.items} active items over {args.days:g} days, then {args.idle:g}h idle\n")
+        for name, marked in (("scored", by_score), ("bounds", by_bounds)):
+            print(f"{name:>8}  {times[name] * 1000:>8.1f}ms  {len(marked):>6} swept")
+
+        early = by_bounds - by_score
+        if early:
+            print(f"EARLY: {len(early)} rows swept above threshold", file=sys.stderr)
+            return 1
+        print(f"\nwritten {args.idle:g}h ago, no turns since:")
+        for wm_type, wm_id in zip(TYPES, pinned):
+            s = current_score(copies["bounds"], wm_id, now, current_turn)
+            print(f"{wm_type:>8}  score {s:.3f}  {'swept' if wm_id in by_bounds else 'active'}")
+            if wm_id in by_bounds and s >= SWEEP_THRESHOLD:
+                print(f"EARLY: idle {wm_type} swept at score {s:.3f}", file=sys.stderr)
+                return 1
+        print(f"\nnothing swept early; {len(by_score) - len(by_bounds)} left for a later sweep")
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
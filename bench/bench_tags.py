@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Benchmark: one tokenize() pass vs the per-consumer regexes it replaced.
+
+Generates synthetic events (Claude replies with say / do / narrate and
+WM tags, Mono messages, some malformed) and times everything a stored
+event used to go through:
+
+  regexes   — TAG_PATTERN finditer + sub (parse), the display-tag and
+              strip regexes (display), three finditers (DO-density)
+  tokenize  — one tokenize(); parse, display and density all read it
+  stored    — DO-density from event_spans.tag_chars, no parse at all
+
+Then a pathological case: one message full of unclosed openers, where
+the backtracking regex goes quadratic and the tokenizer stays linear.
+
+Usage:
+  python bench/bench_tags.py
+  python bench/bench_tags.py --events 200000 --seed 3
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+# Project root — one level up from bench/
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from wake.display import project_display
+from wake.schema import ALL_TAGS, DISPLAY_TAGS, IDENTITY_TAGS
+from wake.tags import tokenize
+
+WORDS = ["the", "soft", "grey", "sweater", "window", "desk", "yarn", "quiet", "tuesday",
+         "laughs", "leans", "closer", "mm", "okay", "wardrobe", "light", "tea", "again"]
+
+# The regexes as they were
+TAG_PATTERN = re.compile(
+    r"<(" + "|".join(re.escape(t) for t in ALL_TAGS) + r")>(.*?)</\1>", re.DOTALL,
+)
+DISPLAY_TAG_RE = re.compile(
+    r"<(" + "|".join(re.escape(t) for t in DISPLAY_TAGS) + r")>(.*?)</\1>", re.DOTALL,
+)
+TAG_STRIP_RE = re.compile(
+    r"</?(" + "|".join(re.escape(t) for t in ALL_TAGS | IDENTITY_TAGS) + r")>",
+)
+
+
+def sentence(rng: random.Random, n: int) -> str:
+    return " ".join(rng.choices(WORDS, k=n))
+
+
+def make_event(rng: random.Random) -> tuple[str, str]:
+    if rng.random() < 0.4:
+        return "mono", sentence(rng, rng.randint(3, 40))
+    parts = [f"<{rng.choice(['claude', 'hasuki', 'luna'])}>"]
+    for _ in range(rng.randint(2, 8)):
+        tag = rng.choice(["say", "say", "do", "narrate", "feeling", "plan", "pin", "thought"])
+        parts.append(f"<{tag}>{sentence(rng, rng.randint(3, 30))}</{tag}>")
+        if rng.random() < 0.3:
+            parts.append(sentence(rng, rng.randint(1, 8)))
+    if rng.random() < 0.05:
+        parts.insert(rng.randrange(1, len(parts)), "<say>unclosed " + sentence(rng, 5))
+    return "claude", "".join(parts)
+
+
+def old_density(content: str) -> tuple[int, int]:
+    do_chars = display_chars = 0
+    for tag in ("say", "do", "narrate"):
+        for match in re.finditer(rf"<{tag}>(.*?)</{tag}>", content, re.DOTALL):
+            display_chars += len(match.group(1))
+            if tag == "do":
+                do_chars += len(match.group(1))
+    return do_chars, display_chars
+
+
+def old_pass(actor: str, raw: str) -> None:
+    spans = [(m.group(1), m.group(2).strip()) for m in TAG_PATTERN.finditer(raw)]
+    TAG_STRIP_RE.sub("", raw)                   # untagged / mono strip
+    TAG_PATTERN.sub("", raw).strip()
+    DISPLAY_TAG_RE.findall(raw)                 # display
+    TAG_STRIP_RE.sub("", raw).strip()
+    old_density(raw)                            # Mirror
+    return spans
+
+
+def new_pass(actor: str, raw: str) -> None:
+    tokens = tokenize(raw)
+    spans = [(s.tag, tokens.content(s).strip()) for s in tokens.spans]
+    tokens.untagged
+    project_display(raw, actor, ["say"], tokens)
+    tokens.tag_chars
+    return spans
+
+
+def timed(fn, events) -> float:
+    start = time.perf_counter()
+    for actor, raw in events:
+        fn(actor, raw)
+    return time.perf_counter() - start
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the single-pass tag tokenizer.")
+    parser.add_argument("--events", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    events = [make_event(rng) for _ in range(args.events)]
+    chars = sum(len(raw) for _, raw in events)
+    print(f"{args.events} events, {chars / 1e6:.1f}M chars\n")
+
+    for actor, raw in events[:2000]:
+        if old_pass(actor, raw) != new_pass(actor, raw):
+            print(f"MISMATCH: {raw[:80]!r}", file=sys.stderr)
+            return 1
+
+    t_old = timed(old_pass, events)
+    t_new = timed(new_pass, events)
+    stored = [json.dumps(tokenize(raw).tag_chars) for _, raw in events]
+    start = time.perf_counter()
+    for tag_chars in stored:
+        counts = json.loads(tag_chars)
+        counts.get("do", 0), counts.get("say", 0), counts.get("narrate", 0)
+    t_stored = time.perf_counter() - start
+
+    print(f"{'':>10}  {'total':>9}  {'per event':>10}")
+    for label, t in (("regexes", t_old), ("tokenize", t_new), ("stored", t_stored)):
+        print(f"{label:>10}  {t:>8.2f}s  {t / args.events * 1e6:>8.1f}µs")
+
+    print(f"\n{'unclosed':>10}  {'regex':>9}  {'tokenize':>9}")
+    for n in (1000, 4000, 16000):
+        raw = "<say>x " * n
+        start = time.perf_counter()
+        TAG_PATTERN.findall(raw)
+        t_regex = time.perf_counter() - start
+        start = time.perf_counter()
+        tokenize(raw)
+        t_tok = time.perf_counter() - start
+        print(f"{n:>10}  {t_regex * 1000:>7.1f}ms  {t_tok * 1000:>7.1f}ms")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Benchmark: turn latency on plan-heavy messages.
+
+Ingests messages carrying several <plan> spans each into a scratch
+Gem and times the turns three ways:
+  rules      — wake/timeparse as shipped (rules, memo, fallback on miss)
+  cold memo  — the same, memo cleared before every turn
+  dateparser — every plan through dateparser, as ingest used to
+               (skipped if dateparser isn't installed)
+
+Also reports how many plan texts the rules resolved on their own and
+what the dateparser import costs.
+
+Usage:
+  python bench/bench_timeparse.py
+  python bench/bench_timeparse.py --turns 200 --plans 6
+"""
+
+import argparse
+import importlib.util
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Project root — one level up from bench/
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from ingest import lifecycle
+from ingest.lifecycle import ingest
+from ingest.parse import parse_response
+from wake import timeparse
+from wake.events_schema import migrate_events
+from wake.schema import connect, migrate
+
+PLAN_TEXTS = [
+    "organize desk by tuesday",
+    "tomorrow 3pm call the pharmacy",
+    "finish the crochet panel in 2 days",
+    "dentist 2026-11-02 09:15",
+    "laundry tonight",
+    "order yarn before friday",
+    "water the plants in an hour",
+    "return the library books on march 3",
+    "check in with luna next week",
+    "stretch at 9:30",
+    "sometime after the move settles",   # rules miss → fallback
+    "when the weather turns",            # rules miss → fallback
+]
+
+
+def make_messages(turns: int, plans: int, seed: int) -> list[str]:
+    rng = random.Random(seed)
+    return [
+        "<claude>" + "".join(
+            f"<plan>{rng.choice(PLAN_TEXTS)} #{rng.randint(0, 999)}</plan>"
+            for _ in range(plans)
+        )
+        for _ in range(turns)
+    ]
+
+
+def dateparser_only(text: str) -> str | None:
+    """The old _parse_due_date."""
+    import dateparser
+    now = datetime.now(timezone.utc)
+    result = dateparser.parse(
+        text,
+        settings={
+            "RELATIVE_BASE": now.replace(tzinfo=None),
+            "PREFER_DATES_FROM": "future",
+        },
+    )
+    if result and result > now.replace(tzinfo=None):
+        return result.replace(tzinfo=timezone.utc).isoformat()
+    return None
+
+
+def run_turns(db_path: Path, messages: list[str], before_turn=None) -> list[float]:
+    timings = []
+    for message in messages:
+        if before_turn:
+            before_turn()
+        parsed = parse_response(message)
+        start = time.perf_counter()
+        ingest(db_path, parsed, is_claude=True)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def report(label: str, timings: list[float]) -> None:
+    timings = sorted(timings)
+    mean = sum(timings) / len(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(f"{label:>12}  {mean * 1000:>8.2f}ms  {p95 * 1000:>8.2f}ms  {timings[-1] * 1000:>8.2f}ms")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark due-date parsing in ingest.")
+    parser.add_argument("--turns", type=int, default=100)
+    parser.add_argument("--plans", type=int, default=4, help="<plan> spans per message")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    now = datetime.now(timezone.utc)
+    hits = sum(timeparse.parse_when(t, now, fallback=False) is not None for t in PLAN_TEXTS)
+    print(f"rules resolve {hits}/{len(PLAN_TEXTS)} plan shapes without dateparser")
+
+    have_dateparser = importlib.util.find_spec("dateparser") is not None
+    if have_dateparser:
+        start = time.perf_counter()
+        timeparse._load_dateparser()
+        print(f"dateparser import: {(time.perf_counter() - start) * 1000:.0f}ms")
+    else:
+        print("dateparser: not installed — misses resolve to no due date")
+
+    messages = make_messages(args.turns, args.plans, args.seed)
+    print(f"\n{args.turns} turns × {args.plans} plans")
+    print(f"{'':>12}  {'mean':>10}  {'p95':>10}  {'max':>10}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "silentstar.sqlite"
+        migrate_events(Path(tmp) / "events.sqlite")
+        migrate(db_path)
+        # Post-split Gem: one event in events.sqlite lets v5 land
+        conn = connect(db_path)
+        conn.execute(
+            "INSERT INTO ev.events (ts, content, actor) VALUES (?, 'seed', 'system')",
+            (now.isoformat(),),
+        )
+        conn.commit()
+        conn.close()
+        migrate(db_path)
+
+        report("rules", run_turns(db_path, messages))
+        report("cold memo", run_turns(db_path, messages, timeparse._memo.clear))
+
+        if have_dateparser:
+            original = lifecycle._parse_due_date
+            lifecycle._parse_due_date = dateparser_only
+            try:
+                report("dateparser", run_turns(db_path, messages))
+            finally:
+                lifecycle._parse_due_date = original
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
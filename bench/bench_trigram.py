@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Benchmark: trigram FTS vs LIKE '%...%' scans.
+
+Builds a scratch Gem with a synthetic working_memory table (100k rows by
+default, ~1% active, the rest resolved history) and a few thousand
+fragment keys, then times:
+
+  substring   — subject/content containing a term, active rows only:
+                LIKE over the active rows, LIKE over every row (what a
+                status-blind scan costs), working_memory_trigram
+  suggestion  — nearest keys for a misspelled key: difflib over every
+                key vs the trigram candidates + re-rank in suggest_keys()
+
+and checks the trigram path returns the same rows as LIKE.
+
+Usage:
+  python bench/bench_trigram.py
+  python bench/bench_trigram.py --rows 200000 --active 0.02 --repeat 5
+"""
+
+import argparse
+import difflib
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Project root — one level up from bench/
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from wake import recall
+from wake.schema import connect, migrate
+
+SYLLABLES = ["ka", "ri", "mo", "lu", "na", "shi", "to", "ve", "ra", "en", "ko", "sa", "mi", "el"]
+TERMS = ["wardrobe", "crochet", "sweater", "body-training", "desk", "tue", "yarn"]
+TYPOS = ["wardobe", "crochte", "swetaer", "bodytraining", "fary"]
+
+
+def make_word(rng: random.Random) -> str:
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+
+
+def populate(db_path: Path, rows: int, active: float, keys: int, seed: int) -> list[str]:
+    rng = random.Random(seed)
+    vocab = [make_word(rng) for _ in range(5000)]
+    now = datetime.now(timezone.utc).isoformat()
+    conn = connect(db_path)
+
+    key_list = sorted({make_word(rng) + "-" + make_word(rng) for _ in range(keys)} | set(TERMS) | {"fairy"})
+    conn.executemany(
+        "INSERT INTO fragments (key, ambient, created_at, updated_at) VALUES (?, ?, ?, ?)",
+        [(k, k, now, now) for k in key_list],
+    )
+
+    def content() -> str:
+        words = rng.choices(vocab, k=rng.randint(6, 20))
+        if rng.random() < 0.05:
+            words.insert(rng.randrange(len(words)), rng.choice(TERMS))
+        return " ".join(words)
+
+    conn.executemany(
+        """INSERT INTO working_memory (type, content, subject, status, created_at, refreshed_at)
+           VALUES ('plan', ?, ?, ?, ?, ?)""",
+        [
+            (
+                content(),
+                rng.choice(TERMS) if rng.random() < 0.02 else None,
+                "active" if rng.random() < active else "resolved",
+                now, now,
+            )
+            for _ in range(rows)
+        ],
+    )
+    conn.commit()
+    conn.close()
+    return key_list
+
+
+def best_of(repeat: int, fn) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark trigram FTS against LIKE scans.")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--active", type=float, default=0.01, help="fraction of rows still active")
+    parser.add_argument("--keys", type=int, default=3000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "silentstar.sqlite"
+        migrate(db_path)
+        start = time.perf_counter()
+        key_list = populate(db_path, args.rows, args.active, args.keys, args.seed)
+        print(f"{args.rows} WM rows, {len(key_list)} keys, built in {time.perf_counter() - start:.1f}s\n")
+
+        conn = connect(db_path)
+
+        print(f"{'substring':>14}  {'LIKE active':>12}  {'LIKE all':>10}  {'trigram':>10}  {'rows':>6}")
+        for term in TERMS:
+            like = f"%{term}%"
+
+            def like_active():
+                return conn.execute(
+                    """SELECT id FROM working_memory WHERE status = 'active'
+                       AND (subject LIKE ? OR content LIKE ?) ORDER BY id""",
+                    (like, like),
+                ).fetchall()
+
+            def like_all():
+                return conn.execute(
+                    """SELECT id, status FROM working_memory
+                       WHERE subject LIKE ? OR content LIKE ? ORDER BY id""",
+                    (like, like),
+                ).fetchall()
+
+            def trigram():
+                return recall._active_containing(conn, term, ("subject", "content"))
+
+            expected = [r["id"] for r in like_active()]
+            got = [r["id"] for r in trigram()]
+            if expected != got:
+                print(f"MISMATCH for {term!r}: LIKE {len(expected)} vs trigram {len(got)}", file=sys.stderr)
+                return 1
+
+            print(
+                f"{term:>14}  {best_of(args.repeat, like_active) * 1000:>10.2f}ms  "
+                f"{best_of(args.repeat, like_all) * 1000:>8.2f}ms  "
+                f"{best_of(args.repeat, trigram) * 1000:>8.2f}ms  {len(got):>6}"
+            )
+
+        print(f"\n{'suggestion':>14}  {'difflib all':>12}  {'trigram':>10}  result")
+        for typo in TYPOS:
+            t_all = best_of(args.repeat, lambda: difflib.get_close_matches(
+                typo, key_list, n=recall.SUGGEST_LIMIT, cutoff=recall.SUGGEST_MIN_RATIO))
+            t_tri = best_of(args.repeat, lambda: recall._suggest(conn, typo, recall.SUGGEST_LIMIT))
+            print(
+                f"{typo:>14}  {t_all * 1000:>10.2f}ms  {t_tri * 1000:>8.2f}ms  "
+                f"{recall._suggest(conn, typo, recall.SUGGEST_LIMIT)}"
+            )
+
+        conn.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Show what a plan / pin action would match, without doing it.
+
+<plan>done ...</plan>, <plan>cancel ...</plan> and <pin>drop ...</pin>
+take the active item whose words overlap the description most, if the
+overlap reaches 0.15. This prints the top candidates with their scores
+and the words they share, and marks the one the action would take.
+
+Usage:
+  python explain_match.py plan "exercise routine"
+  python explain_match.py pin "sugars in tea" --limit 10
+  python explain_match.py plan ""        # modifier-only: newest plan
+"""
+
+import argparse
+import json
+import sys
+from dataclasses import asdict
+from pathlib import Path
+
+# Project root — where this script lives
+ROOT = Path(__file__).resolve().parent
+
+# Add project root to path so imports work
+sys.path.insert(0, str(ROOT))
+
+from ingest.lifecycle import EXPLAIN_LIMIT, MATCH_THRESHOLD, explain_match
+from wake.schema import migrate
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Explain which active plan / pin a done, cancel or drop would match."
+    )
+    parser.add_argument("type", choices=["plan", "pin"])
+    parser.add_argument("query", help="The description, as written after done / cancel / drop")
+    parser.add_argument(
+        "--db", default=None,
+        help="Path to silentstar.sqlite (default: data/silentstar.sqlite).",
+    )
+    parser.add_argument(
+        "--limit", type=int, default=EXPLAIN_LIMIT,
+        help=f"Candidates to show (default: {EXPLAIN_LIMIT}).",
+    )
+    parser.add_argument("--json", action="store_true", help="Print candidates as JSON.")
+
+    args = parser.parse_args()
+
+    db_path = Path(args.db) if args.db else ROOT / "data" / "silentstar.sqlite"
+    if not db_path.exists():
+        print(f"Error: database not found at {db_path}", file=sys.stderr)
+        return 1
+
+    migrate(db_path)
+    candidates = explain_match(db_path, args.type, args.query, args.limit)
+
+    if args.json:
+        print(json.dumps([asdict(c) for c in candidates], indent=2))
+        return 0
+
+    if not candidates:
+        print(f"No active {args.type} shares a word with that.")
+        return 0
+
+    if not args.query.strip():
+        print(f"(no description — the newest active {args.type})")
+    for c in candidates:
+        mark = "→" if c.chosen else " "
+        print(f"{mark} #{c.id:<6} {c.score:.2f}  {c.content}")
+        if c.shared:
+            print(f"{'':>16}shared: {' '.join(c.shared)}")
+    if not any(c.chosen for c in candidates):
+        print(f"\nNothing reaches {MATCH_THRESHOLD} — the action would change nothing.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
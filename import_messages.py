@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Import a message log — chat exports, RP logs — in bulk.
+
+Input is JSONL, one message per line, oldest first:
+
+  {"text": "<claude><say>hi</say></claude>", "claude": true, "ts": "2025-03-01T20:14:00+00:00"}
+  {"text": "morning", "actor": "hasuki", "tags": ["say"]}
+
+  text    — the message as it was sent (required)
+  claude  — Claude's reply (parsed like one) rather than Mono's; default false
+  actor   — Mono's identity; Claude's comes from its leading tag
+  tags    — Mono's frontend tags
+  ts      — ISO 8601 with timezone; default now
+
+Messages go through ingest_many(): batched transactions, the working
+memory lifecycle as a live turn would run it, progress saved per batch.
+Rerunning on the same file picks up where it stopped.
+
+Usage:
+  python import_messages.py export.jsonl
+  python import_messages.py export.jsonl --defer-fts --batch 5000
+  python import_messages.py rp-log.jsonl --no-lifecycle --tag import:rp
+  python import_messages.py export.jsonl --restart
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Project root — where this script lives
+ROOT = Path(__file__).resolve().parent
+
+# Add project root to path so imports work
+sys.path.insert(0, str(ROOT))
+
+from ingest.bulk import BATCH_SIZE, BulkMessage, clear_progress, ingest_many
+from ingest.parse import parse_mono_message, parse_response
+from wake.schema import migrate
+
+
+def read_messages(path: Path, extra_tags: list[str]):
+    with path.open(encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                item = json.loads(line)
+                text = item["text"]
+            except (ValueError, KeyError) as e:
+                raise SystemExit(f"{path}:{number}: not a message ({e})")
+            is_claude = bool(item.get("claude"))
+            parsed = (
+                parse_response(text) if is_claude
+                else parse_mono_message(text, actor=item.get("actor"), tags=item.get("tags"))
+            )
+            yield BulkMessage(parsed=parsed, is_claude=is_claude, ts=item.get("ts"), tags=extra_tags)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Bulk-import a JSONL message log.")
+    parser.add_argument("path", help="JSONL file, one message per line, oldest first.")
+    parser.add_argument(
+        "--db", default=None,
+        help="Path to silentstar.sqlite (default: data/silentstar.sqlite).",
+    )
+    parser.add_argument(
+        "--batch", type=int, default=BATCH_SIZE,
+        help=f"Messages per transaction (default: {BATCH_SIZE}).",
+    )
+    parser.add_argument(
+        "--defer-fts", action="store_true",
+        help="Index events_fts once at the end instead of per event.",
+    )
+    parser.add_argument(
+        "--no-lifecycle", action="store_true",
+        help="Store events only: no working memory, turn counter untouched.",
+    )
+    parser.add_argument(
+        "--tag", action="append", default=[],
+        help="Extra event tag for every message (repeatable).",
+    )
+    parser.add_argument(
+        "--restart", action="store_true",
+        help="Forget saved progress for this file and start from the top.",
+    )
+
+    args = parser.parse_args()
+
+    path = Path(args.path)
+    if not path.exists():
+        print(f"Error: {path} not found", file=sys.stderr)
+        return 1
+    db_path = Path(args.db) if args.db else ROOT / "data" / "silentstar.sqlite"
+    if not db_path.exists():
+        print(f"Error: database not found at {db_path}", file=sys.stderr)
+        return 1
+
+    migrate(db_path)
+    key = f"import:{path.resolve()}"
+    if args.restart:
+        clear_progress(db_path, key)
+
+    def report(total) -> None:
+        print(f"  {total.skipped + total.messages} messages in", end="\r", file=sys.stderr, flush=True)
+
+    result = ingest_many(
+        db_path,
+        read_messages(path, args.tag),
+        batch_size=args.batch,
+        resume_key=key,
+        defer_fts=args.defer_fts,
+        apply_lifecycle=not args.no_lifecycle,
+        progress=report,
+    )
+    if result.batches:
+        print(file=sys.stderr)
+
+    print(f"{result.messages} messages imported"
+          f"{f', {result.skipped} already in' if result.skipped else ''}"
+          f" in {result.seconds:.1f}s ({result.batches} batches)")
+    if result.first_event_id is not None:
+        print(f"  events {result.first_event_id}–{result.last_event_id}")
+    if result.messages and not args.no_lifecycle:
+        print(f"  working memory: {result.wm_created} created, {result.wm_resolved} resolved, "
+              f"{result.wm_superseded} superseded; turn {result.turn}")
+    if result.fts_indexed:
+        print(f"  events_fts: {result.fts_indexed} indexed at the end")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,272 @@
+"""
+Bulk — many messages at once.
+
+ingest() is one message, one transaction, and it reads back what it
+just wrote to project the display row. Right for a turn; slow for a
+year of chat exports. ingest_many() takes an iterable and writes it in
+batches: one transaction per batch, executemany for events, tags and
+display rows, and the working memory lifecycle only where a message
+carries WM tags. Message by message, what lands is what ingest() would
+have written, in the same order.
+
+Two options for big imports:
+  defer_fts   — events_fts skips the imported rows while they go in
+                (events schema v5) and indexes them in one pass at the
+                end, followed by a bounded segment merge
+  resume_key  — progress is stored in state with each batch, in the
+                same transaction, so a rerun over the same input skips
+                what's already in
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Iterable
+
+from wake import events_schema, fts_maintenance
+from wake.display import project_rows
+from wake.schema import DISPLAY_TAGS, VALID_WM_TYPES
+from wake.session import GemSource, borrow
+from .lifecycle import IngestResult, _apply_span, _get_turn, _set_turn
+from .parse import ParsedMessage
+
+
+# Messages per transaction
+BATCH_SIZE = 1000
+
+# state key prefix for resumable progress
+STATE_PREFIX = "ingest_many:"
+
+
+@dataclass
+class BulkMessage:
+    """One message for ingest_many(), with what ingest() takes beside it."""
+    parsed: ParsedMessage
+    is_claude: bool = False
+    ts: str | None = None               # ISO 8601, when it was said; now if None
+    image_path: str | None = None
+    tags: list[str] = field(default_factory=list)   # extra event_tags (source, etc.)
+
+
+@dataclass
+class BulkResult:
+    """What a bulk ingest wrote."""
+    messages: int = 0                   # ingested by this call
+    skipped: int = 0                    # already in from an earlier run (resume)
+    batches: int = 0                    # transactions
+    first_event_id: int | None = None
+    last_event_id: int | None = None
+    wm_created: int = 0
+    wm_resolved: int = 0
+    wm_superseded: int = 0
+    turn: int = 0                       # turn counter afterwards
+    fts_indexed: int = 0                # events indexed in the deferred pass
+    fts_merge: fts_maintenance.IndexReport | None = None
+    seconds: float = 0.0
+
+    def add(self, other: "BulkResult") -> None:
+        self.messages += other.messages
+        self.batches += other.batches
+        if other.first_event_id is not None:
+            if self.first_event_id is None:
+                self.first_event_id = other.first_event_id
+            self.last_event_id = other.last_event_id
+        self.wm_created += other.wm_created
+        self.wm_resolved += other.wm_resolved
+        self.wm_superseded += other.wm_superseded
+        self.turn = other.turn
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def write_batch(
+    conn: sqlite3.Connection,
+    messages: list[BulkMessage],
+    apply_lifecycle: bool = True,
+) -> BulkResult:
+    """Write one batch of messages. Runs inside the caller's transaction.
+
+    Events go in with one executemany. Their ids are contiguous — the
+    first insert takes the write lock, AUTOINCREMENT hands out
+    max + 1, and nobody else can insert until we commit — so they're
+    worked out from last_insert_rowid() rather than read back.
+
+    apply_lifecycle=False stores events only: no working memory, and
+    the turn counter is left alone (archives, file dumps).
+    """
+    result = BulkResult()
+    if not messages:
+        return result
+
+    now = _now_iso()
+    events = [(m.ts or now, m.parsed.raw, m.parsed.actor, m.image_path) for m in messages]
+    conn.executemany(
+        "INSERT INTO ev.events (ts, content, actor, image_path) VALUES (?, ?, ?, ?)",
+        events,
+    )
+    last = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+    ids = range(last - len(messages) + 1, last + 1)
+
+    tag_rows = []
+    display_tags = {}
+    tokens = {}
+    rows = []
+    for event_id, message, (ts, raw, actor, image_path) in zip(ids, messages, events):
+        tags = {span.tag for span in message.parsed.spans} | set(message.tags)
+        tag_rows.extend((event_id, tag) for tag in sorted(tags))
+        display_tags[event_id] = sorted(tags & DISPLAY_TAGS)
+        if message.parsed.tokens is not None and message.parsed.tokens.raw == raw:
+            tokens[event_id] = message.parsed.tokens
+        rows.append({"id": event_id, "ts": ts, "content": raw, "actor": actor, "image_path": image_path})
+
+    conn.executemany(
+        "INSERT OR IGNORE INTO ev.event_tags (event_id, tag) VALUES (?, ?)",
+        tag_rows,
+    )
+    project_rows(conn, rows, display_tags, tokens)
+
+    result.messages = len(messages)
+    result.batches = 1
+    result.first_event_id, result.last_event_id = ids[0], ids[-1]
+
+    if not apply_lifecycle:
+        return result
+
+    # Turn as ingest() would have seen it at each message; only written
+    # to state where a WM item needs it, and once at the end
+    turn = stored = _get_turn(conn)
+    for event_id, message, (ts, *_) in zip(ids, messages, events):
+        if any(span.tag in VALID_WM_TYPES for span in message.parsed.spans):
+            if turn != stored:
+                _set_turn(conn, turn)
+                stored = turn
+            applied = IngestResult(
+                event_id=event_id, wm_created=[], wm_resolved=[], wm_superseded=[], turn=turn,
+            )
+            for span in message.parsed.spans:
+                _apply_span(conn, applied, span, message.parsed.actor, ts)
+            result.wm_created += len(applied.wm_created)
+            result.wm_resolved += len(applied.wm_resolved)
+            result.wm_superseded += len(applied.wm_superseded)
+        if not message.is_claude:
+            turn += 1
+    if turn != stored:
+        _set_turn(conn, turn)
+    result.turn = turn
+    return result
+
+
+def _progress(conn: sqlite3.Connection, key: str) -> int:
+    row = conn.execute(
+        "SELECT value FROM state WHERE key = ?", (STATE_PREFIX + key,)
+    ).fetchone()
+    return json.loads(row["value"])["done"] if row else 0
+
+
+def _save_progress(conn: sqlite3.Connection, key: str, done: int) -> None:
+    now = _now_iso()
+    conn.execute(
+        """INSERT INTO state (key, value, updated_at) VALUES (?, ?, ?)
+           ON CONFLICT(key) DO UPDATE SET value = excluded.value,
+                                          updated_at = excluded.updated_at""",
+        (STATE_PREFIX + key, json.dumps({"done": done}), now),
+    )
+
+
+def clear_progress(source: GemSource, key: str) -> None:
+    """Forget a resume key, so the next run starts from the top."""
+    with borrow(source) as session, session.transaction() as conn:
+        conn.execute("DELETE FROM state WHERE key = ?", (STATE_PREFIX + key,))
+
+
+def _events_path(conn: sqlite3.Connection) -> Path | None:
+    """events.sqlite behind ev, or None while events still live in the Gem."""
+    files = {row["name"]: row["file"] for row in conn.execute("PRAGMA database_list")}
+    if not files.get("ev") or files.get("ev") == files.get("main"):
+        return None
+    return Path(files["ev"])
+
+
+def _catch_up(events_path: Path, result: BulkResult) -> None:
+    """Index deferred events, if any, then merge what that left in events_fts."""
+    conn = events_schema.connect_events(events_path)
+    try:
+        if events_schema.fts_deferred_since(conn) is None:
+            return
+        while indexed := events_schema.catch_up_fts(conn):
+            result.fts_indexed += indexed
+        if result.fts_indexed:
+            report = fts_maintenance.IndexReport(
+                index="events_fts",
+                before=fts_maintenance.IndexHealth(),
+                after=fts_maintenance.IndexHealth(),
+            )
+            fts_maintenance.configure(conn, "events_fts")
+            fts_maintenance.merge(conn, "events_fts", report, fts_maintenance.PAGE_BUDGET, None, None)
+            result.fts_merge = report
+    finally:
+        conn.close()
+
+
+def ingest_many(
+    source: GemSource,
+    messages: Iterable[BulkMessage | ParsedMessage],
+    batch_size: int = BATCH_SIZE,
+    resume_key: str | None = None,
+    defer_fts: bool = False,
+    apply_lifecycle: bool = True,
+    progress: Callable[[BulkResult], None] | None = None,
+) -> BulkResult:
+    """Ingest messages in order, batch_size per transaction.
+
+    A bare ParsedMessage is taken as ingest(source, parsed) would take
+    it: Mono's, no image, stamped now.
+
+    resume_key names this input: each batch records how many messages
+    are in, and a later call with the same key skips that many from the
+    front of messages — pass the same input again. defer_fts leaves
+    events_fts alone until the last batch is in (see module docstring);
+    an import that dies midway leaves the deferral in place, and the
+    next ingest_many() or idle FTS maintenance indexes the rest.
+    progress is called after every batch with the running totals.
+
+    Commits per batch — don't call it inside a session transaction.
+    """
+    start = time.perf_counter()
+    total = BulkResult()
+    items = iter(messages)
+
+    with borrow(source) as session:
+        if resume_key:
+            total.skipped = sum(1 for _ in islice(items, _progress(session.conn, resume_key)))
+
+        deferred = False
+        while batch := [
+            m if isinstance(m, BulkMessage) else BulkMessage(parsed=m)
+            for m in islice(items, batch_size)
+        ]:
+            with session.transaction() as conn:
+                if defer_fts and not deferred:
+                    deferred = events_schema.defer_fts(conn, "ev")
+                total.add(write_batch(conn, batch, apply_lifecycle))
+                if resume_key:
+                    _save_progress(conn, resume_key, total.skipped + total.messages)
+            if progress:
+                progress(total)
+
+        total.turn = _get_turn(session.conn)
+        events_path = _events_path(session.conn)
+
+    if events_path is not None:
+        _catch_up(events_path, total)
+
+    total.seconds = round(time.perf_counter() - start, 3)
+    return total
@@ -11,13 +11,21 @@ When tagged content comes in, this module decides what to do:
 
 from __future__ import annotations
 
+import heapq
+import json
 import re
 import sqlite3
 from datetime import datetime, timezone
 from dataclasses import dataclass
 from pathlib import Path
 
-from wake.schema import connect, VALID_WM_TYPES, DISPLAY_TAGS
+from wake.decay import WM_TYPE_TO_PERSISTENCE, expiry_bounds
+from wake.display import project_event
+from wake.key_registry import existing_keys
+from wake.schema import VALID_WM_TYPES, DISPLAY_TAGS, RESOLVE_TOKENCHARS
+from wake.session import GemSource, borrow
+from wake.tags import Tokens
+from wake.timeparse import parse_when
 from .parse import (
     ParsedMessage,
     TaggedSpan,
@@ -25,6 +33,19 @@ from .parse import (
 )
 
 
+# Word overlap an item needs to be resolved / dropped by description
+MATCH_THRESHOLD = 0.15
+
+# How many candidates explain_match() reports
+EXPLAIN_LIMIT = 5
+
+# A word the FTS index can look up: it holds a letter, a digit or
+# punctuation the index tokenizes
+_INDEXABLE = re.compile(r"[^\W_]|[" + re.escape(RESOLVE_TOKENCHARS) + "]")
+# Roughly the index's tokens, for vocabulary lookups
+_TOKEN = re.compile(r"(?:[^\W_]|[" + re.escape(RESOLVE_TOKENCHARS) + "])+")
+
+
 @dataclass
 class IngestResult:
     """What happened when we ingested a message."""
@@ -35,46 +56,37 @@ class IngestResult:
     turn: int                   # current turn number
 
 
+@dataclass
+class MatchCandidate:
+    """An active plan/pin scored against a done / cancel / drop."""
+    id: int
+    content: str
+    score: float                # word overlap, 0.0–1.0
+    shared: list[str]           # the words in common
+    chosen: bool = False        # the one the action would take
+
+
 def _now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
 def _parse_due_date(text: str) -> str | None:
-    """Try to extract a due date from plan text.
-    Uses dateparser if available, otherwise returns None."""
-    try:
-        import dateparser
-        now = datetime.now(timezone.utc)
-        result = dateparser.parse(
-            text,
-            settings={
-                "RELATIVE_BASE": now.replace(tzinfo=None),
-                "PREFER_DATES_FROM": "future",
-            },
-        )
-        if result and result > now.replace(tzinfo=None):
-            return result.replace(tzinfo=timezone.utc).isoformat()
-    except ImportError:
-        pass
-
+    """Try to extract a due date from plan text. Future dates only.
+    Common forms by rule; dateparser (if installed) on a miss."""
+    now = datetime.now(timezone.utc)
+    result = parse_when(text, now)
+    if result and result > now:
+        return result.isoformat()
     return None
 
 
-def _fuzzy_match_content(query: str, candidate: str) -> float:
-    """Simple word-overlap similarity for matching plan/pin content.
-    Returns 0.0–1.0."""
-    q_words = set(query.lower().split())
-    c_words = set(candidate.lower().split())
-
-    if not q_words or not c_words:
-        return 0.0
-
-    overlap = q_words & c_words
-    return len(overlap) / max(len(q_words), len(c_words))
+def _words(text: str) -> set[str]:
+    """Words for plan/pin matching: lowercased, split on whitespace."""
+    return set(text.lower().split())
 
 
 def ingest(
-    db_path: Path,
+    source: GemSource,
     parsed: ParsedMessage,
     is_claude: bool = False,
     image_path: str | None = None,
@@ -82,81 +94,117 @@ def ingest(
     """
     Ingest a parsed message into the database.
 
+    source is a db_path or an open TurnSession. Either way the whole
+    message lands in one transaction.
+
     1. Create event + event_tags
     2. For each tagged span, handle the lifecycle:
        - Display tags: just store in event_tags
        - WM tags: create/supersede/resolve working_memory records
     3. Increment turn counter (for Mono messages only)
     """
-    conn = connect(db_path)
+    with borrow(source) as session, session.transaction() as conn:
+        return _ingest(conn, parsed, is_claude, image_path)
+
+
+def _ingest(
+    conn: sqlite3.Connection,
+    parsed: ParsedMessage,
+    is_claude: bool,
+    image_path: str | None,
+) -> IngestResult:
     now = _now_iso()
 
-    wm_created = []
-    wm_resolved = []
-    wm_superseded = []
+    # 1. Create event
+    result = IngestResult(
+        event_id=_insert_event(conn, now, parsed.raw, parsed.actor, image_path),
+        wm_created=[],
+        wm_resolved=[],
+        wm_superseded=[],
+        turn=0,
+    )
+
+    # 2. Store event tags
+    _store_tags(conn, result.event_id, parsed.spans, parsed.tokens)
+
+    # 3. Process each span
+    for span in parsed.spans:
+        _apply_span(conn, result, span, parsed.actor, now)
 
-    try:
-        # 1. Create event
-        cursor = conn.execute(
-            """INSERT INTO ev.events (ts, content, actor, image_path)
-               VALUES (?, ?, ?, ?)""",
-            (now, parsed.raw, parsed.actor, image_path),
+    # 4. Increment turn counter (Mono messages only)
+    _finish_turn(conn, result, is_claude)
+    return result
+
+
+def _insert_event(
+    conn: sqlite3.Connection,
+    now: str,
+    raw: str,
+    actor: str | None,
+    image_path: str | None,
+) -> int:
+    cursor = conn.execute(
+        """INSERT INTO ev.events (ts, content, actor, image_path)
+           VALUES (?, ?, ?, ?)""",
+        (now, raw, actor, image_path),
+    )
+    return cursor.lastrowid
+
+
+def _store_tags(
+    conn: sqlite3.Connection,
+    event_id: int,
+    spans: list[TaggedSpan],
+    tokens: Tokens | None = None,
+) -> None:
+    """Store the event's tags, then project it for Recent (tags decide visibility).
+
+    tokens is the parse's scan of the event text, stored as its
+    event_spans row rather than scanned again.
+    """
+    for tag in {span.tag for span in spans}:
+        conn.execute(
+            "INSERT OR IGNORE INTO ev.event_tags (event_id, tag) VALUES (?, ?)",
+            (event_id, tag),
         )
-        event_id = cursor.lastrowid
+    project_event(conn, event_id, tokens=tokens)
 
-        # 2. Store event tags
-        all_tags = {span.tag for span in parsed.spans}
-        for tag in all_tags:
-            conn.execute(
-                "INSERT OR IGNORE INTO ev.event_tags (event_id, tag) VALUES (?, ?)",
-                (event_id, tag),
-            )
 
-        # 3. Process each span
-        for span in parsed.spans:
-            if span.tag in DISPLAY_TAGS:
-                continue  # already stored as event_tag, no WM action
-
-            if span.tag not in VALID_WM_TYPES:
-                continue
-
-            if span.modifier == "resolve":
-                resolved = _resolve_plan(conn, span, now)
-                wm_resolved.extend(resolved)
-            elif span.modifier == "cancel":
-                resolved = _cancel_plan(conn, span, now)
-                wm_resolved.extend(resolved)
-            elif span.modifier == "drop":
-                dropped = _drop_pin(conn, span, now)
-                wm_resolved.extend(dropped)
-            else:
-                created, superseded = _create_wm_item(
-                    conn, event_id, span, parsed.actor, now, _get_turn(conn)
-                )
-                wm_created.extend(created)
-                wm_superseded.extend(superseded)
-
-        # 4. Increment turn counter (Mono messages only)
-        turn = _get_turn(conn)
-        if not is_claude:
-            turn += 1
-            _set_turn(conn, turn)
-
-        conn.commit()
-
-        return IngestResult(
-            event_id=event_id,
-            wm_created=wm_created,
-            wm_resolved=wm_resolved,
-            wm_superseded=wm_superseded,
-            turn=turn,
+def _apply_span(
+    conn: sqlite3.Connection,
+    result: IngestResult,
+    span: TaggedSpan,
+    actor: str | None,
+    now: str,
+) -> None:
+    """Working memory lifecycle for one span. Display tags need nothing."""
+    if span.tag in DISPLAY_TAGS:
+        return  # stored as event_tag, no WM action
+
+    if span.tag not in VALID_WM_TYPES:
+        return
+
+    if span.modifier == "resolve":
+        result.wm_resolved.extend(_resolve_plan(conn, span, now))
+    elif span.modifier == "cancel":
+        result.wm_resolved.extend(_cancel_plan(conn, span, now))
+    elif span.modifier == "drop":
+        result.wm_resolved.extend(_drop_pin(conn, span, now))
+    else:
+        created, superseded = _create_wm_item(
+            conn, result.event_id, span, actor, now, _get_turn(conn)
         )
+        result.wm_created.extend(created)
+        result.wm_superseded.extend(superseded)
 
-    except Exception:
-        conn.rollback()
-        raise
-    finally:
-        conn.close()
+
+def _finish_turn(conn: sqlite3.Connection, result: IngestResult, is_claude: bool) -> None:
+    """Set result.turn, advancing the counter for Mono's messages."""
+    turn = _get_turn(conn)
+    if not is_claude:
+        turn += 1
+        _set_turn(conn, turn)
+    result.turn = turn
 
 
 def _create_wm_item(
@@ -207,29 +255,37 @@ def _create_wm_item(
     if span.tag == "plan":
         due = _parse_due_date(span.content)
 
+    # When this item will fall below the sweep threshold
+    created_dt = datetime.fromisoformat(now)
+    expires_at, expires_turn = expiry_bounds(
+        WM_TYPE_TO_PERSISTENCE[span.tag],
+        created_dt,
+        created_dt,
+        turn,
+        datetime.fromisoformat(due) if due else None,
+    )
+
     # Create the item
     cursor = conn.execute("""
         INSERT INTO working_memory
             (event_id, type, content, subject, actor, status, due, turn,
-             created_at, refreshed_at)
-        VALUES (?, ?, ?, ?, ?, 'active', ?, ?, ?, ?)
-    """, (event_id, span.tag, span.content, subject, actor, due, turn, now, now))
+             created_at, refreshed_at, expires_at, expires_turn)
+        VALUES (?, ?, ?, ?, ?, 'active', ?, ?, ?, ?, ?, ?)
+    """, (event_id, span.tag, span.content, subject, actor, due, turn, now, now,
+          expires_at.isoformat() if expires_at else None, expires_turn))
 
     wm_id = cursor.lastrowid
     created.append(wm_id)
 
-    # Link to fragment keys mentioned in the content
+    # Link to fragment keys mentioned in the content — only those that
+    # actually exist, checked all at once
     keys = extract_fragment_keys(span.content)
-    for key in keys:
-        # Only link if the fragment actually exists
-        exists = conn.execute(
-            "SELECT 1 FROM fragments WHERE key = ?", (key,)
-        ).fetchone()
-        if exists:
-            conn.execute(
-                "INSERT OR IGNORE INTO working_memory_refs (wm_id, fragment_key) VALUES (?, ?)",
-                (wm_id, key),
-            )
+    if keys:
+        found = existing_keys(conn, keys)
+        conn.executemany(
+            "INSERT OR IGNORE INTO working_memory_refs (wm_id, fragment_key) VALUES (?, ?)",
+            [(wm_id, key) for key in dict.fromkeys(keys) if key in found],
+        )
 
     return created, superseded
 
@@ -270,48 +326,145 @@ def _match_and_update(
 ) -> list[int]:
     """Find the best-matching active WM item by content similarity,
     then update its status."""
+    best = _rank_candidates(conn, wm_type, query, 1, MATCH_THRESHOLD)
+    if not best or not best[0].chosen:
+        return []
 
-    # Modifier-only (e.g. <plan>done</plan>) — no description to match on.
-    # Resolve the most recently created active item of that type.
-    if not query or not query.strip():
+    conn.execute(
+        "UPDATE working_memory SET status = ?, resolved_at = ? WHERE id = ?",
+        (new_status, now, best[0].id),
+    )
+    return [best[0].id]
+
+
+def _score(q_words: set[str], row: sqlite3.Row) -> MatchCandidate:
+    """Word overlap: shared words over the larger word set."""
+    c_words = _words(row["content"] or "")
+    shared = q_words & c_words
+    score = len(shared) / max(len(q_words), len(c_words)) if c_words else 0.0
+    return MatchCandidate(row["id"], row["content"], score, sorted(shared))
+
+
+def _doc_freq(conn: sqlite3.Connection, word: str) -> int:
+    """About how many indexed items hold word. Only orders lookups."""
+    counts = []
+    for token in _TOKEN.findall(word):
         row = conn.execute(
-            "SELECT id FROM working_memory WHERE type = ? AND status = 'active' ORDER BY created_at DESC LIMIT 1",
-            (wm_type,),
+            "SELECT doc FROM working_memory_resolvable_vocab WHERE term = ?", (token,)
         ).fetchone()
-        if row:
-            conn.execute(
-                "UPDATE working_memory SET status = ?, resolved_at = ? WHERE id = ?",
-                (new_status, now, row["id"]),
+        counts.append(row[0] if row else 0)
+    return min(counts, default=0)
+
+
+def _lookup(
+    conn: sqlite3.Connection,
+    wm_type: str,
+    q_words: set[str],
+    limit: int,
+    floor: float,
+) -> list[MatchCandidate]:
+    """Score the items that share a word with the query, rarest word first.
+
+    Each word is looked up in working_memory_resolvable_fts, which only
+    holds active plans and pins, as a phrase of its own tokens — any
+    item holding the same word matches. (The index also folds case and
+    accents, so some that match then score 0.)
+
+    After k of n words, an item not seen yet can share at most the
+    other n - k, so it scores at most (n - k) / n. Once that can't
+    reach the limit-th best score so far, or floor, the common words
+    ("the", "to") are never read — they'd only bring in items that
+    can't win.
+    """
+    words = sorted(q_words, key=lambda w: (_doc_freq(conn, w), w))
+    scored: dict[int, MatchCandidate] = {}
+
+    for k, word in enumerate(words, 1):
+        ids = [
+            row[0] for row in conn.execute(
+                """SELECT rowid FROM working_memory_resolvable_fts
+                   WHERE working_memory_resolvable_fts MATCH ?""",
+                (f'type : "{wm_type}" AND content : "' + word.replace('"', '""') + '"',),
             )
-            return [row["id"]]
-        return []
+            if row[0] not in scored
+        ]
+        if ids:
+            for row in conn.execute(
+                """SELECT id, content FROM working_memory
+                   WHERE id IN (SELECT value FROM json_each(?)) AND status = 'active'""",
+                (json.dumps(ids),),
+            ):
+                scored[row["id"]] = _score(q_words, row)
 
-    rows = conn.execute(
-        "SELECT id, content FROM working_memory WHERE type = ? AND status = 'active'",
-        (wm_type,),
-    ).fetchall()
+        bound = (len(words) - k) / len(words)
+        best = heapq.nlargest(limit, (c.score for c in scored.values()))
+        if bound < max(best[-1] if len(best) == limit else -1.0, floor):
+            break
 
-    if not rows:
-        return []
+    return list(scored.values())
 
-    # Score each by word overlap
-    scored = [
-        (row["id"], _fuzzy_match_content(query, row["content"]))
-        for row in rows
-    ]
-    scored.sort(key=lambda x: x[1], reverse=True)
 
-    # Take the best match if it's at least somewhat relevant
-    best_id, best_score = scored[0]
-    if best_score < 0.15:
-        return []
+def _rank_candidates(
+    conn: sqlite3.Connection,
+    wm_type: str,
+    query: str,
+    limit: int,
+    floor: float = 0.0,
+) -> list[MatchCandidate]:
+    """The top candidates for a done / cancel / drop, best first.
+
+    The first is chosen if it clears MATCH_THRESHOLD; ties go to the
+    oldest item, as they always did. Modifier-only (e.g. <plan>done</plan>)
+    has no description to match on — the most recently created active
+    item of that type is chosen. Items that can't score floor may be
+    left out.
+
+    A word with nothing the index tokenizes (an emoji, a lone quote)
+    can't be looked up; a query holding one scans the active items of
+    the type instead, so it still counts.
+    """
+    if not query or not query.strip():
+        row = conn.execute(
+            "SELECT id, content FROM working_memory WHERE type = ? AND status = 'active' ORDER BY created_at DESC LIMIT 1",
+            (wm_type,),
+        ).fetchone()
+        if row is None:
+            return []
+        return [MatchCandidate(row["id"], row["content"], 0.0, [], chosen=True)]
+
+    q_words = _words(query)
+    if all(_INDEXABLE.search(word) for word in q_words):
+        scored = _lookup(conn, wm_type, q_words, limit, floor)
+    else:
+        scored = [
+            _score(q_words, row) for row in conn.execute(
+                "SELECT id, content FROM working_memory WHERE type = ? AND status = 'active'",
+                (wm_type,),
+            )
+        ]
+
+    scored.sort(key=lambda c: (-c.score, c.id))
+    top = scored[:limit]
+    if top and top[0].score >= MATCH_THRESHOLD:
+        top[0].chosen = True
+    return top
 
-    conn.execute(
-        "UPDATE working_memory SET status = ?, resolved_at = ? WHERE id = ?",
-        (new_status, now, best_id),
-    )
 
-    return [best_id]
+def explain_match(
+    source: GemSource,
+    wm_type: str,
+    query: str,
+    limit: int = EXPLAIN_LIMIT,
+) -> list[MatchCandidate]:
+    """What <plan>done query</plan> (or cancel, or <pin>drop ...</pin>)
+    would match right now, and why. Changes nothing.
+
+    Returns up to limit candidates, best first, with their overlap
+    scores; the one marked chosen is what the action would take, and
+    none is if the best falls under MATCH_THRESHOLD.
+    """
+    with borrow(source) as session:
+        return _rank_candidates(session.conn, wm_type, query, limit)
 
 
 def _infer_subject(span: TaggedSpan) -> str | None:
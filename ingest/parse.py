@@ -9,7 +9,11 @@ Claude's responses contain inline tags:
   <pin>desk is by the window</pin>
   <pin>drop desk is messy</pin>
 
-This module extracts those into structured data.
+This module extracts those into structured data — all at once with
+parse_response(), or piece by piece with StreamParser while the reply
+is still arriving. The whole-text scan is wake/tags.tokenize(); its
+Tokens ride along on ParsedMessage so ingest can store them without
+scanning again.
 """
 
 from __future__ import annotations
@@ -23,6 +27,7 @@ from wake.schema import (
     ALL_TAGS,
     IDENTITY_TAGS,
 )
+from wake.tags import Tokens, tokenize
 
 
 @dataclass
@@ -40,6 +45,7 @@ class ParsedMessage:
     spans: list[TaggedSpan] = field(default_factory=list)
     untagged: str = ""                          # text outside any tags
     raw: str = ""                               # original full text
+    tokens: Tokens | None = None                # the scan of raw, for event_spans
 
 
 # Lifecycle modifiers — words at the start of tag content that change behavior
@@ -72,20 +78,27 @@ def _extract_modifier(tag: str, content: str) -> tuple[str | None, str]:
     return None, content
 
 
-# Regex for matching tags. Handles both <tag>content</tag> and <tag>content</tag>
-# Non-greedy matching within tags.
-TAG_PATTERN = re.compile(
-    r"<(" + "|".join(re.escape(t) for t in ALL_TAGS) + r")>"
-    r"(.*?)"
-    r"</\1>",
-    re.DOTALL,
-)
-
 # Pattern for leading identity tag: <hasuki> at the start of a message
 LEADING_IDENTITY_PATTERN = re.compile(
     r"^\s*<(" + "|".join(re.escape(t) for t in IDENTITY_TAGS) + r")>\s*",
 )
 
+# Opening tag alone — the streaming parser finds the open, then its close
+OPEN_TAG_PATTERN = re.compile(
+    r"<(" + "|".join(re.escape(t) for t in ALL_TAGS) + r")>",
+)
+
+# recall("key") / recall(key, deep=True)
+RECALL_PATTERN = re.compile(
+    r'recall\(\s*'
+    r'(?:["\']([^"\']+)["\']|([a-z][a-z0-9_-]*))'
+    r'\s*(?:,\s*deep\s*=\s*(True|true))?\s*\)',
+)
+
+# Longest opening tag, e.g. "<narrate>" — how far back a tag split across
+# two deltas can begin
+_MAX_OPEN_TAG = max(len(t) for t in ALL_TAGS | IDENTITY_TAGS) + 2
+
 
 def parse_response(text: str) -> ParsedMessage:
     """Parse a Claude response for all tagged content.
@@ -95,40 +108,129 @@ def parse_response(text: str) -> ParsedMessage:
     - All tagged spans (<say>...</say>, <plan>...</plan>, etc.)
     - Untagged text (processing/thinking — not stored in working memory)
     """
-    raw = text
-    actor = None
-
-    # Check for leading identity tag
-    identity_match = LEADING_IDENTITY_PATTERN.match(text)
-    if identity_match:
-        actor = identity_match.group(1)
-        text = text[identity_match.end():]
+    tokens = tokenize(text)
 
-    # Extract all tagged spans
     spans = []
-    for match in TAG_PATTERN.finditer(text):
-        tag = match.group(1)
-        content = match.group(2).strip()
-
-        modifier, clean_content = _extract_modifier(tag, content)
-
+    for span in tokens.spans:
+        modifier, clean_content = _extract_modifier(span.tag, tokens.content(span).strip())
         spans.append(TaggedSpan(
-            tag=tag,
+            tag=span.tag,
             content=clean_content,
             modifier=modifier,
         ))
 
     # Everything outside tags is untagged processing
-    untagged = TAG_PATTERN.sub("", text).strip()
-
     return ParsedMessage(
-        actor=actor,
+        actor=tokens.actor,
         spans=spans,
-        untagged=untagged,
-        raw=raw,
+        untagged=tokens.untagged,
+        raw=text,
+        tokens=tokens,
     )
 
 
+class StreamParser:
+    """Parses Claude's reply while it streams in.
+
+    feed() takes each text delta and returns the spans and recall()
+    calls it completed — a span is done the moment its closing tag
+    arrives, even if the tag was split across deltas. Spans come out in
+    the same order parse_response() would give them, so what has been
+    emitted is always a prefix of the final parse.
+
+    close() returns parse_response() of the whole text. That stays the
+    authority: anything the stream couldn't settle (an unclosed tag
+    followed by closed ones) is in its tail.
+    """
+
+    def __init__(self) -> None:
+        self.text = ""
+        self.actor: str | None = None
+        self.spans: list[TaggedSpan] = []
+        self.recalls: list[tuple[str, bool]] = []
+        self._body: int | None = None   # offset past the identity tag, once known
+        self._scan = 0                  # where the next opening tag can start
+        self._open: tuple[str, int] | None = None  # (tag, content start)
+        self._close_scan = 0            # where its closing tag can start
+        self._recall_scan = 0
+
+    def feed(self, delta: str) -> tuple[list[TaggedSpan], list[tuple[str, bool]]]:
+        """Add a delta. Returns (spans completed, recall requests completed)."""
+        self.text += delta
+        spans = self._scan_spans() if self._resolve_actor() else []
+        recalls = self._scan_recalls()
+        self.spans.extend(spans)
+        self.recalls.extend(recalls)
+        return spans, recalls
+
+    def close(self) -> ParsedMessage:
+        """The whole reply, parsed as parse_response() would."""
+        return parse_response(self.text)
+
+    def _resolve_actor(self) -> bool:
+        """Settle the leading identity tag before any span is read."""
+        if self._body is not None:
+            return True
+
+        stripped = self.text.lstrip()
+        if not stripped:
+            return False
+
+        match = LEADING_IDENTITY_PATTERN.match(self.text)
+        if match:
+            self.actor = match.group(1)
+            self._body = match.end()
+        elif stripped[0] == "<" and ">" not in stripped and len(stripped) < _MAX_OPEN_TAG:
+            return False  # could still become an identity tag
+        else:
+            self._body = 0
+
+        self._scan = self._body
+        return True
+
+    def _scan_spans(self) -> list[TaggedSpan]:
+        text = self.text
+        done = []
+        while True:
+            if self._open is None:
+                match = OPEN_TAG_PATTERN.search(text, self._scan)
+                if not match:
+                    self._scan = max(self._scan, len(text) - _MAX_OPEN_TAG)
+                    break
+                self._open = (match.group(1), match.end())
+                self._close_scan = match.end()
+
+            tag, start = self._open
+            closing = f"</{tag}>"
+            end = text.find(closing, self._close_scan)
+            if end < 0:
+                self._close_scan = max(self._close_scan, len(text) - len(closing) + 1)
+                break
+
+            modifier, content = _extract_modifier(tag, text[start:end].strip())
+            done.append(TaggedSpan(tag=tag, content=content, modifier=modifier))
+            self._open = None
+            self._scan = end + len(closing)
+        return done
+
+    def _scan_recalls(self) -> list[tuple[str, bool]]:
+        text = self.text
+        done = []
+        while True:
+            match = RECALL_PATTERN.search(text, self._recall_scan)
+            if not match:
+                # Hold at the last unfinished recall( — or near the end,
+                # in case the word itself was split
+                pending = text.rfind("recall(", self._recall_scan)
+                if pending < 0:
+                    pending = max(self._recall_scan, len(text) - len("recall(") + 1)
+                self._recall_scan = pending
+                break
+            done.append((match.group(1) or match.group(2), match.group(3) is not None))
+            self._recall_scan = match.end()
+        return done
+
+
 def parse_mono_message(
     text: str,
     actor: str | None = None,
@@ -151,6 +253,7 @@ def parse_mono_message(
 
     # Check for inline tags in Mono's text too
     inline = parse_response(text)
+    result.tokens = inline.tokens
     if inline.spans:
         result.spans = inline.spans
         result.untagged = inline.untagged
@@ -159,10 +262,7 @@ def parse_mono_message(
     if tags:
         existing_tags = {s.tag for s in result.spans}
         # Strip any inline tags from the content for frontend-applied spans
-        _inline_tag_re = re.compile(
-            r"</?(?:" + "|".join(re.escape(t) for t in ALL_TAGS) + r")>"
-        )
-        clean = _inline_tag_re.sub("", text).strip()
+        clean = inline.tokens.strip_tags(ALL_TAGS)
         for tag in tags:
             if tag in ALL_TAGS and tag not in existing_tags:
                 # Frontend tag wraps the whole message (with inline tags stripped)
@@ -187,14 +287,8 @@ def parse_recall_requests(text: str) -> list[tuple[str, bool]]:
 
     Returns list of (key, deep) tuples.
     """
-    pattern = re.compile(
-        r'recall\(\s*'
-        r'(?:["\']([^"\']+)["\']|([a-z][a-z0-9_-]*))'
-        r'\s*(?:,\s*deep\s*=\s*(True|true))?\s*\)',
-    )
-
     results = []
-    for match in pattern.finditer(text):
+    for match in RECALL_PATTERN.finditer(text):
         key = match.group(1) or match.group(2)
         deep = match.group(3) is not None
         results.append((key, deep))
@@ -23,6 +23,9 @@ from pathlib import Path
 
 from wake.schema import connect
 
+# Keys per IN (...) when reading draft fragments' current tiers
+_IN_BATCH = 500
+
 
 # --- Parsing ---
 
@@ -186,11 +189,21 @@ def compute_diff(conn, draft: ParsedDraft) -> DiffResult:
     """Compare draft against current DB state."""
     diff = DiffResult()
 
+    # Current tiers of the draft's keys, batched rather than a query per
+    # fragment; a key with no row is a CREATE
+    rows = {}
+    keys = list(dict.fromkeys(frag.key for frag in draft.fragments))
+    for i in range(0, len(keys), _IN_BATCH):
+        chunk = keys[i:i + _IN_BATCH]
+        for row in conn.execute(
+            f"""SELECT key, ambient, recognition, inventory FROM fragments
+                WHERE key IN ({",".join("?" * len(chunk))})""",
+            chunk,
+        ):
+            rows[row["key"]] = row
+
     for frag in draft.fragments:
-        row = conn.execute(
-            "SELECT key, ambient, recognition, inventory FROM fragments WHERE key = ?",
-            (frag.key,),
-        ).fetchone()
+        row = rows.get(frag.key)
 
         if row is None:
             tiers = []
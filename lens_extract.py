@@ -5,6 +5,9 @@ lens_extract.py — the read side of the Lens.
 Queries the Gem, follows edges, outputs formatted .md.
 Pure read-only. Never writes to DB. No API calls.
 
+Fragments and edges come from the fragment cache when the Gem has one
+(schema v7+) — a long-lived caller like the Loom reads the graph once.
+
 Usage:
     python lens_extract.py wardrobe                     # single key + neighbors
     python lens_extract.py wardrobe jirai exhibitionist  # multi-key intersection
@@ -14,6 +17,7 @@ Usage:
     python lens_extract.py --search "fairy"              # FTS5 search across all tables
     python lens_extract.py --search "fairy" --type fragments  # search fragments only
     python lens_extract.py wardrobe -o temp/lens/out.md  # output to file
+    python lens_extract.py wardrobe jirai --expand 400   # + multi-hop neighbors, ranked
 """
 
 from __future__ import annotations
@@ -24,6 +28,8 @@ import sys
 from datetime import datetime, timezone
 from pathlib import Path
 
+from wake.fragment_cache import get_cache
+from wake.graph import get_graph
 from wake.schema import connect
 
 
@@ -69,6 +75,17 @@ def _format_edges(edges: list[dict]) -> str:
 
 
 def _get_fragment(conn, key: str) -> dict | None:
+    cache = get_cache(conn)
+    if cache is not None:
+        if key not in cache:
+            return None
+        return {
+            "key": key,
+            "ambient": cache.ambient[key],
+            "recognition": cache.recognition[key],
+            "inventory": cache.inventory(conn, [key]).get(key),
+        }
+
     row = conn.execute(
         "SELECT key, ambient, recognition, inventory FROM fragments WHERE key = ?",
         (key,),
@@ -82,6 +99,20 @@ def _get_edges_for_keys(conn, keys: set[str]) -> list[dict]:
     """Get all edges where both endpoints are in the key set."""
     if not keys:
         return []
+
+    cache = get_cache(conn)
+    if cache is not None:
+        edges = {}
+        for k in keys:
+            for target, relation in cache.out_edges.get(k, ()):
+                edges[(k, target)] = relation
+            for source, relation in cache.in_edges.get(k, ()):
+                edges[(source, k)] = relation
+        return [
+            {"source_key": source, "target_key": target, "relation": edges[(source, target)]}
+            for source, target in sorted(edges)
+        ]
+
     placeholders = ",".join("?" for _ in keys)
     rows = conn.execute(
         f"""
@@ -98,6 +129,10 @@ def _get_edges_for_keys(conn, keys: set[str]) -> list[dict]:
 
 def _get_neighbor_keys(conn, key: str) -> set[str]:
     """Get all keys connected to this key via edges (one hop)."""
+    cache = get_cache(conn)
+    if cache is not None:
+        return cache.adjacent(key)
+
     rows = conn.execute(
         """
         SELECT target_key AS k FROM fragment_edges WHERE source_key = ?
@@ -109,7 +144,19 @@ def _get_neighbor_keys(conn, key: str) -> set[str]:
     return {r["k"] for r in rows}
 
 
-def extract_single(conn, key: str) -> str:
+def _format_expansion(conn, seeds: list[str], exclude: set[str], budget: int) -> str:
+    """Keys further out, ranked by personalized PageRank from the seeds."""
+    expansions = get_graph(conn).expand(seeds, budget, exclude=exclude)
+    if not expansions:
+        return ""
+    lines = [f"## Further out ({len(expansions)}, ranked)"]
+    for e in expansions:
+        rel = f", {e.relation}" if e.relation else ""
+        lines.append(f"- [{e.key}] ({e.hops} hop{'s' if e.hops != 1 else ''} via {e.via}{rel}): {e.ambient}")
+    return "\n".join(lines)
+
+
+def extract_single(conn, key: str, expand_budget: int | None = None) -> str:
     """Single key query: fragment + one-hop neighbors + edges."""
     root = _get_fragment(conn, key)
     if root is None:
@@ -143,10 +190,16 @@ def extract_single(conn, key: str) -> str:
         parts.append("")
         parts.append(edge_str)
 
+    if expand_budget:
+        further = _format_expansion(conn, [key], all_keys, expand_budget)
+        if further:
+            parts.append("")
+            parts.append(further)
+
     return "\n".join(parts)
 
 
-def extract_multi(conn, keys: list[str]) -> str:
+def extract_multi(conn, keys: list[str], expand_budget: int | None = None) -> str:
     """Multi-key intersection: fragments where paths converge."""
     # For each key, find its neighborhood (self + one-hop)
     neighborhoods: dict[str, set[str]] = {}
@@ -208,6 +261,12 @@ def extract_multi(conn, keys: list[str]) -> str:
         parts.append("")
         parts.append(edge_str)
 
+    if expand_budget:
+        further = _format_expansion(conn, root_keys, show_keys, expand_budget)
+        if further:
+            parts.append("")
+            parts.append(further)
+
     return "\n".join(parts)
 
 
@@ -300,13 +359,13 @@ def extract_summaries(db_path: Path) -> str:
         sum_conn.close()
 
 
-def _format_search_results(title: str, results: list[dict], key_field: str) -> str:
-    parts = [f"# Search: {title} ({_format_date()})"]
-    parts.append(f"\n{len(results)} matches\n")
-    for item in results:
-        label = item.get(key_field, "?")
-        snippet = item.get("snippet", "")
-        parts.append(f"- [{label}] {snippet}")
+def _format_search_results(query: str, page) -> str:
+    parts = [f"# Search: {query} ({_format_date()})"]
+    parts.append(f"\n{len(page.hits)} matches, ranked across {', '.join(page.tables)}\n")
+    for hit in page.hits:
+        parts.append(f"- [{hit.table}:{hit.ref}] {hit.snippet} ({hit.score:.3f})")
+    if page.cursor:
+        parts.append(f"\nMore: --cursor {page.cursor}")
     return "\n".join(parts)
 
 
@@ -319,10 +378,16 @@ def main():
     parser.add_argument("--wm", action="store_true", help="Working memory state")
     parser.add_argument("--summaries", action="store_true", help="Mirror summaries")
     parser.add_argument("--search", type=str, help="Full-text search query")
-    parser.add_argument("--type", type=str, choices=["fragments", "events", "wm"],
+    parser.add_argument("--type", type=str, choices=["fragments", "events", "wm", "summaries"],
                         help="Limit search to specific table (default: all)")
+    parser.add_argument("--since", type=str, help="Search: only rows at/after this ISO time")
+    parser.add_argument("--until", type=str, help="Search: only rows before this ISO time")
+    parser.add_argument("--limit", type=int, default=20, help="Search: hits per page")
+    parser.add_argument("--cursor", type=str, help="Search: next page, from a previous search")
     parser.add_argument("--db", type=str, help="Path to database (default: from config)")
     parser.add_argument("-o", "--output", type=str, help="Output to file instead of stdout")
+    parser.add_argument("--expand", type=int, default=None, metavar="TOKENS",
+                        help="Add multi-hop neighbors (ranked) within this token budget")
 
     args = parser.parse_args()
 
@@ -335,30 +400,14 @@ def main():
 
     try:
         if args.search:
-            from wake.search import search_fragments, search_events, search_wm, search_all
-            if args.type == "fragments":
-                results = search_fragments(conn, args.search)
-                result = _format_search_results("Fragments", results, "key")
-            elif args.type == "events":
-                results = search_events(conn, args.search)
-                result = _format_search_results("Events", results, "id")
-            elif args.type == "wm":
-                results = search_wm(conn, args.search)
-                result = _format_search_results("Working Memory", results, "id")
-            else:
-                all_results = search_all(conn, args.search)
-                parts = [f"# Search: {args.search} ({_format_date()})"]
-                for section, key_field in [("Fragments", "key"), ("Events", "id"), ("Working Memory", "id")]:
-                    section_key = section.lower().replace(" ", "_")
-                    if section_key == "working_memory":
-                        section_key = "wm"
-                    items = all_results.get(section_key, [])
-                    parts.append(f"\n## {section} ({len(items)} matches)")
-                    for item in items:
-                        label = item.get(key_field, "?")
-                        snippet = item.get("snippet", "")
-                        parts.append(f"- [{label}] {snippet}")
-                result = "\n".join(parts)
+            from wake.search_engine import search
+            page = search(
+                db_path, args.search,
+                tables=[args.type] if args.type else None,
+                limit=args.limit, cursor=args.cursor,
+                since=args.since, until=args.until,
+            )
+            result = _format_search_results(args.search, page)
         elif args.all:
             result = extract_all(conn)
         elif args.wm:
@@ -367,9 +416,9 @@ def main():
             result = extract_summaries(db_path)
         elif args.keys:
             if len(args.keys) == 1:
-                result = extract_single(conn, args.keys[0])
+                result = extract_single(conn, args.keys[0], args.expand)
             else:
-                result = extract_multi(conn, args.keys)
+                result = extract_multi(conn, args.keys, args.expand)
         else:
             parser.print_help()
             sys.exit(0)
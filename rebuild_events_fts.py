@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Rebuild events_fts in events.sqlite as an external-content index.
+
+Up to events schema v2, events_fts kept its own copy of every event
+body. This indexes the log into a new table that reads bodies from
+events instead, in batches with a commit between each, while the old
+index keeps serving search — so it can run against a live log and be
+interrupted and resumed. The swap at the end is one short transaction.
+
+The old index's pages go to the freelist; --vacuum gives them back.
+VACUUM rewrites the whole file and blocks writers while it runs.
+
+Usage:
+  python rebuild_events_fts.py
+  python rebuild_events_fts.py --events data/events.sqlite --batch 2000
+  python rebuild_events_fts.py --vacuum
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Project root — where this script lives
+ROOT = Path(__file__).resolve().parent
+
+# Add project root to path so imports work
+sys.path.insert(0, str(ROOT))
+
+from wake.events_schema import (
+    FTS_BATCH,
+    backfill_fts,
+    connect_events,
+    finish_fts_rebuild,
+    fts_rebuild_pending,
+    start_fts_rebuild,
+)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Move events_fts to an external-content index without taking the log offline."
+    )
+    parser.add_argument(
+        "--events", default=None,
+        help="Path to events.sqlite (default: data/events.sqlite).",
+    )
+    parser.add_argument(
+        "--batch", type=int, default=FTS_BATCH,
+        help=f"Events per transaction (default: {FTS_BATCH}).",
+    )
+    parser.add_argument(
+        "--vacuum", action="store_true",
+        help="VACUUM afterwards so the file actually shrinks.",
+    )
+
+    args = parser.parse_args()
+
+    events_path = Path(args.events) if args.events else ROOT / "data" / "events.sqlite"
+    if not events_path.exists():
+        print(f"Error: events database not found at {events_path}", file=sys.stderr)
+        return 1
+
+    size_before = events_path.stat().st_size
+    conn = connect_events(events_path)
+    try:
+        if fts_rebuild_pending(conn):
+            start_fts_rebuild(conn)
+            conn.commit()
+
+            total = 0
+            while True:
+                n = backfill_fts(conn, limit=args.batch)
+                conn.commit()
+                if n == 0:
+                    break
+                total += n
+                print(f"  indexed {total} events...")
+
+            finish_fts_rebuild(conn)
+            print(f"Done. {total} events indexed, events_fts swapped.")
+        else:
+            print("events_fts is already external-content.")
+
+        if args.vacuum:
+            print("Vacuuming...")
+            conn.execute("VACUUM")
+            size_after = events_path.stat().st_size
+            print(f"  {size_before / 1e6:.1f} MB → {size_after / 1e6:.1f} MB")
+    finally:
+        conn.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
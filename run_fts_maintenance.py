@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Merge FTS5 segments and report index health.
+
+The worker does this on its own when idle (every few hours, a couple
+of seconds at a time). This runs it by hand — same lock-bounded merge
+steps, so it's safe against a live worker.
+
+Usage:
+  python run_fts_maintenance.py
+  python run_fts_maintenance.py --pages 20000 --seconds 30
+  python run_fts_maintenance.py --index events_fts
+  python run_fts_maintenance.py --report     # last stored report, no merge
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Project root — where this script lives
+ROOT = Path(__file__).resolve().parent
+
+# Add project root to path so imports work
+sys.path.insert(0, str(ROOT))
+
+from wake import fts_maintenance
+from wake.schema import migrate
+
+
+def print_report(report: dict) -> None:
+    print(f"{report['started_at']} → {report['finished_at']}"
+          f"{'' if report['complete'] else '  (unfinished)'}")
+    print(f"{'index':>24}  {'segments':>10}  {'size':>17}  {'latency':>16}  {'steps':>5}  {'max lock':>8}")
+    for r in report["indexes"]:
+        before, after = r["before"], r["after"]
+        print(
+            f"{r['index']:>24}  {before['segments']:>4} → {after['segments']:<3}  "
+            f"{before['size_bytes'] / 1024:>6.0f}K → {after['size_bytes'] / 1024:>6.0f}K  "
+            f"{before['latency_ms']:>5.2f} → {after['latency_ms']:>5.2f}ms  "
+            f"{r['steps']:>5}  {r['max_lock_ms']:>6.2f}ms"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Incrementally merge FTS5 indexes and record their health."
+    )
+    parser.add_argument(
+        "--db", default=None,
+        help="Path to silentstar.sqlite (default: data/silentstar.sqlite).",
+    )
+    parser.add_argument(
+        "--pages", type=int, default=fts_maintenance.PAGE_BUDGET,
+        help=f"Pages to merge per index (default: {fts_maintenance.PAGE_BUDGET}).",
+    )
+    parser.add_argument(
+        "--seconds", type=float, default=None,
+        help="Stop after this long, across all indexes (default: no limit).",
+    )
+    parser.add_argument(
+        "--index", action="append", default=None,
+        choices=[i.fts for i in fts_maintenance.INDEXES],
+        help="Only this index (repeatable).",
+    )
+    parser.add_argument(
+        "--report", action="store_true",
+        help="Print the last stored report and exit.",
+    )
+    parser.add_argument(
+        "--json", action="store_true",
+        help="Print the report as JSON.",
+    )
+
+    args = parser.parse_args()
+
+    db_path = Path(args.db) if args.db else ROOT / "data" / "silentstar.sqlite"
+    if not db_path.exists():
+        print(f"Error: database not found at {db_path}", file=sys.stderr)
+        return 1
+
+    if args.report:
+        report = fts_maintenance.last_report(db_path)
+        if report is None:
+            print("No FTS maintenance has run yet.")
+            return 0
+    else:
+        migrate(db_path)
+        report = fts_maintenance.run(
+            db_path,
+            page_budget=args.pages,
+            time_budget=args.seconds,
+            indexes=args.index,
+        ).as_dict()
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -97,7 +97,7 @@ def _list_images(images_dir: Path) -> list[Path]:
     )
 
 
-def _get_lens_context(keys: list[str]) -> str:
+def _get_lens_context(keys: list[str], expand_budget: int | None = None) -> str:
     """Query the Gem via lens_extract for the given keys."""
     db_path = _load_db_path()
     if not db_path.exists():
@@ -106,9 +106,9 @@ def _get_lens_context(keys: list[str]) -> str:
     conn = connect(db_path)
     try:
         if len(keys) == 1:
-            return extract_single(conn, keys[0])
+            return extract_single(conn, keys[0], expand_budget)
         else:
-            return extract_multi(conn, keys)
+            return extract_multi(conn, keys, expand_budget)
     finally:
         conn.close()
 
@@ -230,6 +230,13 @@ def main() -> None:
         default=None,
         help="Comma-separated Gem keys to pull context for (overrides auto-detect)",
     )
+    parser.add_argument(
+        "--expand",
+        type=int,
+        default=None,
+        metavar="TOKENS",
+        help="Also pull multi-hop neighbors of the context keys, ranked, within this token budget",
+    )
     parser.add_argument(
         "--ask",
         type=str,
@@ -289,23 +296,19 @@ def main() -> None:
         # Optional FTS5 fallback if no keys found
         if not keys:
             try:
-                from wake.search import search_fragments
+                from wake.search_engine import search
                 db_path = _load_db_path()
                 if db_path.exists():
-                    conn = connect(db_path)
-                    try:
-                        stem = draft_path.stem.replace("-", " ").replace("_", " ")
-                        hits = search_fragments(conn, stem, limit=5)
-                        keys = [h["key"] for h in hits if h.get("key")]
-                    finally:
-                        conn.close()
+                    stem = draft_path.stem.replace("-", " ").replace("_", " ")
+                    page = search(db_path, stem, tables=["fragments"], limit=5)
+                    keys = [h.ref for h in page.hits if h.ref]
             except ImportError:
                 pass
 
     # Get lens context
     if keys:
         print(f"Context keys: {', '.join(keys)}", file=sys.stderr)
-        lens_context = _get_lens_context(keys)
+        lens_context = _get_lens_context(keys, args.expand)
     else:
         lens_context = "No context available."
 
@@ -9,7 +9,8 @@ Order is inviolable:
   2. Image Context  — how to process this image (conditional)
   3. Self-State     — what I know (ambient.md)
   4. Working Memory — plans, pins, descs, patterns, thoughts, feelings
-  5. Recalled       — lookup results from previous turn
+  5. Recalled       — lookup results from previous turn, then any
+                      [keys] Mono named this turn (same-turn recall)
   6. Recent         — conversation history (say/do/narrate), FIFO pools
   7. Current Time   — right now
   8. Hot Context    — Mono's current message, verbatim
@@ -18,6 +19,15 @@ The first two are static files. Self-State is one file.
 Working memory is shaped by decay and bounded by a hard cap.
 Conversation uses FIFO pool allocation — no decay, just recency.
 
+Recall packs to its budget rather than dropping whole lookups: each
+key steps down inventory → recognition → ambient until everything
+fits, and neighbors fill what's left by relation priority.
+
+Prompt caching (spec/cache-design.md): everything up to and including
+the stable half of working memory is identical turn to turn, so
+render_prompt() marks it with cache_control. Stable items are ordered
+by database id so the bytes don't move.
+
 Budget (token hard caps):
   Wake + Ambient:  ~2000  (file-loaded, informational)
   Working Memory:   1500
@@ -29,27 +39,30 @@ Budget (token hard caps):
 from __future__ import annotations
 
 import sqlite3
-from dataclasses import dataclass, field
-from datetime import datetime, timezone
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timezone, timedelta
 from pathlib import Path
-
-import re
+from typing import Iterator
 
 from .decay import (
     ContextFragment,
     DecayParams,
     Persistence,
-    select_within_budget,
+    SelectionStats,
+    WM_TYPE_TO_PERSISTENCE,
+    estimate_turn_rate,
+    select_fragments,
 )
+from .display import estimate_tokens as _estimate_tokens
 from .recall import RecallResult, NeighborResult
-from .schema import connect, DISPLAY_TAGS, ALL_TAGS, IDENTITY_TAGS
+from .session import TurnSession, borrow
 
 
 # Budget defaults — hard caps for each section.
 # Activation and self-state are full files, always included.
 DEFAULT_WM_BUDGET = 1500           # working memory hard cap
 DEFAULT_SUMMARIES_BUDGET = 800     # compressed summaries from the Mirror
-DEFAULT_RECALL_BUDGET = 1000       # recall results from previous turn
+DEFAULT_RECALL_BUDGET = 1000       # recall results (previous turn + same-turn)
 
 # Conversation pool budgets — FIFO allocation, most recent first.
 # Each pool fills independently. Overflow spills to flex reserve.
@@ -59,22 +72,29 @@ DEFAULT_CLAUDE_DO_POOL = 1000      # Claude's do + narrate content
 DEFAULT_FLEX_RESERVE = 1000        # overflow from any full pool
 # Hard cap: 1500 + 1500 + 1000 + 1000 = 5000 conversation tokens
 
-# Rough token estimation
-CHARS_PER_TOKEN = 4
+# Conversation scan — page backwards through the log until the pools fill
+DEFAULT_CONVERSATION_PAGE = 40     # events per keyset page
+DEFAULT_LOOKBACK_ROWS = 200        # never scan further back than this
 
 # Image token cost — one turn only, then desc replaces it
 IMAGE_TOKEN_COST = 1200
 
-# Persistence mapping from working_memory.type to Persistence enum
-WM_TYPE_TO_PERSISTENCE: dict[str, Persistence] = {
-    "feeling": Persistence.FEELING,
-    "thought": Persistence.THOUGHT,
-    "pattern": Persistence.PATTERN,
-    "desc": Persistence.DESC,
-    "plan": Persistence.PLAN,
-    "pin": Persistence.PIN,
-    "secret": Persistence.SECRET,
-}
+# WM types that change only on explicit action or over days. They go in
+# the cached prompt prefix; everything else follows the breakpoint.
+STABLE_WM_TYPES = frozenset({"secret", "pin", "plan", "pattern"})
+
+# Neighbor relations, most worth keeping first. Unlisted relations
+# follow, then unlabelled edges; multi-hop neighbors after direct ones.
+RELATION_PRIORITY = (
+    "safety-constraint", "identity", "sisters", "one-system", "member-system",
+    "character-record", "rp-relationship", "physical-anchor", "domain-inventory",
+    "shared-aesthetic", "aesthetic-overlap", "essential-craft", "handmade-flex",
+    "practice-tool", "skill-plan", "builds-toward", "level-system",
+)
+
+# cache_control for the two breakpoints (spec/cache-design.md)
+SYSTEM_CACHE_CONTROL = {"type": "ephemeral", "ttl": "1h"}
+USER_CACHE_CONTROL = {"type": "ephemeral"}
 
 
 @dataclass
@@ -89,18 +109,61 @@ class ConversationBudget:
 
     A single event can split across pools — Claude's say goes to the
     say pool while her do goes to the do pool. If a pool is full,
-    that piece tries flex. If flex is full, it's dropped.
+    that piece tries flex. If flex is full too, the pool is closed:
+    nothing older goes in it, so a gap never opens in the middle of
+    the conversation.
+
+    The log is read newest-first in pages of page_size events. Reading
+    stops once mono, say and do are all closed, or the lookback horizon
+    (rows and/or hours) is reached.
     """
     mono_pool: int = DEFAULT_MONO_POOL
     claude_say_pool: int = DEFAULT_CLAUDE_SAY_POOL
     claude_do_pool: int = DEFAULT_CLAUDE_DO_POOL
     flex_reserve: int = DEFAULT_FLEX_RESERVE
+    page_size: int = DEFAULT_CONVERSATION_PAGE
+    lookback_rows: int = DEFAULT_LOOKBACK_ROWS
+    lookback_hours: float | None = None
 
     @property
     def hard_cap(self) -> int:
         return self.mono_pool + self.claude_say_pool + self.claude_do_pool + self.flex_reserve
 
 
+@dataclass
+class ConversationStats:
+    """How much of the log the conversation loader read to fill the pools."""
+    rows_scanned: int = 0             # display rows read
+    rows_used: int = 0                # rows that put at least one piece in a pool
+    pages: int = 0                    # keyset pages fetched
+    stop_reason: str = "log_start"    # pools_closed | lookback_rows | lookback_hours | log_start
+
+    def as_dict(self) -> dict:
+        return {
+            "rows_scanned": self.rows_scanned,
+            "rows_used": self.rows_used,
+            "pages": self.pages,
+            "stop_reason": self.stop_reason,
+        }
+
+
+@dataclass
+class RecallPacking:
+    """What recall packing kept of each lookup, and at what depth."""
+    budget: int = 0
+    used: int = 0
+    keys: list[dict] = field(default_factory=list)   # per kept result
+    dropped: list[str] = field(default_factory=list)  # not even ambient fit
+
+    def as_dict(self) -> dict:
+        return {
+            "budget": self.budget,
+            "used": self.used,
+            "keys": self.keys,
+            "dropped": self.dropped,
+        }
+
+
 @dataclass
 class WakeConfig:
     """Everything the assembler needs."""
@@ -114,6 +177,8 @@ class WakeConfig:
     conversation: ConversationBudget = field(default_factory=ConversationBudget)
     recall_budget: int = DEFAULT_RECALL_BUDGET
     decay_params: DecayParams = field(default_factory=DecayParams)
+    wm_selector: str = "greedy"         # "greedy" or "knapsack" (see decay.select_fragments)
+    wm_type_weights: dict[str, float] | None = None  # knapsack value multiplier per WM type
 
 
 @dataclass
@@ -123,16 +188,18 @@ class WakePackage:
     image_context: str | None                 # how to handle image (conditional)
     self_state: str                           # what I know
     summaries: list[str]                      # compressed history from the Mirror
-    working_memory: list[ContextFragment]     # active knowledge
-    recall_results: list[RecallResult]        # lookups from previous turn
+    working_memory: list[ContextFragment]     # active knowledge (stable, then volatile)
+    recall_results: list[RecallResult]        # lookups from previous turn (+ same-turn)
     conversation: list[ContextFragment]       # recent messages
     current_time: str                         # right now, human-readable
     hot_context: str                          # Mono's current message
     has_image: bool                           # image in current message
-
-
-def _estimate_tokens(text: str) -> int:
-    return max(len(text) // CHARS_PER_TOKEN, 1)
+    conversation_stats: ConversationStats | None = None  # scan vs used
+    wm_selection: SelectionStats | None = None           # which WM selector ran, score captured
+    stable_wm: list[ContextFragment] = field(default_factory=list)    # cached prefix, by DB id
+    volatile_wm: list[ContextFragment] = field(default_factory=list)  # after the breakpoint
+    same_turn_keys: list[str] = field(default_factory=list)  # recalled from Mono's message
+    recall_packing: RecallPacking | None = None           # depth chosen per recalled key
 
 
 def _load_file(path: Path) -> str:
@@ -146,45 +213,22 @@ def _format_time(now: datetime) -> str:
     return now.strftime("It's %A, %B %d, %Y — %I:%M %p").replace(" 0", " ")
 
 
-# Regex to strip all known tags from raw content, leaving just the text
-_ALL_STRIP_TAGS = ALL_TAGS | IDENTITY_TAGS
-_TAG_STRIP_RE = re.compile(
-    r"</?(" + "|".join(re.escape(t) for t in _ALL_STRIP_TAGS) + r")>",
-)
-
-# Regex to extract display-tag content only
-_DISPLAY_TAG_RE = re.compile(
-    r"<(" + "|".join(re.escape(t) for t in DISPLAY_TAGS) + r")>"
-    r"(.*?)"
-    r"</\1>",
-    re.DOTALL,
-)
-
-
-def _extract_display_content(raw: str, actor: str) -> str | None:
-    """Extract just the say/do/narrate content from a raw message.
-    Returns formatted display text, or None if no display content."""
-    matches = _DISPLAY_TAG_RE.findall(raw)
-    if not matches:
-        # No display tags — check if this is a simple untagged message
-        # (likely from Mono, where the whole message is display content)
-        clean = _TAG_STRIP_RE.sub("", raw).strip()
-        if clean:
-            return f"{actor}: {clean}" if actor else clean
-        return None
-
-    parts = []
-    for tag, content in matches:
-        text = content.strip()
-        if not text:
-            continue
-        parts.append(text)
+def _wm_id(frag: ContextFragment) -> int:
+    """Database id from a 'wm:<id>' source. Unknown sorts last."""
+    try:
+        return int(frag.source.split(":", 1)[1])
+    except (IndexError, ValueError):
+        return 1 << 62
 
-    if not parts:
-        return None
 
-    combined = " ".join(parts)
-    return f"{actor}: {combined}" if actor else combined
+def _split_stable(
+    working_memory: list[ContextFragment],
+) -> tuple[list[ContextFragment], list[ContextFragment]]:
+    """Stable WM by DB id (byte-identical across turns), volatile as given."""
+    stable = [f for f in working_memory if f.tags and f.tags[0] in STABLE_WM_TYPES]
+    volatile = [f for f in working_memory if not (f.tags and f.tags[0] in STABLE_WM_TYPES)]
+    stable.sort(key=_wm_id)
+    return stable, volatile
 
 
 def _has_image(hot_context: str, image_path: str | None = None) -> bool:
@@ -201,11 +245,13 @@ def _load_working_memory(
     current_turn: int,
     token_budget: int,
     params: DecayParams,
-) -> tuple[list[ContextFragment], float]:
+    selector: str = "greedy",
+    type_weights: dict[str, float] | None = None,
+) -> tuple[list[ContextFragment], float, SelectionStats]:
     """
     Load active working memory items, scored by type-specific decay.
 
-    Returns (selected_fragments, fill_ratio).
+    Returns (selected_fragments, fill_ratio, selection_stats).
     Fill ratio is informational — how full the WM budget is.
     """
     rows = conn.execute("""
@@ -217,12 +263,7 @@ def _load_working_memory(
     """).fetchall()
 
     # Estimate turn rate for WM items (they don't store creation turn)
-    first_row = conn.execute("SELECT MIN(ts) FROM ev.events").fetchone()
-    turn_rate = 0.0  # turns per second
-    if first_row and first_row[0] and current_turn > 0:
-        first_ts = datetime.fromisoformat(first_row[0]).replace(tzinfo=timezone.utc)
-        total_seconds = max((now - first_ts).total_seconds(), 1.0)
-        turn_rate = current_turn / total_seconds
+    turn_rate = estimate_turn_rate(conn, now, current_turn)  # turns per second
 
     fragments = []
     total_active_tokens = 0
@@ -271,15 +312,16 @@ def _load_working_memory(
         )
         fragments.append(frag)
 
-    selected = select_within_budget(
-        fragments, now, current_turn, token_budget, params
+    selected, stats = select_fragments(
+        fragments, now, current_turn, token_budget, params,
+        selector=selector, type_weights=type_weights,
     )
 
     # Fill ratio: how much of the budget did we actually use?
     used_tokens = sum(f.token_estimate for f in selected)
     fill_ratio = used_tokens / token_budget if token_budget > 0 else 0.0
 
-    return selected, fill_ratio
+    return selected, fill_ratio, stats
 
 
 def _load_summaries(
@@ -328,10 +370,49 @@ def _load_summaries(
         sum_conn.close()
 
 
+def _iter_display_rows(
+    conn: sqlite3.Connection,
+    page_size: int,
+    stats: ConversationStats,
+) -> Iterator[sqlite3.Row]:
+    """Visible display rows, newest first, fetched in keyset pages by id."""
+    before = None
+    while True:
+        if before is None:
+            page = conn.execute("""
+                SELECT event_id, ts, actor, actor_class, tags,
+                       mono_text, mono_tokens, say_text, say_tokens,
+                       do_text, do_tokens, image_path
+                FROM ev.event_display
+                WHERE visible = 1
+                ORDER BY event_id DESC
+                LIMIT ?
+            """, (page_size,)).fetchall()
+        else:
+            page = conn.execute("""
+                SELECT event_id, ts, actor, actor_class, tags,
+                       mono_text, mono_tokens, say_text, say_tokens,
+                       do_text, do_tokens, image_path
+                FROM ev.event_display
+                WHERE visible = 1 AND event_id < ?
+                ORDER BY event_id DESC
+                LIMIT ?
+            """, (before, page_size)).fetchall()
+
+        if not page:
+            return
+        stats.pages += 1
+        yield from page
+        if len(page) < page_size:
+            return
+        before = page[-1]["event_id"]
+
+
 def _load_conversation(
     conn: sqlite3.Connection,
     budget: ConversationBudget,
-) -> list[ContextFragment]:
+    now: datetime | None = None,
+) -> tuple[list[ContextFragment], ConversationStats]:
     """
     Load recent conversation using FIFO pool allocation.
 
@@ -344,17 +425,17 @@ def _load_conversation(
 
     A single Claude event can have its say kept but do dropped (or
     vice versa) if one pool fills before the other.
+
+    Reads ev.event_display — text and token counts were worked out
+    when each event was written (see display.py). Pages backwards; a
+    pool closes at the first piece that fits neither it nor flex, and
+    reading stops once every pool is closed or the lookback runs out.
+    Returns (fragments, stats).
     """
-    rows = conn.execute("""
-        SELECT e.id, e.ts, e.content, e.actor, e.image_path,
-               GROUP_CONCAT(t.tag) as tags
-        FROM ev.events e
-        LEFT JOIN ev.event_tags t ON t.event_id = e.id AND t.tag IN ('say', 'do', 'narrate')
-        WHERE t.tag IS NOT NULL OR e.actor IS NOT NULL
-        GROUP BY e.id
-        ORDER BY e.ts DESC
-        LIMIT 200
-    """).fetchall()
+    stats = ConversationStats()
+    horizon = None
+    if budget.lookback_hours is not None:
+        horizon = (now or datetime.now(timezone.utc)) - timedelta(hours=budget.lookback_hours)
 
     mono_remaining = budget.mono_pool
     say_remaining = budget.claude_say_pool
@@ -362,23 +443,35 @@ def _load_conversation(
     flex_remaining = budget.flex_reserve
 
     selected = []
+    mono_open = say_open = do_open = True
 
-    for row in rows:
-        tags = (row["tags"] or "").split(",")
-        tags = [t.strip() for t in tags if t.strip()]
+    for row in _iter_display_rows(conn, max(budget.page_size, 1), stats):
+        if not (mono_open or say_open or do_open):
+            stats.stop_reason = "pools_closed"
+            break
+        if stats.rows_scanned >= budget.lookback_rows:
+            stats.stop_reason = "lookback_rows"
+            break
 
         ts = datetime.fromisoformat(row["ts"]).replace(tzinfo=timezone.utc)
-        actor = row["actor"]
+        if horizon is not None and ts < horizon:
+            stats.stop_reason = "lookback_hours"
+            break
+
+        stats.rows_scanned += 1
+        used_before = len(selected)
+
+        tags = (row["tags"] or "").split(",")
+        tags = [t for t in tags if t]
         img = row["image_path"] or None
-        is_claude = actor is None or actor in ("claude", "y'lhara")
 
-        if not is_claude:
+        if row["actor_class"] == "mono":
             # Mono's entire message → mono pool
-            content = _extract_display_content(row["content"], actor or "mono")
-            if not content:
+            content = row["mono_text"]
+            if not content or not mono_open:
                 continue
 
-            tokens = _estimate_tokens(content)
+            tokens = row["mono_tokens"]
             if img:
                 tokens += IMAGE_TOKEN_COST
 
@@ -387,6 +480,7 @@ def _load_conversation(
             elif tokens <= flex_remaining:
                 flex_remaining -= tokens
             else:
+                mono_open = False
                 continue
 
             selected.append(ContextFragment(
@@ -395,38 +489,15 @@ def _load_conversation(
                 turn_number=0,
                 persistence=Persistence.CONVERSATION,
                 tags=tags,
-                source=f"event:{row['id']}",
+                source=f"event:{row['event_id']}",
                 image_path=img,
                 token_estimate=tokens,
             ))
         else:
-            # Claude — split content by tag category
-            raw = row["content"]
-            matches = _DISPLAY_TAG_RE.findall(raw)
-
-            say_parts = []
-            do_parts = []
-
-            for tag, content_text in matches:
-                text = content_text.strip()
-                if not text:
-                    continue
-                if tag == "say":
-                    say_parts.append(text)
-                elif tag in ("do", "narrate"):
-                    do_parts.append(text)
-
-            # Fallback: untagged Claude content treated as say
-            if not say_parts and not do_parts:
-                clean = _TAG_STRIP_RE.sub("", raw).strip()
-                if clean:
-                    say_parts.append(clean)
-
-            # Allocate say content
-            if say_parts:
-                say_text = " ".join(say_parts)
-                say_content = f"{actor}: {say_text}" if actor else say_text
-                say_tokens = _estimate_tokens(say_content)
+            # Claude — say and do/narrate were split at write time
+            say_content = row["say_text"]
+            if say_content and say_open:
+                say_tokens = row["say_tokens"]
 
                 allocated = False
                 if say_tokens <= say_remaining:
@@ -435,6 +506,8 @@ def _load_conversation(
                 elif say_tokens <= flex_remaining:
                     flex_remaining -= say_tokens
                     allocated = True
+                else:
+                    say_open = False
 
                 if allocated:
                     selected.append(ContextFragment(
@@ -443,15 +516,13 @@ def _load_conversation(
                         turn_number=0,
                         persistence=Persistence.CONVERSATION,
                         tags=[t for t in tags if t == "say"],
-                        source=f"event:{row['id']}:say",
+                        source=f"event:{row['event_id']}:say",
                         token_estimate=say_tokens,
                     ))
 
-            # Allocate do/narrate content
-            if do_parts:
-                do_text = " ".join(do_parts)
-                do_content = f"{actor}: {do_text}" if actor else do_text
-                do_tokens = _estimate_tokens(do_content)
+            do_content = row["do_text"]
+            if do_content and do_open:
+                do_tokens = row["do_tokens"]
 
                 allocated = False
                 if do_tokens <= do_remaining:
@@ -460,6 +531,8 @@ def _load_conversation(
                 elif do_tokens <= flex_remaining:
                     flex_remaining -= do_tokens
                     allocated = True
+                else:
+                    do_open = False
 
                 if allocated:
                     selected.append(ContextFragment(
@@ -468,36 +541,107 @@ def _load_conversation(
                         turn_number=0,
                         persistence=Persistence.CONVERSATION,
                         tags=[t for t in tags if t in ("do", "narrate")],
-                        source=f"event:{row['id']}:do",
+                        source=f"event:{row['event_id']}:do",
                         token_estimate=do_tokens,
                     ))
 
+        if len(selected) > used_before:
+            stats.rows_used += 1
+
     # Chronological order for natural reading
     selected.sort(key=lambda f: f.timestamp)
-    return selected
+    return selected, stats
+
+
+def _relation_rank(relation: str) -> tuple[int, bool]:
+    """Sort key for a neighbor's relation — lower keeps first."""
+    base, _, via = relation.partition(", via ")
+    if base.startswith("via "):  # unlabelled multi-hop edge
+        base, via = "", base
+    if base in RELATION_PRIORITY:
+        rank = RELATION_PRIORITY.index(base)
+    else:
+        rank = len(RELATION_PRIORITY) + (0 if base else 1)
+    return rank, bool(via)
 
 
 def _format_recall_results(
     results: list[RecallResult],
     token_budget: int,
-) -> list[RecallResult]:
-    """Trim recall results to fit within budget."""
+) -> tuple[list[RecallResult], RecallPacking]:
+    """Pack recall results into budget, degrading depth before dropping.
+
+    1. Every result at its shallowest tier, in order — a result only
+       drops out if even that doesn't fit.
+    2. One tier deeper at a time, across all results in order, so three
+       keys go to recognition before any one goes to inventory.
+    3. Neighbors fill what's left, best relation first. A neighbor that
+       is itself a recalled key is redundant and skipped.
+
+    Returns trimmed copies; the inputs are untouched.
+    """
+    packing = RecallPacking(budget=token_budget)
     if not results:
-        return []
+        return [], packing
 
-    selected = []
     remaining = token_budget
 
-    for result in results:
-        cost = _estimate_tokens(result.content)
-        for n in result.neighbors:
-            cost += _estimate_tokens(n.ambient)
-
-        if cost <= remaining:
-            selected.append(result)
-            remaining -= cost
+    # (depth, content, tokens), shallowest first
+    options = []
+    for r in results:
+        tiers = r.tiers or {r.depth: r.content}
+        options.append([(d, c, _estimate_tokens(c)) for d, c in reversed(tiers.items())])
+
+    level: dict[int, int] = {}
+    for i, opts in enumerate(options):
+        if opts[0][2] <= remaining:
+            level[i] = 0
+            remaining -= opts[0][2]
+        else:
+            packing.dropped.append(results[i].key)
+
+    deepened = True
+    while deepened:
+        deepened = False
+        for i, at in level.items():
+            if at + 1 < len(options[i]):
+                step = options[i][at + 1][2] - options[i][at][2]
+                if step <= remaining:
+                    level[i] = at + 1
+                    remaining -= step
+                    deepened = True
+
+    recalled = {results[i].key for i in level}
+    candidates = sorted(
+        (
+            (_relation_rank(n.relation), i, j)
+            for i in level
+            for j, n in enumerate(results[i].neighbors)
+            if n.key not in recalled
+        ),
+    )
+    kept: dict[int, list[int]] = {i: [] for i in level}
+    for _, i, j in candidates:
+        tokens = _estimate_tokens(results[i].neighbors[j].ambient)
+        if tokens <= remaining:
+            kept[i].append(j)
+            remaining -= tokens
 
-    return selected
+    selected = []
+    for i, at in level.items():
+        r = results[i]
+        depth, content, _ = options[i][at]
+        neighbors = [r.neighbors[j] for j in sorted(kept[i])]
+        selected.append(replace(r, content=content, depth=depth, neighbors=neighbors))
+        packing.keys.append({
+            "key": r.key,
+            "depth": depth,
+            "deepest": options[i][-1][0],
+            "neighbors": len(neighbors),
+            "neighbors_offered": len(r.neighbors),
+        })
+    packing.used = token_budget - remaining
+    return selected, packing
 
 
 def assemble(
@@ -506,16 +650,26 @@ def assemble(
     current_turn: int,
     recall_results: list[RecallResult] | None = None,
     image_path: str | None = None,
+    session: TurnSession | None = None,
+    same_turn_recall: list[RecallResult] | None = None,
 ) -> WakePackage:
     """
     Build the full context window.
     Working memory: decay-scored within hard cap.
     Conversation: FIFO pool allocation (mono / say / do / flex).
+
+    same_turn_recall holds lookups for keys in Mono's current message.
+    They share the recall budget and go after what I asked for last
+    turn, so my own recall is never crowded out.
+
+    Pass the turn's session to read through its connection; otherwise
+    one is opened on config.db_path for the duration of the call.
     """
     now = datetime.now(timezone.utc)
-    conn = connect(config.db_path)
 
-    try:
+    with borrow(session or config.db_path) as s:
+        conn = s.conn
+
         # 1. Activation — who I am
         activation = _load_file(config.wake_context_path)
 
@@ -533,17 +687,26 @@ def assemble(
         summaries = _load_summaries(sum_path, config.summaries_budget)
 
         # Working memory — decay-scored within hard cap
-        working_memory, _ = _load_working_memory(
-            conn, now, current_turn, config.wm_budget, config.decay_params
+        working_memory, _, wm_selection = _load_working_memory(
+            conn, now, current_turn, config.wm_budget, config.decay_params,
+            config.wm_selector, config.wm_type_weights,
         )
+        stable_wm, volatile_wm = _split_stable(working_memory)
 
         # Conversation — FIFO pool allocation
-        conversation = _load_conversation(conn, config.conversation)
+        conversation, conversation_stats = _load_conversation(
+            conn, config.conversation, now
+        )
 
-        # Recall results from previous turn
-        trimmed_recall = _format_recall_results(
-            recall_results or [], config.recall_budget
+        # Recall results from previous turn, then same-turn lookups
+        previous = recall_results or []
+        previous_keys = {r.key for r in previous}
+        same_turn = [r for r in same_turn_recall or [] if r.key not in previous_keys]
+        trimmed_recall, recall_packing = _format_recall_results(
+            previous + same_turn, config.recall_budget
         )
+        same_turn_set = {r.key for r in same_turn}
+        same_turn_keys = [r.key for r in trimmed_recall if r.key in same_turn_set]
 
         # Current time
         current_time = _format_time(now)
@@ -553,17 +716,20 @@ def assemble(
             image_context=image_context,
             self_state=self_state,
             summaries=summaries,
-            working_memory=working_memory,
+            working_memory=stable_wm + volatile_wm,
             recall_results=trimmed_recall,
             conversation=conversation,
             current_time=current_time,
             hot_context=hot_context,
             has_image=has_image,
+            conversation_stats=conversation_stats,
+            wm_selection=wm_selection,
+            stable_wm=stable_wm,
+            volatile_wm=volatile_wm,
+            same_turn_keys=same_turn_keys,
+            recall_packing=recall_packing,
         )
 
-    finally:
-        conn.close()
-
 
 def snapshot_manifest(package: WakePackage) -> tuple[dict, dict]:
     """Extract token counts and item metadata from a WakePackage.
@@ -620,8 +786,15 @@ def snapshot_manifest(package: WakePackage) -> tuple[dict, dict]:
         "summary_count": len(package.summaries),
         "conversation_event_count": conversation_event_count,
         "recall_keys": recall_keys,
+        "same_turn_recall_keys": package.same_turn_keys,
         "has_image": package.has_image,
     }
+    if package.conversation_stats is not None:
+        items_included["conversation_scan"] = package.conversation_stats.as_dict()
+    if package.wm_selection is not None:
+        items_included["wm_selection"] = package.wm_selection.as_dict()
+    if package.recall_packing is not None:
+        items_included["recall_packing"] = package.recall_packing.as_dict()
 
     return token_counts, items_included
 
@@ -660,6 +833,16 @@ def render_user(package: WakePackage) -> str:
     What I know, what I'm holding, what was said recently, what's
     being said right now. The world I wake up inside.
     """
+    text, _ = _render_user_split(package)
+    return text
+
+
+def _render_user_split(package: WakePackage) -> tuple[str, int]:
+    """render_user() text, plus where its stable prefix ends.
+
+    The prefix is self-state, summaries, and the stable half of
+    Lingering. Returns (text, offset) — offset 0 means no prefix.
+    """
     sections = []
 
     # Self-state — what I know
@@ -670,16 +853,27 @@ def render_user(package: WakePackage) -> str:
     if package.summaries:
         sections.append("Remembered:\n" + "\n\n".join(package.summaries))
 
-    # Working memory — what I'm holding
-    if package.working_memory:
-        wm_lines = [f.content for f in package.working_memory]
-        sections.append("Lingering:\n" + "\n".join(wm_lines))
+    prefix_sections = list(sections)
+
+    # Working memory — what I'm holding. Stable first, so it can sit
+    # inside the cached prefix; volatile after.
+    stable_lines = [f.content for f in package.stable_wm]
+    volatile_lines = [f.content for f in package.volatile_wm]
+    if not package.stable_wm and not package.volatile_wm:
+        # Package built by hand — no split, nothing cacheable here
+        volatile_lines = [f.content for f in package.working_memory]
+    if stable_lines or volatile_lines:
+        sections.append("Lingering:\n" + "\n".join(stable_lines + volatile_lines))
+    if stable_lines:
+        prefix_sections.append("Lingering:\n" + "\n".join(stable_lines))
 
     # Recall results from previous turn
     if package.recall_results:
         recall_parts = []
         for r in package.recall_results:
-            recall_parts.append(f"[{r.key}]: {r.content}")
+            deepest = next(iter(r.tiers), r.depth)
+            trimmed = f" ({r.depth}; {deepest} didn't fit)" if r.depth != deepest else ""
+            recall_parts.append(f"[{r.key}]{trimmed}: {r.content}")
             for n in r.neighbors:
                 relation = f" ({n.relation})" if n.relation else ""
                 recall_parts.append(f"  nearby — [{n.key}]{relation}: {n.ambient}")
@@ -703,4 +897,44 @@ def render_user(package: WakePackage) -> str:
     if package.hot_context:
         sections.append(package.hot_context)
 
-    return "\n\n---\n\n".join(sections)
+    text = "\n\n---\n\n".join(sections)
+    offset = len("\n\n---\n\n".join(prefix_sections)) if prefix_sections else 0
+    if offset >= len(text):
+        offset = 0  # nothing after the prefix — no point splitting
+    return text, offset
+
+
+def render_prompt(package: WakePackage) -> tuple[list[dict], list[dict]]:
+    """
+    Render as API content blocks with cache breakpoints.
+
+    Returns (system_blocks, user_blocks). Joining each list's text gives
+    exactly render_system() / render_user(), so snapshots and the CLI
+    fallback see the same prompt.
+
+      system: activation (+ image context) — breakpoint, 1h TTL
+      user:   self-state + summaries + stable WM — breakpoint, 5min TTL
+              then volatile WM, recall, conversation, time, hot context
+    """
+    system_blocks = []
+    system_text = render_system(package)
+    if system_text:
+        system_blocks.append({
+            "type": "text",
+            "text": system_text,
+            "cache_control": dict(SYSTEM_CACHE_CONTROL),
+        })
+
+    user_text, offset = _render_user_split(package)
+    user_blocks = []
+    if offset:
+        user_blocks.append({
+            "type": "text",
+            "text": user_text[:offset],
+            "cache_control": dict(USER_CACHE_CONTROL),
+        })
+        user_blocks.append({"type": "text", "text": user_text[offset:]})
+    elif user_text:
+        user_blocks.append({"type": "text", "text": user_text})
+
+    return system_blocks, user_blocks
@@ -3,7 +3,9 @@ Context snapshots — daily records of what the Heart saw.
 
 Each day gets its own SQLite file in data/context/YYYY-MM-DD.sqlite.
 Every turn appends a snapshot: the full rendered system + user text,
-token counts per section, and which items were included.
+token counts per section, and which items were included. Once the
+response is back, the API's usage (including prompt-cache reads and
+writes) is filled in on the same row.
 
 For debugging "vibe" — lets you replay exactly what context
 the Heart was given on any turn.
@@ -17,7 +19,7 @@ from datetime import datetime, timezone
 from pathlib import Path
 
 
-SCHEMA_VERSION = 1
+SCHEMA_VERSION = 2
 
 
 def connect_context(db_path: Path) -> sqlite3.Connection:
@@ -46,6 +48,9 @@ def migrate_context(db_path: Path) -> None:
         if current < 1:
             _create_v1(conn)
 
+        if current < 2:
+            _migrate_v1_to_v2(conn)
+
         conn.execute("DELETE FROM schema_version")
         conn.execute(
             "INSERT INTO schema_version (version) VALUES (?)",
@@ -75,6 +80,13 @@ def _create_v1(conn: sqlite3.Connection) -> None:
     """)
 
 
+def _migrate_v1_to_v2(conn: sqlite3.Connection) -> None:
+    """Per-turn API usage — input/output tokens, cache reads and writes."""
+    cols = {row[1] for row in conn.execute("PRAGMA table_info(snapshots)")}
+    if "usage" not in cols:
+        conn.execute("ALTER TABLE snapshots ADD COLUMN usage TEXT")
+
+
 def save_snapshot(
     context_path: Path,
     turn: int,
@@ -82,8 +94,8 @@ def save_snapshot(
     user_text: str,
     token_counts: dict,
     items_included: dict,
-) -> None:
-    """Append a snapshot to the daily context DB.
+) -> int:
+    """Append a snapshot to the daily context DB. Returns its id.
 
     Safe to call — creates the DB and schema if needed.
     """
@@ -92,7 +104,7 @@ def save_snapshot(
     now = datetime.now(timezone.utc).isoformat()
 
     try:
-        conn.execute(
+        cursor = conn.execute(
             """
             INSERT INTO snapshots (turn, ts, system_text, user_text,
                                    token_counts, items_included, created_at)
@@ -109,5 +121,19 @@ def save_snapshot(
             ),
         )
         conn.commit()
+        return cursor.lastrowid
+    finally:
+        conn.close()
+
+
+def save_usage(context_path: Path, snapshot_id: int, usage: dict) -> None:
+    """Attach the API's usage numbers to a snapshot written earlier this turn."""
+    conn = connect_context(context_path)
+    try:
+        conn.execute(
+            "UPDATE snapshots SET usage = ? WHERE id = ?",
+            (json.dumps(usage), snapshot_id),
+        )
+        conn.commit()
     finally:
         conn.close()
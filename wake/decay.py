@@ -10,14 +10,26 @@ history decays faster. "Shut up, let me think."
 
 Timed plans have a special curve: creation spike → submersion →
 resurface near due date → post-due grace.
+
+Every curve here is closed-form, so the moment an item falls below a
+threshold can be solved for when it is written. expiry_bounds() does
+that, one axis at a time; working_memory stores the answer, and the
+sweep scores only the rows whose bounds have passed.
 """
 
 from __future__ import annotations
 
 import math
+import time
 from dataclasses import dataclass, field
 from datetime import datetime, timezone, timedelta
 from enum import Enum
+from typing import Sequence
+
+try:
+    import numpy as np
+except ImportError:  # batch scoring falls back to pure Python
+    np = None
 
 
 class Persistence(Enum):
@@ -33,6 +45,18 @@ class Persistence(Enum):
     SECRET = "secret"             # no decay until revealed
 
 
+# working_memory.type → Persistence
+WM_TYPE_TO_PERSISTENCE: dict[str, Persistence] = {
+    "feeling": Persistence.FEELING,
+    "thought": Persistence.THOUGHT,
+    "pattern": Persistence.PATTERN,
+    "desc": Persistence.DESC,
+    "plan": Persistence.PLAN,
+    "pin": Persistence.PIN,
+    "secret": Persistence.SECRET,
+}
+
+
 # Half-lives per type. Each has time (hours) and turn components.
 # These are starting points — tune against real usage.
 @dataclass
@@ -263,12 +287,267 @@ def score(
     return max(raw, profile.floor)
 
 
+# --- Batch scoring ---
+#
+# score() is per fragment: datetime arithmetic, enum dispatch, math.pow.
+# score_batch() takes the same inputs as columns — epoch seconds, turn
+# numbers, persistence codes — and scores them all in one NumPy pass,
+# or one tight Python loop when NumPy isn't installed. Same curves,
+# same constants, same results as score().
+
+# Persistence → small int, for columnar input
+PERSISTENCE_CODES: dict[Persistence, int] = {p: i for i, p in enumerate(Persistence)}
+
+# Below this many fragments, NumPy's setup costs more than it saves
+NUMPY_MIN_BATCH = 256
+
+
+def _plan_curve(elapsed_hours: float, hours_until_due: float) -> float:
+    """score_timed_plan() on plain numbers."""
+    if elapsed_hours < PLAN_CREATION_SPIKE_HOURS:
+        spike_progress = elapsed_hours / PLAN_CREATION_SPIKE_HOURS
+        return 1.0 - (1.0 - PLAN_SUBMERGED_FLOOR) * _smooth_rise(spike_progress)
+    if hours_until_due < 0:
+        hours_overdue = -hours_until_due
+        if hours_overdue < PLAN_POST_DUE_GRACE_HOURS:
+            return 1.0 - 0.5 * _smooth_rise(hours_overdue / PLAN_POST_DUE_GRACE_HOURS)
+        extra_hours = hours_overdue - PLAN_POST_DUE_GRACE_HOURS
+        return 0.5 * _half_life_decay(extra_hours, 24.0)
+    if hours_until_due < PLAN_RESURFACE_HOURS:
+        resurface_progress = 1.0 - (hours_until_due / PLAN_RESURFACE_HOURS)
+        return PLAN_SUBMERGED_FLOOR + (1.0 - PLAN_SUBMERGED_FLOOR) * _smooth_rise(resurface_progress)
+    return PLAN_SUBMERGED_FLOOR
+
+
+def _half_lives(p: DecayParams) -> list[tuple[float, float, float]]:
+    """(time_hl, turn_hl, floor) per persistence code, params applied."""
+    out = []
+    for persistence in Persistence:
+        profile = DECAY_PROFILES[persistence]
+        time_hl = profile.time_half_life_hours * p.global_time_scale
+        turn_hl = profile.turn_half_life * p.global_turn_scale
+        if persistence == Persistence.CONVERSATION:
+            pressure_multiplier = 1.0 / (1.0 + p.pressure)
+            time_hl *= pressure_multiplier
+            turn_hl *= pressure_multiplier
+        out.append((time_hl, turn_hl, profile.floor))
+    return out
+
+
+def _score_batch_py(
+    anchor_epochs, created_epochs, turns, codes, due_epochs,
+    now_epoch: float, current_turn: int, p: DecayParams,
+) -> list[float]:
+    half_lives = _half_lives(p)
+    secret = PERSISTENCE_CODES[Persistence.SECRET]
+    plan = PERSISTENCE_CODES[Persistence.PLAN]
+    out = []
+    for anchor, created, turn, code, due in zip(
+        anchor_epochs, created_epochs, turns, codes, due_epochs
+    ):
+        if code == secret:
+            out.append(1.0)
+            continue
+        if code == plan:
+            if due is None or due != due:  # None or NaN — open-ended
+                out.append(1.0)
+            else:
+                elapsed_hours = max((now_epoch - created) / 3600.0, 0.0)
+                out.append(_plan_curve(elapsed_hours, (due - now_epoch) / 3600.0))
+            continue
+
+        time_hl, turn_hl, floor = half_lives[code]
+        elapsed_hours = max((now_epoch - anchor) / 3600.0, 0.0)
+        elapsed_turns = max(current_turn - turn, 0)
+        raw = (_half_life_decay(elapsed_hours, time_hl)
+               * _half_life_decay(float(elapsed_turns), turn_hl))
+        out.append(max(raw, floor))
+    return out
+
+
+def _score_batch_np(
+    anchor_epochs, created_epochs, turns, codes, due_epochs,
+    now_epoch: float, current_turn: int, p: DecayParams,
+):
+    anchor = np.asarray(anchor_epochs, dtype=np.float64)
+    created = np.asarray(created_epochs, dtype=np.float64)
+    turn = np.asarray(turns, dtype=np.float64)
+    code = np.asarray(codes, dtype=np.int64)
+    if isinstance(due_epochs, np.ndarray):
+        due = due_epochs.astype(np.float64)
+    else:
+        due = np.array([np.nan if d is None else d for d in due_epochs], dtype=np.float64)
+
+    table = np.asarray(_half_lives(p), dtype=np.float64)
+    time_hl = table[code, 0]
+    turn_hl = table[code, 1]
+    floor = table[code, 2]
+
+    def decay(elapsed, hl):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            d = np.exp2(-elapsed / hl)
+        return np.where(hl > 0, d, 0.0)
+
+    def smooth(x):
+        x = np.clip(x, 0.0, 1.0)
+        return x * x * (3.0 - 2.0 * x)
+
+    # Ordinary half-life decay on both axes
+    elapsed_hours = np.maximum((now_epoch - anchor) / 3600.0, 0.0)
+    elapsed_turns = np.maximum(current_turn - turn, 0.0)
+    scores = np.maximum(decay(elapsed_hours, time_hl) * decay(elapsed_turns, turn_hl), floor)
+
+    # Timed plans — the piecewise curve, phases in score_timed_plan() order
+    plan_age = np.maximum((now_epoch - created) / 3600.0, 0.0)
+    until = (due - now_epoch) / 3600.0
+    overdue = -until
+    spike = 1.0 - (1.0 - PLAN_SUBMERGED_FLOOR) * smooth(plan_age / PLAN_CREATION_SPIKE_HOURS)
+    grace = 1.0 - 0.5 * smooth(overdue / PLAN_POST_DUE_GRACE_HOURS)
+    tail = 0.5 * np.exp2(-(overdue - PLAN_POST_DUE_GRACE_HOURS) / 24.0)
+    resurface = PLAN_SUBMERGED_FLOOR + (1.0 - PLAN_SUBMERGED_FLOOR) * smooth(
+        1.0 - until / PLAN_RESURFACE_HOURS
+    )
+    with np.errstate(invalid="ignore"):
+        plan_scores = np.select(
+            [
+                plan_age < PLAN_CREATION_SPIKE_HOURS,
+                (until < 0) & (overdue < PLAN_POST_DUE_GRACE_HOURS),
+                until < 0,
+                until < PLAN_RESURFACE_HOURS,
+            ],
+            [spike, grace, tail, resurface],
+            default=PLAN_SUBMERGED_FLOOR,
+        )
+    plan_scores = np.where(np.isnan(due), 1.0, plan_scores)
+
+    scores = np.where(code == PERSISTENCE_CODES[Persistence.PLAN], plan_scores, scores)
+    scores = np.where(code == PERSISTENCE_CODES[Persistence.SECRET], 1.0, scores)
+    return scores
+
+
+def score_batch(
+    anchor_epochs: Sequence[float],
+    created_epochs: Sequence[float],
+    turns: Sequence[float],
+    codes: Sequence[int],
+    due_epochs: Sequence[float | None],
+    now: datetime,
+    current_turn: int,
+    params: DecayParams | None = None,
+) -> Sequence[float]:
+    """
+    Score many fragments at once. Same result as score(), element-wise.
+
+    Columns, one entry per fragment:
+      anchor_epochs  — decay anchor (refreshed_at or timestamp), epoch seconds
+      created_epochs — timestamp, epoch seconds (timed plans measure from this)
+      turns          — turn_number
+      codes          — PERSISTENCE_CODES[persistence]
+      due_epochs     — due, epoch seconds; None or NaN for no due date
+
+    Returns a NumPy array when NumPy is available and the batch is big
+    enough to be worth it, otherwise a list.
+    """
+    p = params or DecayParams()
+    now_epoch = now.timestamp()
+    if np is not None and len(codes) >= NUMPY_MIN_BATCH:
+        return _score_batch_np(
+            anchor_epochs, created_epochs, turns, codes, due_epochs,
+            now_epoch, current_turn, p,
+        )
+    return _score_batch_py(
+        anchor_epochs, created_epochs, turns, codes, due_epochs,
+        now_epoch, current_turn, p,
+    )
+
+
+def score_fragments(
+    fragments: Sequence[ContextFragment],
+    now: datetime,
+    current_turn: int,
+    params: DecayParams | None = None,
+) -> Sequence[float]:
+    """score() for a list of fragments, through score_batch()."""
+    return score_batch(
+        [f.decay_anchor.timestamp() for f in fragments],
+        [f.timestamp.timestamp() for f in fragments],
+        [f.turn_number for f in fragments],
+        [PERSISTENCE_CODES[f.persistence] for f in fragments],
+        [f.due.timestamp() if f.due is not None else None for f in fragments],
+        now,
+        current_turn,
+        params,
+    )
+
+
 # Context assembly filters at 0.01 — items below this never appear.
 # Sweep threshold is lower: items stay active longer in the DB,
 # giving the Mirror and Lens time to see them before they're marked dead.
 CONTEXT_THRESHOLD = 0.01
 SWEEP_THRESHOLD = 0.005
 
+# Candidate ids per IN (...) when the sweep re-scores
+_IN_BATCH = 500
+
+
+def expiry_bounds(
+    persistence: Persistence,
+    created_at: datetime,
+    refreshed_at: datetime | None = None,
+    turn: float | None = None,
+    due: datetime | None = None,
+    threshold: float = SWEEP_THRESHOLD,
+    params: DecayParams | None = None,
+) -> tuple[datetime | None, float | None]:
+    """When does an item's score drop below threshold?
+
+    Returns (expires_at, expires_turn). Each is the crossing on one axis
+    alone: expires_at assumes no turns pass, expires_turn assumes no time
+    passes. The real score is their product, so it always crosses at or
+    before whichever bound is hit first — a sweep on these bounds can be
+    late, never early. None means that axis never gets there.
+
+    Timed plans are solved on their piecewise curve: only the post-grace
+    tail reaches below the submerged floor, and the creation spike holds
+    the score up for its first hours whatever the due date.
+    """
+    p = params or DecayParams()
+
+    if persistence == Persistence.SECRET:
+        return None, None
+
+    if persistence == Persistence.PLAN:
+        if due is None:
+            return None, None  # open-ended plans stay until resolved
+        if threshold >= 0.5:
+            # The grace period ends at 0.5 — anything at or above that
+            # is crossed somewhere inside the curve, not worth solving
+            return None, None
+        tail_hours = 24.0 * math.log2(0.5 / threshold)
+        expires = due + timedelta(hours=PLAN_POST_DUE_GRACE_HOURS + tail_hours)
+        spike_end = created_at + timedelta(hours=PLAN_CREATION_SPIKE_HOURS)
+        return max(expires, spike_end), None
+
+    profile = DECAY_PROFILES[persistence]
+    if profile.floor >= threshold or threshold <= 0:
+        return None, None
+
+    # 0.5^(elapsed / half_life) < threshold  ⇔  elapsed > half_life · log2(1/threshold)
+    halvings = math.log2(1.0 / threshold)
+
+    expires_at = None
+    time_hl = profile.time_half_life_hours * p.global_time_scale
+    if time_hl > 0:
+        anchor = refreshed_at or created_at
+        expires_at = anchor + timedelta(hours=time_hl * halvings)
+
+    expires_turn = None
+    turn_hl = profile.turn_half_life * p.global_turn_scale
+    if turn_hl > 0 and turn is not None:
+        expires_turn = turn + turn_hl * halvings
+
+    return expires_at, expires_turn
+
 
 def sweep_decayed(
     conn: "sqlite3.Connection",
@@ -281,29 +560,82 @@ def sweep_decayed(
     Uses SWEEP_THRESHOLD (lower than CONTEXT_THRESHOLD) so items have
     a buffer zone where they've left context but are still active in the DB.
     Secrets and open-ended plans are never swept.
-    """
-    import sqlite3
 
-    rows = conn.execute("""
-        SELECT id, type, content, due, turn, created_at, refreshed_at
-        FROM working_memory
-        WHERE status = 'active'
-    """).fetchall()
+    With default params the expiry indexes pick the candidates — rows
+    past either stored bound — and only those are scored, so work is
+    proportional to what expires, not to what's active. A candidate is
+    marked only if score() says it is below threshold. Custom half-life
+    scaling doesn't match the stored bounds, so it falls back to scoring
+    every active row.
+    """
+    p = params or DecayParams()
+    if p.global_time_scale != 1.0 or p.global_turn_scale != 1.0:
+        return _sweep_scored(conn, now, current_turn, p)
 
-    if not rows:
+    now_iso = now.isoformat()
+    # INDEXED BY keeps the planner off idx_wm_status, which would walk
+    # every active row
+    candidates = [row[0] for row in conn.execute("""
+        SELECT id FROM working_memory INDEXED BY idx_wm_expires_at
+        WHERE status = 'active' AND expires_at < ?
+        UNION
+        SELECT id FROM working_memory INDEXED BY idx_wm_expires_turn
+        WHERE status = 'active' AND expires_turn < ?
+    """, (now_iso, current_turn))]
+    if not candidates:
         return 0
+    return _sweep_scored(conn, now, current_turn, p, candidates)
 
-    # Estimate turn rate for items without stored turn
+
+def estimate_turn_rate(
+    conn: "sqlite3.Connection",
+    now: datetime,
+    current_turn: int,
+) -> float:
+    """Turns per second since the first event. 0.0 if unknown."""
     first_row = conn.execute("SELECT MIN(ts) FROM ev.events").fetchone()
-    turn_rate = 0.0
     if first_row and first_row[0] and current_turn > 0:
         first_ts = datetime.fromisoformat(first_row[0]).replace(tzinfo=timezone.utc)
         total_seconds = max((now - first_ts).total_seconds(), 1.0)
-        turn_rate = current_turn / total_seconds
+        return current_turn / total_seconds
+    return 0.0
+
+
+def _sweep_scored(
+    conn: "sqlite3.Connection",
+    now: datetime,
+    current_turn: int,
+    p: DecayParams,
+    candidates: list[int] | None = None,
+) -> int:
+    """Score active rows in Python and mark the ones below threshold.
+
+    candidates limits it to those ids; None scores every active row.
+    """
+    columns = "id, type, content, due, turn, created_at, refreshed_at"
+    if candidates is None:
+        rows = conn.execute(f"""
+            SELECT {columns} FROM working_memory
+            WHERE status = 'active'
+        """).fetchall()
+    else:
+        rows = []
+        for i in range(0, len(candidates), _IN_BATCH):
+            chunk = candidates[i:i + _IN_BATCH]
+            rows.extend(conn.execute(f"""
+                SELECT {columns} FROM working_memory
+                WHERE status = 'active' AND id IN ({",".join("?" * len(chunk))})
+            """, chunk))
+
+    if not rows:
+        return 0
+
+    # Estimate turn rate for items without stored turn
+    turn_rate = estimate_turn_rate(conn, now, current_turn)
 
-    p = params or DecayParams()
     now_iso = now.isoformat()
-    marked = 0
+    ids = []
+    frags = []
 
     for row in rows:
         wm_type = row["type"]
@@ -312,15 +644,7 @@ def sweep_decayed(
         if wm_type == "secret":
             continue
 
-        persistence_map = {
-            "feeling": Persistence.FEELING,
-            "thought": Persistence.THOUGHT,
-            "pattern": Persistence.PATTERN,
-            "desc": Persistence.DESC,
-            "plan": Persistence.PLAN,
-            "pin": Persistence.PIN,
-        }
-        persistence = persistence_map.get(wm_type, Persistence.THOUGHT)
+        persistence = WM_TYPE_TO_PERSISTENCE.get(wm_type, Persistence.THOUGHT)
 
         ts = datetime.fromisoformat(row["created_at"]).replace(tzinfo=timezone.utc)
         refreshed = datetime.fromisoformat(row["refreshed_at"]).replace(tzinfo=timezone.utc)
@@ -338,7 +662,8 @@ def sweep_decayed(
         else:
             estimated_turn = current_turn
 
-        frag = ContextFragment(
+        ids.append(row["id"])
+        frags.append(ContextFragment(
             content=row["content"],
             timestamp=ts,
             turn_number=estimated_turn,
@@ -347,53 +672,213 @@ def sweep_decayed(
             due=due,
             tags=[wm_type],
             source=f"wm:{row['id']}",
-        )
+        ))
 
-        s = score(frag, now, current_turn, p)
-        if s < SWEEP_THRESHOLD:
-            conn.execute(
-                "UPDATE working_memory SET status = 'decayed', resolved_at = ? WHERE id = ?",
-                (now_iso, row["id"]),
-            )
-            marked += 1
+    scores = score_fragments(frags, now, current_turn, p)
+    dead = [(now_iso, wm_id) for wm_id, s in zip(ids, scores) if s < SWEEP_THRESHOLD]
+    conn.executemany(
+        "UPDATE working_memory SET status = 'decayed', resolved_at = ? WHERE id = ?",
+        dead,
+    )
+    return len(dead)
 
-    return marked
 
+# --- Working memory selection ---
+#
+# Greedy takes the highest scores that still fit. One big pin near the
+# top can shut out three medium items worth more together, and a
+# 1500-token cap makes that common. The knapsack selector maximizes the
+# total (optionally type-weighted) score instead: a DP over token
+# buckets, narrowed to the strongest candidates when there are many,
+# and abandoned for greedy if it runs past its time cap.
 
-def select_within_budget(
+WM_SELECTORS = ("greedy", "knapsack")
+
+KNAPSACK_BUCKETS = 150          # DP capacity resolution (budget / buckets tokens each)
+KNAPSACK_MAX_ITEMS = 48         # more candidates than this → DP on the top ones only
+KNAPSACK_TIME_CAP_MS = 2.0      # past this, give up and use greedy
+
+
+@dataclass
+class SelectionStats:
+    """What a selector did, for context snapshots."""
+    selector: str                     # requested: greedy | knapsack
+    method: str                       # whose pick was used: greedy | dp | dp-topk |
+                                      # greedy-kept (DP no better) | greedy-timeout
+    candidates: int = 0               # fragments above CONTEXT_THRESHOLD
+    selected: int = 0
+    score: float = 0.0                # total (weighted) score captured
+    greedy_score: float = 0.0         # what greedy would have captured
+    elapsed_ms: float = 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "selector": self.selector,
+            "method": self.method,
+            "candidates": self.candidates,
+            "selected": self.selected,
+            "score": round(self.score, 4),
+            "greedy_score": round(self.greedy_score, 4),
+            "elapsed_ms": round(self.elapsed_ms, 3),
+        }
+
+
+def _greedy(
+    scored: list[tuple[ContextFragment, float]],
+    token_budget: int,
+) -> list[int]:
+    """Indices into scored (already sorted high → low) that greedy keeps."""
+    chosen = []
+    remaining = token_budget
+    for i, (frag, _) in enumerate(scored):
+        if frag.token_estimate <= remaining:
+            chosen.append(i)
+            remaining -= frag.token_estimate
+    return chosen
+
+
+def _knapsack(
+    weights: list[int],
+    values: list[float],
+    capacity: int,
+    deadline: float,
+) -> list[int] | None:
+    """0/1 knapsack by DP over integer weights. None if deadline passes."""
+    best = [0.0] * (capacity + 1)
+    took: list[list[bool]] = []
+
+    for w, v in zip(weights, values):
+        if time.perf_counter() > deadline:
+            return None
+        if w > capacity:
+            took.append([False] * (capacity + 1))
+            continue
+        with_item = [x + v for x in best[:capacity + 1 - w]]
+        keep = [False] * w + [b > a for a, b in zip(best[w:], with_item)]
+        best = best[:w] + [b if b > a else a for a, b in zip(best[w:], with_item)]
+        took.append(keep)
+
+    # Walk back from the best cell
+    chosen = []
+    c = max(range(capacity + 1), key=best.__getitem__)
+    for i in range(len(weights) - 1, -1, -1):
+        if took[i][c]:
+            chosen.append(i)
+            c -= weights[i]
+    chosen.reverse()
+    return chosen
+
+
+def select_fragments(
     fragments: list[ContextFragment],
     now: datetime,
     current_turn: int,
     token_budget: int,
     params: DecayParams | None = None,
-) -> list[ContextFragment]:
+    selector: str = "greedy",
+    type_weights: dict[str, float] | None = None,
+) -> tuple[list[ContextFragment], SelectionStats]:
     """
-    Select fragments that fit within a token budget, highest-scoring first.
+    Select fragments within a token budget. Returns (selected, stats).
 
-    Returns in chronological order — scoring determines inclusion,
-    timestamp determines ordering. The conversation should read naturally.
+    selector="greedy": highest score first, take what fits.
+    selector="knapsack": maximize total score × type weight. Token counts
+    are rounded up to buckets, so the DP's answer always fits; leftover
+    room is then filled greedily. If the knapsack result isn't better
+    than greedy, or the time cap is hit, greedy's answer is used.
+
+    type_weights maps a fragment's first tag (the WM type) to a score
+    multiplier. Missing types weigh 1.0.
+
+    Selected fragments come back in chronological order.
     """
+    started = time.perf_counter()
     p = params or DecayParams()
+    weights_by_type = type_weights or {}
 
     scored = [
-        (frag, score(frag, now, current_turn, p))
-        for frag in fragments
+        (frag, s)
+        for frag, s in zip(fragments, score_fragments(fragments, now, current_turn, p))
+        if s > CONTEXT_THRESHOLD
     ]
-
     # Highest scores first for budget filling
     scored.sort(key=lambda x: x[1], reverse=True)
 
-    selected = []
-    remaining = token_budget
+    def value(i: int) -> float:
+        frag, s = scored[i]
+        tag = frag.tags[0] if frag.tags else ""
+        return s * weights_by_type.get(tag, 1.0)
 
-    for frag, s in scored:
-        if s <= CONTEXT_THRESHOLD:
-            continue
-        if frag.token_estimate <= remaining:
-            selected.append(frag)
-            remaining -= frag.token_estimate
+    greedy_pick = _greedy(scored, token_budget)
+    greedy_score = sum(value(i) for i in greedy_pick)
+
+    stats = SelectionStats(
+        selector=selector,
+        method="greedy",
+        candidates=len(scored),
+        greedy_score=greedy_score,
+    )
+    pick = greedy_pick
+    pick_score = greedy_score
+
+    if selector == "knapsack" and scored and token_budget > 0:
+        deadline = started + KNAPSACK_TIME_CAP_MS / 1000.0
+
+        # Many candidates: DP over the strongest by value, greedy for the rest
+        order = sorted(range(len(scored)), key=value, reverse=True)
+        pool = [i for i in order if scored[i][0].token_estimate <= token_budget]
+        dp_pool = pool[:KNAPSACK_MAX_ITEMS]
+        method = "dp-topk" if len(pool) > KNAPSACK_MAX_ITEMS else "dp"
+
+        bucket = max(1, math.ceil(token_budget / KNAPSACK_BUCKETS))
+        capacity = token_budget // bucket
+        dp_weights = [math.ceil(max(scored[i][0].token_estimate, 0) / bucket) for i in dp_pool]
+        dp_values = [value(i) for i in dp_pool]
+
+        chosen = _knapsack(dp_weights, dp_values, capacity, deadline)
+        if chosen is None:
+            method = "greedy-timeout"
+        else:
+            knap_pick = [dp_pool[j] for j in chosen]
+            used = sum(scored[i][0].token_estimate for i in knap_pick)
+            taken = set(knap_pick)
+            for i in order:  # rounding leaves room; fill it by value
+                if i in taken:
+                    continue
+                tokens = scored[i][0].token_estimate
+                if used + tokens <= token_budget:
+                    knap_pick.append(i)
+                    taken.add(i)
+                    used += tokens
+            knap_score = sum(value(i) for i in knap_pick)
+            if knap_score > pick_score:
+                pick, pick_score = knap_pick, knap_score
+            else:
+                method = "greedy-kept"  # DP ran, greedy was as good
+        stats.method = method
+
+    selected = [scored[i][0] for i in pick]
+    stats.selected = len(selected)
+    stats.score = pick_score
+    stats.elapsed_ms = (time.perf_counter() - started) * 1000.0
 
     # Chronological order for natural reading
     selected.sort(key=lambda f: f.timestamp)
+    return selected, stats
+
+
+def select_within_budget(
+    fragments: list[ContextFragment],
+    now: datetime,
+    current_turn: int,
+    token_budget: int,
+    params: DecayParams | None = None,
+) -> list[ContextFragment]:
+    """
+    Select fragments that fit within a token budget, highest-scoring first.
 
+    Returns in chronological order — scoring determines inclusion,
+    timestamp determines ordering. The conversation should read naturally.
+    """
+    selected, _ = select_fragments(fragments, now, current_turn, token_budget, params)
     return selected
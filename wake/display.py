@@ -0,0 +1,257 @@
+"""
+Display — how an event reads in Recent.
+
+Assembly used to pull 200 raw events every turn, join their tags, and
+regex each one back into say / do text. None of that depends on
+anything but the event itself, so it now happens once: when an event
+is written, project_event() stores the finished display lines in
+ev.event_display. Assembly reads them back with one indexed range scan.
+
+The rules are the ones assembly always used:
+  - Mono (any actor that isn't claude / y'lhara): all display-tag
+    content joined. No display tags → the whole message, tags stripped.
+  - Claude: say and do/narrate kept apart so they can land in
+    different pools. Untagged content counts as say.
+  - An event with no display tag and no actor never shows.
+
+The text is scanned once, by wake/tags.tokenize(); the same scan is
+stored in ev.event_spans next to the display row.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from dataclasses import dataclass
+
+from .schema import DISPLAY_TAGS
+from .tags import Tokens, store_spans, tokenize
+
+
+# Rough token estimation
+CHARS_PER_TOKEN = 4
+
+# Actors whose events split into say / do pools
+CLAUDE_ACTORS = frozenset({"claude", "y'lhara"})
+
+
+def estimate_tokens(text: str) -> int:
+    return max(len(text) // CHARS_PER_TOKEN, 1)
+
+
+@dataclass
+class EventDisplay:
+    """One event, already shaped for the conversation pools."""
+    actor_class: str                  # "mono" or "claude"
+    visible: bool                     # would Recent consider it at all
+    mono_text: str | None = None      # "actor: text" for Mono's events
+    mono_tokens: int = 0
+    say_text: str | None = None       # Claude's say, with actor prefix
+    say_tokens: int = 0
+    do_text: str | None = None        # Claude's do + narrate, with actor prefix
+    do_tokens: int = 0
+
+
+def _prefixed(actor: str | None, text: str) -> str:
+    return f"{actor}: {text}" if actor else text
+
+
+def project_display(
+    raw: str,
+    actor: str | None,
+    tags: list[str],
+    tokens: Tokens | None = None,
+) -> EventDisplay:
+    """Shape one raw event for Recent. tags are its display tags.
+
+    tokens is tokenize(raw), if the caller already has it.
+    """
+    is_claude = actor is None or actor in CLAUDE_ACTORS
+    display = EventDisplay(
+        actor_class="claude" if is_claude else "mono",
+        visible=bool(tags) or actor is not None,
+    )
+    if not display.visible:
+        return display
+
+    tokens = tokens or tokenize(raw)
+    matches = [(span.tag, tokens.content(span)) for span in tokens.spans_of(DISPLAY_TAGS)]
+
+    if not is_claude:
+        parts = [content.strip() for _, content in matches if content.strip()]
+        if not matches:
+            clean = tokens.strip_tags()
+            if clean:
+                parts = [clean]
+        if parts:
+            display.mono_text = _prefixed(actor or "mono", " ".join(parts))
+            display.mono_tokens = estimate_tokens(display.mono_text)
+        return display
+
+    say_parts = []
+    do_parts = []
+    for tag, content in matches:
+        text = content.strip()
+        if not text:
+            continue
+        if tag == "say":
+            say_parts.append(text)
+        elif tag in ("do", "narrate"):
+            do_parts.append(text)
+
+    # Untagged Claude content is treated as say
+    if not say_parts and not do_parts:
+        clean = tokens.strip_tags()
+        if clean:
+            say_parts.append(clean)
+
+    if say_parts:
+        display.say_text = _prefixed(actor, " ".join(say_parts))
+        display.say_tokens = estimate_tokens(display.say_text)
+    if do_parts:
+        display.do_text = _prefixed(actor, " ".join(do_parts))
+        display.do_tokens = estimate_tokens(display.do_text)
+
+    return display
+
+
+DISPLAY_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS {schema}.event_display (
+        event_id    INTEGER PRIMARY KEY,
+        ts          TEXT NOT NULL,
+        actor       TEXT,
+        actor_class TEXT NOT NULL,      -- mono | claude
+        visible     INTEGER NOT NULL,   -- 0 = never shown in Recent
+        tags        TEXT,               -- display tags, comma-separated
+        mono_text   TEXT,
+        mono_tokens INTEGER NOT NULL DEFAULT 0,
+        say_text    TEXT,
+        say_tokens  INTEGER NOT NULL DEFAULT 0,
+        do_text     TEXT,
+        do_tokens   INTEGER NOT NULL DEFAULT 0,
+        image_path  TEXT
+    );
+"""
+
+
+def create_display_table(conn: sqlite3.Connection, schema: str = "ev") -> None:
+    conn.executescript(DISPLAY_TABLE_SQL.format(schema=schema))
+
+
+def _write_display(
+    conn: sqlite3.Connection,
+    schema: str,
+    rows: list[sqlite3.Row],
+    tags_by_event: dict[int, list[str]],
+    tokens_by_event: dict[int, Tokens] | None = None,
+) -> None:
+    """Display and event_spans rows for each event, from one scan each."""
+    values = []
+    scanned = []
+    for row in rows:
+        tags = tags_by_event.get(row["id"], [])
+        scan = (tokens_by_event or {}).get(row["id"]) or tokenize(row["content"])
+        scanned.append((row["id"], scan))
+        d = project_display(row["content"], row["actor"], tags, scan)
+        values.append((
+            row["id"], row["ts"], row["actor"], d.actor_class, int(d.visible),
+            ",".join(tags) or None,
+            d.mono_text, d.mono_tokens,
+            d.say_text, d.say_tokens,
+            d.do_text, d.do_tokens,
+            row["image_path"],
+        ))
+    conn.executemany(
+        f"""INSERT OR REPLACE INTO {schema}.event_display
+            (event_id, ts, actor, actor_class, visible, tags,
+             mono_text, mono_tokens, say_text, say_tokens,
+             do_text, do_tokens, image_path)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+        values,
+    )
+    store_spans(conn, scanned, schema)
+
+
+def _display_tags(
+    conn: sqlite3.Connection, schema: str, event_ids: list[int],
+) -> dict[int, list[str]]:
+    tags: dict[int, list[str]] = {}
+    for i in range(0, len(event_ids), 500):
+        chunk = event_ids[i:i + 500]
+        placeholders = ",".join("?" * len(chunk))
+        rows = conn.execute(
+            f"""SELECT event_id, tag FROM {schema}.event_tags
+                WHERE event_id IN ({placeholders})
+                  AND tag IN ('say', 'do', 'narrate')""",
+            chunk,
+        ).fetchall()
+        for r in rows:
+            tags.setdefault(r["event_id"], []).append(r["tag"])
+    return tags
+
+
+def project_event(
+    conn: sqlite3.Connection,
+    event_id: int,
+    schema: str = "ev",
+    tokens: Tokens | None = None,
+) -> None:
+    """Write (or rewrite) the display and event_spans rows for one event.
+
+    Call after the event's tags are stored — they decide visibility.
+    tokens is tokenize() of the event's content, if the caller already
+    scanned it. Runs inside the caller's transaction.
+    """
+    rows = conn.execute(
+        f"SELECT id, ts, content, actor, image_path FROM {schema}.events WHERE id = ?",
+        (event_id,),
+    ).fetchall()
+    if tokens is not None and rows and tokens.raw != rows[0]["content"]:
+        tokens = None  # not this event's text after all
+    _write_display(
+        conn, schema, rows, _display_tags(conn, schema, [event_id]),
+        {event_id: tokens} if tokens is not None else None,
+    )
+
+
+def project_rows(
+    conn: sqlite3.Connection,
+    rows: list[dict],
+    tags_by_event: dict[int, list[str]],
+    tokens_by_event: dict[int, Tokens] | None = None,
+    schema: str = "ev",
+) -> None:
+    """Display and event_spans rows for events the caller just wrote.
+
+    For bulk writers: rows are the events as inserted (id, ts, content,
+    actor, image_path) and tags_by_event their display tags, so nothing
+    is read back. tokens_by_event maps id → tokenize(content) where the
+    caller has it. Runs inside the caller's transaction.
+    """
+    _write_display(conn, schema, rows, tags_by_event, tokens_by_event)
+
+
+def backfill_display(
+    conn: sqlite3.Connection,
+    schema: str = "ev",
+    limit: int | None = None,
+) -> int:
+    """Project events missing a display or event_spans row, oldest first.
+
+    limit caps how many events are done in this call, so callers can
+    commit between batches. Returns the number projected. Does not commit.
+    """
+    sql = f"""
+        SELECT e.id, e.ts, e.content, e.actor, e.image_path
+        FROM {schema}.events e
+        LEFT JOIN {schema}.event_display d ON d.event_id = e.id
+        LEFT JOIN {schema}.event_spans s ON s.event_id = e.id
+        WHERE d.event_id IS NULL OR s.event_id IS NULL
+        ORDER BY e.id
+    """
+    if limit is not None:
+        sql += f" LIMIT {int(limit)}"
+
+    rows = conn.execute(sql).fetchall()
+    ids = [r["id"] for r in rows]
+    _write_display(conn, schema, rows, _display_tags(conn, schema, ids))
+    return len(rows)
@@ -4,7 +4,11 @@ Events schema — the event log store.
 Tables:
   events      — raw message log, append-only
   event_tags  — per-event tag associations
-  events_fts  — FTS5 full-text search index
+  events_fts  — FTS5 full-text search index, external-content over
+                events (v3; v1-v2 kept a second copy of every body)
+  event_display — per-event display projection for Recent (v2)
+  event_spans — per-event tag scan: actor, span offsets, chars per tag (v4)
+  events_fts_deferred — set while a bulk import leaves indexing for later (v5)
 """
 
 from __future__ import annotations
@@ -13,7 +17,10 @@ import sqlite3
 from pathlib import Path
 
 
-SCHEMA_VERSION = 1
+SCHEMA_VERSION = 6
+
+# Events indexed per transaction when events_fts is rebuilt
+FTS_BATCH = 5000
 
 
 def connect_events(db_path: Path) -> sqlite3.Connection:
@@ -42,11 +49,27 @@ def migrate_events(db_path: Path) -> None:
         if current < 1:
             _create_v1(conn)
 
+        if current < 2:
+            _migrate_v1_to_v2(conn)
+
+        if current < 3:
+            _migrate_v2_to_v3(conn)
+
+        if current < 4:
+            _migrate_v3_to_v4(conn)
+
+        if current < 5:
+            _migrate_v4_to_v5(conn)
+
+        if current < 6:
+            _migrate_v5_to_v6(conn)
+
         conn.execute("DELETE FROM schema_version")
         conn.execute(
             "INSERT INTO schema_version (version) VALUES (?)",
             (SCHEMA_VERSION,),
         )
+        conn.execute(f"PRAGMA user_version = {int(SCHEMA_VERSION)}")
 
         conn.commit()
     finally:
@@ -79,6 +102,7 @@ def _create_v1(conn: sqlite3.Connection) -> None:
         -- Standalone FTS5 (no content= directive) — stores its own copy
         -- of the data. Required because content-sync FTS5 resolves the
         -- content table in the main schema, which breaks when ATTACHed.
+        -- (It doesn't — v3 moves this to external content.)
         CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5(
             content, actor
         );
@@ -97,3 +121,272 @@ def _create_v1(conn: sqlite3.Connection) -> None:
             VALUES (new.id, new.content, new.actor);
         END;
     """)
+
+
+def _migrate_v1_to_v2(conn: sqlite3.Connection) -> None:
+    """Display projection — Recent reads this instead of re-parsing raw events.
+
+    The backfill now happens in v4, together with event_spans.
+    """
+    from .display import create_display_table
+
+    create_display_table(conn, "main")
+    conn.executescript("""
+        CREATE TRIGGER IF NOT EXISTS events_display_ad AFTER DELETE ON events BEGIN
+            DELETE FROM event_display WHERE event_id = old.id;
+        END;
+    """)
+
+
+def _migrate_v2_to_v3(conn: sqlite3.Connection) -> None:
+    """events_fts stops storing its own copy of every event.
+
+    The v1 comment was wrong about ATTACH: an external-content FTS5
+    table looks its content table up in its own schema, so
+    content='events' inside events.sqlite keeps working as ev.events_fts.
+    The index is rebuilt alongside the old one in batches (see
+    start_fts_rebuild) and swapped in at the end. For very large logs
+    run rebuild_events_fts.py first; this then has nothing left to do.
+    """
+    if not fts_rebuild_pending(conn):
+        return
+    start_fts_rebuild(conn)
+    conn.commit()
+    while backfill_fts(conn, FTS_BATCH):
+        conn.commit()
+    finish_fts_rebuild(conn)
+
+
+def fts_rebuild_pending(conn: sqlite3.Connection) -> bool:
+    """True while events_fts is still the standalone v1 table."""
+    row = conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'events_fts'"
+    ).fetchone()
+    return row is not None and "content=" not in row["sql"].replace(" ", "")
+
+
+def start_fts_rebuild(conn: sqlite3.Connection) -> None:
+    """Create events_fts_build next to the old index. Idempotent.
+
+    Events are indexed oldest first, so everything up to the highest id
+    in events_fts_build_docsize is in it. The two triggers keep that
+    prefix current when an event in it is rewritten or deleted — the
+    pipeline does neither (a reply goes in once, complete), but a hand
+    edit mustn't leave the index stale. Newer events are left to
+    backfill_fts. The old index and its triggers keep serving search
+    until finish_fts_rebuild. Does not commit.
+    """
+    conn.executescript("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS events_fts_build USING fts5(
+            content, actor, content='events', content_rowid='id'
+        );
+
+        CREATE TRIGGER IF NOT EXISTS events_fts_build_ad AFTER DELETE ON events
+        WHEN old.id <= (SELECT COALESCE(MAX(id), 0) FROM events_fts_build_docsize) BEGIN
+            INSERT INTO events_fts_build(events_fts_build, rowid, content, actor)
+            VALUES ('delete', old.id, old.content, old.actor);
+        END;
+        CREATE TRIGGER IF NOT EXISTS events_fts_build_au AFTER UPDATE OF content, actor ON events
+        WHEN old.id <= (SELECT COALESCE(MAX(id), 0) FROM events_fts_build_docsize) BEGIN
+            INSERT INTO events_fts_build(events_fts_build, rowid, content, actor)
+            VALUES ('delete', old.id, old.content, old.actor);
+            INSERT INTO events_fts_build(rowid, content, actor)
+            VALUES (new.id, new.content, new.actor);
+        END;
+    """)
+
+
+def backfill_fts(conn: sqlite3.Connection, limit: int | None = None) -> int:
+    """Index the next events into events_fts_build, oldest first.
+
+    limit caps how many events are done in this call, so callers can
+    commit between batches. Returns the number indexed. Does not commit.
+    """
+    last = conn.execute(
+        "SELECT COALESCE(MAX(id), 0) FROM events_fts_build_docsize"
+    ).fetchone()[0]
+    sql = """
+        INSERT INTO events_fts_build(rowid, content, actor)
+        SELECT id, content, actor FROM events WHERE id > ? ORDER BY id
+    """
+    if limit is not None:
+        sql += f" LIMIT {int(limit)}"
+    return conn.execute(sql, (last,)).rowcount
+
+
+def finish_fts_rebuild(conn: sqlite3.Connection) -> None:
+    """Index the tail and swap events_fts_build in for events_fts. Commits.
+
+    One IMMEDIATE transaction, so no event lands between the last batch
+    and the new triggers. The old index's pages go to the freelist —
+    VACUUM (rebuild_events_fts.py --vacuum) gives them back to the disk.
+    """
+    conn.commit()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        backfill_fts(conn)
+        for statement in (
+            "DROP TRIGGER IF EXISTS events_ai",
+            "DROP TRIGGER IF EXISTS events_ad",
+            "DROP TRIGGER IF EXISTS events_au",
+            "DROP TRIGGER IF EXISTS events_fts_build_ad",
+            "DROP TRIGGER IF EXISTS events_fts_build_au",
+            "DROP TABLE IF EXISTS events_fts",
+            "ALTER TABLE events_fts_build RENAME TO events_fts",
+            """CREATE TRIGGER events_ai AFTER INSERT ON events BEGIN
+                INSERT INTO events_fts(rowid, content, actor)
+                VALUES (new.id, new.content, new.actor);
+            END""",
+            """CREATE TRIGGER events_ad AFTER DELETE ON events BEGIN
+                INSERT INTO events_fts(events_fts, rowid, content, actor)
+                VALUES ('delete', old.id, old.content, old.actor);
+            END""",
+            """CREATE TRIGGER events_au AFTER UPDATE OF content, actor ON events BEGIN
+                INSERT INTO events_fts(events_fts, rowid, content, actor)
+                VALUES ('delete', old.id, old.content, old.actor);
+                INSERT INTO events_fts(rowid, content, actor)
+                VALUES (new.id, new.content, new.actor);
+            END""",
+        ):
+            conn.execute(statement)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+
+def _migrate_v3_to_v4(conn: sqlite3.Connection) -> None:
+    """event_spans — each event's tag scan, stored once at write time.
+
+    Backfills every event missing a display or spans row, in one pass
+    per event. For very large logs run backfill_display.py first; this
+    then has nothing left to do.
+    """
+    from .display import backfill_display
+    from .tags import create_spans_table
+
+    create_spans_table(conn, "main")
+    conn.executescript("""
+        CREATE TRIGGER IF NOT EXISTS events_spans_ad AFTER DELETE ON events BEGIN
+            DELETE FROM event_spans WHERE event_id = old.id;
+        END;
+    """)
+    backfill_display(conn, "main")
+
+
+def _migrate_v4_to_v5(conn: sqlite3.Connection) -> None:
+    """Deferred indexing — a bulk import can leave events_fts for later.
+
+    Indexing each event from its insert trigger roughly doubles the cost
+    of a large import over indexing the same rows in one pass at the
+    end. A row in events_fts_deferred says "events from id `since` on
+    aren't indexed yet": events_ai skips them, and events_au / events_ad
+    only ask the index to forget a row it actually holds. catch_up_fts()
+    indexes them in batches and clears the row. Everything below since
+    is always indexed, so search stays right for what it has.
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS events_fts_deferred (
+            since   INTEGER NOT NULL    -- first event id not yet indexed
+        )
+    """)
+    for statement in (
+        "DROP TRIGGER IF EXISTS events_ai",
+        "DROP TRIGGER IF EXISTS events_ad",
+        "DROP TRIGGER IF EXISTS events_au",
+        """CREATE TRIGGER events_ai AFTER INSERT ON events
+        WHEN NOT EXISTS (SELECT 1 FROM events_fts_deferred WHERE since <= new.id) BEGIN
+            INSERT INTO events_fts(rowid, content, actor)
+            VALUES (new.id, new.content, new.actor);
+        END""",
+        """CREATE TRIGGER events_ad AFTER DELETE ON events
+        WHEN EXISTS (SELECT 1 FROM events_fts_docsize WHERE id = old.id) BEGIN
+            INSERT INTO events_fts(events_fts, rowid, content, actor)
+            VALUES ('delete', old.id, old.content, old.actor);
+        END""",
+        """CREATE TRIGGER events_au AFTER UPDATE OF content, actor ON events BEGIN
+            INSERT INTO events_fts(events_fts, rowid, content, actor)
+            SELECT 'delete', old.id, old.content, old.actor
+            WHERE EXISTS (SELECT 1 FROM events_fts_docsize WHERE id = old.id);
+            INSERT INTO events_fts(rowid, content, actor)
+            SELECT new.id, new.content, new.actor
+            WHERE NOT EXISTS (SELECT 1 FROM events_fts_deferred WHERE since <= new.id);
+        END""",
+    ):
+        conn.execute(statement)
+
+
+def _migrate_v5_to_v6(conn: sqlite3.Connection) -> None:
+    """Drop idx_event_display_ts.
+
+    The conversation loader pages event_display by event_id, its primary
+    key; nothing reads it by ts, and the index only cost a write per event.
+    """
+    conn.execute("DROP INDEX IF EXISTS idx_event_display_ts")
+
+
+def defer_fts(conn: sqlite3.Connection, schema: str = "main") -> bool:
+    """Stop indexing new events until catch_up_fts(). Does not commit.
+
+    Already-deferred stays as it is — an import resuming after a crash
+    keeps the earlier since. False if this events DB predates v5.
+    """
+    exists = conn.execute(
+        f"SELECT 1 FROM {schema}.sqlite_master WHERE type = 'table' AND name = 'events_fts_deferred'"
+    ).fetchone()
+    if not exists:
+        return False
+    conn.execute(f"""
+        INSERT INTO {schema}.events_fts_deferred (since)
+        SELECT COALESCE(MAX(id), 0) + 1 FROM {schema}.events
+        WHERE NOT EXISTS (SELECT 1 FROM {schema}.events_fts_deferred)
+    """)
+    return True
+
+
+def fts_deferred_since(conn: sqlite3.Connection) -> int | None:
+    """First unindexed event id while indexing is deferred, else None."""
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'events_fts_deferred'"
+    ).fetchone()
+    if not exists:
+        return None
+    row = conn.execute("SELECT MIN(since) FROM events_fts_deferred").fetchone()
+    return row[0]
+
+
+def catch_up_fts(conn: sqlite3.Connection, limit: int = FTS_BATCH) -> int:
+    """Index the next deferred events, oldest first. Commits.
+
+    One IMMEDIATE transaction per call: up to limit events from since
+    are indexed and since moves past them; the batch that reaches the
+    end clears the deferral, so triggers index everything after it.
+    Returns the number indexed — 0 once nothing is deferred.
+    """
+    conn.commit()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        since = fts_deferred_since(conn)
+        if since is None:
+            conn.commit()
+            return 0
+        count, last = conn.execute(
+            """SELECT COUNT(*), MAX(id) FROM
+               (SELECT id FROM events WHERE id >= ? ORDER BY id LIMIT ?)""",
+            (since, limit),
+        ).fetchone()
+        if count:
+            conn.execute(
+                """INSERT INTO events_fts(rowid, content, actor)
+                   SELECT id, content, actor FROM events WHERE id BETWEEN ? AND ?""",
+                (since, last),
+            )
+        if count < limit:
+            conn.execute("DELETE FROM events_fts_deferred")
+        else:
+            conn.execute("UPDATE events_fts_deferred SET since = ?", (last + 1,))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return count
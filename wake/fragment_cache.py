@@ -0,0 +1,172 @@
+"""
+Fragment cache — the graph, held between turns.
+
+Fragments and their edges only change when the Anvil commits
+(maintenance, file ingest, populate scripts). Reading them back from
+disk on every recall is wasted work in a worker that lives for hours,
+so this keeps them in memory, one cache per Gem file:
+
+  - every key, with its ambient and recognition tiers
+  - the adjacency index, outgoing and incoming
+  - inventory tiers in an LRU bounded by total characters — they can
+    be large, and most are never asked for
+
+Freshness costs one read of state.gem_generation, which triggers bump
+on any fragment or edge write from any process (schema v7). A changed
+generation means reload on next use. A Gem without the counter never
+caches — callers fall back to SQL.
+
+A cache is only ever built from committed data: inside a write
+transaction a stale cache is bypassed, not rebuilt.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from collections import OrderedDict
+from pathlib import Path
+
+from .schema import file_identity
+
+
+# Inventory tiers held at once, in characters (~500k tokens)
+INVENTORY_CACHE_CHARS = 2_000_000
+
+# Keys per IN (...) when fetching inventory misses
+_IN_BATCH = 500
+
+
+class FragmentCache:
+    """Everything about the graph except most inventory, for one Gem."""
+
+    def __init__(self, inventory_chars: int = INVENTORY_CACHE_CHARS):
+        self.generation: int | None = None
+        self.ambient: dict[str, str | None] = {}
+        self.recognition: dict[str, str | None] = {}
+        self.out_edges: dict[str, list[tuple[str, str | None]]] = {}
+        self.in_edges: dict[str, list[tuple[str, str | None]]] = {}
+        self.inventory_chars = inventory_chars
+        self._inventory: OrderedDict[str, str | None] = OrderedDict()
+        self._held_chars = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.ambient
+
+    def load(self, conn: sqlite3.Connection, generation: int) -> None:
+        """Replace everything with what the Gem holds now."""
+        ambient, recognition = {}, {}
+        for row in conn.execute("SELECT key, ambient, recognition FROM main.fragments"):
+            ambient[row["key"]] = row["ambient"]
+            recognition[row["key"]] = row["recognition"]
+
+        out_edges: dict[str, list[tuple[str, str | None]]] = {}
+        in_edges: dict[str, list[tuple[str, str | None]]] = {}
+        for edge in conn.execute(
+            "SELECT source_key, target_key, relation FROM main.fragment_edges ORDER BY rowid"
+        ):
+            source, target, relation = edge["source_key"], edge["target_key"], edge["relation"]
+            out_edges.setdefault(source, []).append((target, relation))
+            in_edges.setdefault(target, []).append((source, relation))
+
+        self.ambient = ambient
+        self.recognition = recognition
+        self.out_edges = out_edges
+        self.in_edges = in_edges
+        self._inventory.clear()
+        self._held_chars = 0
+        self.generation = generation
+
+    def adjacent(self, key: str) -> set[str]:
+        """Keys one hop away, either direction."""
+        return (
+            {target for target, _ in self.out_edges.get(key, ())}
+            | {source for source, _ in self.in_edges.get(key, ())}
+        )
+
+    def inventory(self, conn: sqlite3.Connection, keys: list[str]) -> dict[str, str | None]:
+        """Inventory tiers for keys, from the LRU or one query for the misses."""
+        found: dict[str, str | None] = {}
+        missing = []
+        for key in dict.fromkeys(keys):
+            if key in self._inventory:
+                self._inventory.move_to_end(key)
+                found[key] = self._inventory[key]
+                self.hits += 1
+            elif key in self.ambient:
+                missing.append(key)
+                self.misses += 1
+
+        for i in range(0, len(missing), _IN_BATCH):
+            chunk = missing[i:i + _IN_BATCH]
+            placeholders = ",".join("?" * len(chunk))
+            for row in conn.execute(
+                f"SELECT key, inventory FROM main.fragments WHERE key IN ({placeholders})",
+                chunk,
+            ):
+                found[row["key"]] = row["inventory"]
+                self._hold(row["key"], row["inventory"])
+
+        return found
+
+    def _hold(self, key: str, inventory: str | None) -> None:
+        size = len(inventory or "")
+        if size > self.inventory_chars:
+            return  # bigger than the whole budget — always read through
+        self._inventory[key] = inventory
+        self._held_chars += size
+        while self._held_chars > self.inventory_chars:
+            _, evicted = self._inventory.popitem(last=False)
+            self._held_chars -= len(evicted or "")
+
+
+# (dev, ino) of a Gem file → its cache
+_caches: dict[tuple, FragmentCache] = {}
+
+
+def _generation(conn: sqlite3.Connection) -> int | None:
+    try:
+        row = conn.execute(
+            "SELECT value FROM main.state WHERE key = 'gem_generation'"
+        ).fetchone()
+    except sqlite3.OperationalError:
+        return None
+    return int(row[0]) if row else None
+
+
+def _main_path(conn: sqlite3.Connection) -> Path | None:
+    for row in conn.execute("PRAGMA database_list"):
+        if row[1] == "main" and row[2]:
+            return Path(row[2])
+    return None
+
+
+def get_cache(conn: sqlite3.Connection, db_path: Path | None = None) -> FragmentCache | None:
+    """The cache for this Gem, current as of conn's view. None if unusable.
+
+    db_path saves a PRAGMA when the caller already knows it. Returns
+    None for a Gem without the generation counter, an in-memory
+    database, or a stale cache while conn has a write open.
+    """
+    generation = _generation(conn)
+    if generation is None:
+        return None
+
+    path = db_path or _main_path(conn)
+    identity = file_identity(path) if path else None
+    if identity is None:
+        return None
+
+    cache = _caches.get(identity)
+    if cache is not None and cache.generation == generation:
+        return cache
+
+    if conn.in_transaction:
+        return None  # might be our own uncommitted edits — don't keep them
+
+    if cache is None:
+        cache = _caches[identity] = FragmentCache()
+    cache.load(conn, generation)
+    return cache
+
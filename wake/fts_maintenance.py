@@ -0,0 +1,402 @@
+"""
+FTS maintenance — keeping the indexes in few segments.
+
+Every trigger write to an FTS5 index adds a small segment, and every
+update adds a delete + insert pair. FTS5 merges them as it goes
+(automerge), but that merge work lands on whichever write trips it —
+usually a turn. Left alone, lookups slow down as each term has to be
+read from more segments.
+
+This moves the work to idle time. automerge is raised so inserts merge
+less often, and run() does incremental 'merge' steps instead: each
+step is its own IMMEDIATE transaction, sized so the write lock is held
+for a few milliseconds, and the page count adapts to stay under
+MAX_LOCK_MS. A live turn waits at most one step.
+
+Each run measures every index before and after — segments, size on
+disk, probe query latency — and the report lands in
+state.fts_maintenance (JSON) in the Gem.
+
+Indexes:
+  Gem       — fragments_fts, working_memory_fts,
+              fragment_keys_trigram, working_memory_trigram,
+              working_memory_resolvable_fts
+  events    — events_fts
+  summaries — summaries_fts
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import sqlite3
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable
+
+from .events_schema import catch_up_fts, connect_events, fts_deferred_since
+from .summaries_schema import connect_summaries
+
+
+# Segments per level before an insert merges them (FTS5 default: 4).
+# Higher keeps merging off the turn path; run() catches up.
+AUTOMERGE = 8
+# Segments per level at which an insert must merge regardless (default 16)
+CRISISMERGE = 16
+
+# Longest a merge step may hold the write lock
+MAX_LOCK_MS = 5.0
+# Pages per merge step — first guess, then adapted to MAX_LOCK_MS
+STEP_PAGES = 16
+MAX_STEP_PAGES = 1024
+# Pages merged per index per run
+PAGE_BUDGET = 4000
+# Deferred events indexed per step — first guess, then adapted to MAX_LOCK_MS
+STEP_EVENTS = 64
+MAX_STEP_EVENTS = 5000
+# Segments left after level merges before merging across levels
+MAX_SEGMENTS = 4
+# Gap between steps, so a waiting writer gets the lock
+STEP_PAUSE = 0.002
+
+# Probe queries per index, and how often each set is timed
+PROBES = 5
+PROBE_REPEAT = 3
+
+# How often the worker runs maintenance when it's idle
+INTERVAL = timedelta(hours=6)
+
+STATE_KEY = "fts_maintenance"
+
+
+@dataclass(frozen=True)
+class _Index:
+    fts: str
+    db: str             # gem, events, or summaries
+    base: str           # content table — probe terms come from here
+    pk: str
+    text: str
+
+
+INDEXES = (
+    _Index("fragments_fts", "gem", "fragments", "rowid", "ambient"),
+    _Index("working_memory_fts", "gem", "working_memory", "id", "content"),
+    _Index("fragment_keys_trigram", "gem", "fragments", "rowid", "key"),
+    _Index("working_memory_trigram", "gem", "working_memory", "id", "content"),
+    _Index("working_memory_resolvable_fts", "gem", "working_memory", "id", "content"),
+    _Index("events_fts", "events", "events", "id", "content"),
+    _Index("summaries_fts", "summaries", "summaries", "id", "content"),
+)
+
+_WORD = re.compile(r"[^\W_]{3,}")
+
+
+@dataclass
+class IndexHealth:
+    segments: int = 0           # distinct segments in the index
+    size_bytes: int = 0         # leaf + structure blocks in {fts}_data
+    latency_ms: float = 0.0     # best of PROBE_REPEAT over the probe set
+
+
+@dataclass
+class IndexReport:
+    index: str
+    before: IndexHealth
+    after: IndexHealth
+    steps: int = 0              # merge transactions
+    changes: int = 0            # rows written by them
+    max_lock_ms: float = 0.0    # longest a step held the write lock
+    done: bool = False          # nothing left for 'merge' to do
+
+
+@dataclass
+class MaintenanceReport:
+    started_at: str
+    finished_at: str | None = None
+    indexes: list[IndexReport] = field(default_factory=list)
+    stopped: bool = False       # should_stop or the time budget cut it short
+    caught_up: int = 0          # deferred events indexed before merging
+
+    @property
+    def complete(self) -> bool:
+        return not self.stopped and all(r.done for r in self.indexes)
+
+    def as_dict(self) -> dict:
+        return {**asdict(self), "complete": self.complete}
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _exists(conn: sqlite3.Connection, table: str) -> bool:
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+    ).fetchone() is not None
+
+
+def _probes(conn: sqlite3.Connection, index: _Index) -> list[str]:
+    """Words from rows spread across the content table, as FTS5 strings."""
+    lo, hi = conn.execute(
+        f"SELECT MIN({index.pk}), MAX({index.pk}) FROM {index.base}"
+    ).fetchone()
+    if lo is None:
+        return []
+    probes = []
+    for i in range(PROBES):
+        row = conn.execute(
+            f"SELECT {index.text} FROM {index.base} WHERE {index.pk} >= ? ORDER BY {index.pk} LIMIT 1",
+            (lo + (hi - lo) * i // max(PROBES - 1, 1),),
+        ).fetchone()
+        words = _WORD.findall(row[0] or "") if row else []
+        if words:
+            probes.append('"' + max(words, key=len).replace('"', '""') + '"')
+    return probes
+
+
+def health(conn: sqlite3.Connection, fts: str, probes: list[str]) -> IndexHealth:
+    """Segment count, size and probe latency for one index."""
+    segments = _segments(conn, fts)
+    size = conn.execute(f"SELECT COALESCE(SUM(LENGTH(block)), 0) FROM {fts}_data").fetchone()[0]
+
+    best = float("inf")
+    for _ in range(PROBE_REPEAT if probes else 0):
+        start = time.perf_counter()
+        for probe in probes:
+            conn.execute(f"SELECT rowid FROM {fts} WHERE {fts} MATCH ?", (probe,)).fetchall()
+        best = min(best, time.perf_counter() - start)
+
+    return IndexHealth(
+        segments=segments,
+        size_bytes=size,
+        latency_ms=round(best * 1000, 3) if probes else 0.0,
+    )
+
+
+def configure(conn: sqlite3.Connection, fts: str) -> None:
+    """Set automerge / crisismerge if they aren't already. Commits."""
+    current = dict(conn.execute(f"SELECT k, v FROM {fts}_config").fetchall())
+    for option, value in (("automerge", AUTOMERGE), ("crisismerge", CRISISMERGE)):
+        if current.get(option) != value:
+            conn.execute(f"INSERT INTO {fts}({fts}, rank) VALUES (?, ?)", (option, value))
+    conn.commit()
+
+
+def _segments(conn: sqlite3.Connection, fts: str) -> int:
+    return conn.execute(f"SELECT COUNT(DISTINCT segid) FROM {fts}_idx").fetchone()[0]
+
+
+def merge(
+    conn: sqlite3.Connection,
+    fts: str,
+    report: IndexReport,
+    page_budget: int,
+    deadline: float | None,
+    should_stop: Callable[[], bool] | None,
+) -> bool:
+    """Incremental merge steps until done or out of budget. False if stopped.
+
+    Two passes. 'merge' with a positive page count merges within a
+    level once it holds 4 segments — cheap, and usually all there is.
+    If that still leaves more than MAX_SEGMENTS, a negative count merges
+    across levels, down to one segment; that rewrites the big segment
+    too, so it only happens when enough small ones have piled up.
+
+    Each step is BEGIN IMMEDIATE / merge / COMMIT. Only the time after
+    the lock is taken counts against MAX_LOCK_MS — waiting for it is
+    someone else's turn, not ours.
+    """
+    spent = 0
+    conn.commit()
+    for sign in (1, -1):
+        if sign < 0 and _segments(conn, fts) <= MAX_SEGMENTS:
+            break
+        pages = STEP_PAGES
+        while True:
+            if spent >= page_budget:
+                return True
+            if should_stop and should_stop():
+                return False
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+
+            step = min(pages, page_budget - spent)
+            before = conn.total_changes
+            conn.execute("BEGIN IMMEDIATE")
+            start = time.perf_counter()
+            try:
+                conn.execute(f"INSERT INTO {fts}({fts}, rank) VALUES ('merge', ?)", (sign * step,))
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            held = (time.perf_counter() - start) * 1000
+
+            changed = conn.total_changes - before
+            report.steps += 1
+            report.changes += changed
+            report.max_lock_ms = round(max(report.max_lock_ms, held), 3)
+            spent += step
+
+            # Fewer than two changes: 'merge' found nothing to do
+            if changed < 2:
+                break
+
+            if held > MAX_LOCK_MS:
+                pages = max(int(step * MAX_LOCK_MS / held), 1)
+            elif held < MAX_LOCK_MS / 2:
+                pages = min(pages * 2, MAX_STEP_PAGES)
+            time.sleep(STEP_PAUSE)
+
+    report.done = True
+    return True
+
+
+def catch_up(
+    conn: sqlite3.Connection,
+    report: MaintenanceReport,
+    deadline: float | None,
+    should_stop: Callable[[], bool] | None,
+) -> bool:
+    """Index events a deferred import left behind. False if stopped.
+
+    Same shape as merge(): each catch_up_fts() call is one IMMEDIATE
+    transaction, and the number of events it takes adapts so the lock
+    is held for about MAX_LOCK_MS. The time measured includes waiting
+    for the lock, which can only make the next step smaller.
+    """
+    limit = STEP_EVENTS
+    while fts_deferred_since(conn) is not None:
+        if should_stop and should_stop():
+            return False
+        if deadline is not None and time.monotonic() >= deadline:
+            return False
+
+        start = time.perf_counter()
+        report.caught_up += catch_up_fts(conn, limit)
+        held = (time.perf_counter() - start) * 1000
+
+        if held > MAX_LOCK_MS:
+            limit = max(int(limit * MAX_LOCK_MS / held), 1)
+        elif held < MAX_LOCK_MS / 2:
+            limit = min(limit * 2, MAX_STEP_EVENTS)
+        time.sleep(STEP_PAUSE)
+    return True
+
+
+def _connect_gem(db_path: Path) -> sqlite3.Connection:
+    """The Gem without events.sqlite attached.
+
+    BEGIN IMMEDIATE takes the write lock on every attached file, and a
+    merge step on fragments_fts has no business locking the event log.
+    """
+    conn = sqlite3.connect(str(db_path))
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA busy_timeout = 5000")
+    return conn
+
+
+def _connections(
+    db_path: Path,
+    events_path: Path | None,
+    summaries_path: Path | None,
+) -> dict[str, sqlite3.Connection]:
+    db_path = Path(db_path)
+    events_path = Path(events_path or db_path.parent / "events.sqlite")
+    summaries_path = Path(summaries_path or db_path.parent / "summaries.sqlite")
+
+    conns = {"gem": _connect_gem(db_path)}
+    if events_path.exists():
+        conns["events"] = connect_events(events_path)
+    if summaries_path.exists():
+        conns["summaries"] = connect_summaries(summaries_path)
+    return conns
+
+
+def run(
+    db_path: Path,
+    page_budget: int = PAGE_BUDGET,
+    time_budget: float | None = None,
+    should_stop: Callable[[], bool] | None = None,
+    events_path: Path | None = None,
+    summaries_path: Path | None = None,
+    indexes: list[str] | None = None,
+) -> MaintenanceReport:
+    """Merge every index that exists, measure it, store the report.
+
+    Events left unindexed by an interrupted ingest_many(defer_fts=True)
+    are indexed first, in steps bounded like the merge steps.
+
+    page_budget is per index. time_budget (seconds) bounds the whole
+    run; should_stop is checked between steps — the worker passes
+    "a job is waiting". A run that's cut short still measures and
+    reports what it did, and complete stays False so the next idle
+    moment picks it up.
+    """
+    report = MaintenanceReport(started_at=_now_iso())
+    deadline = time.monotonic() + time_budget if time_budget is not None else None
+    conns = _connections(db_path, events_path, summaries_path)
+
+    try:
+        # A bulk import that died with indexing deferred: finish it first
+        events = conns.get("events")
+        if events is not None and not catch_up(events, report, deadline, should_stop):
+            report.stopped = True
+
+        for index in INDEXES:
+            if indexes is not None and index.fts not in indexes:
+                continue
+            conn = conns.get(index.db)
+            if conn is None or not _exists(conn, index.fts):
+                continue
+
+            probes = _probes(conn, index)
+            entry = IndexReport(
+                index=index.fts,
+                before=health(conn, index.fts, probes),
+                after=IndexHealth(),
+            )
+            report.indexes.append(entry)
+
+            if not report.stopped:
+                configure(conn, index.fts)
+                if not merge(conn, index.fts, entry, page_budget, deadline, should_stop):
+                    report.stopped = True
+            entry.after = health(conn, index.fts, probes)
+
+        report.finished_at = _now_iso()
+        gem = conns["gem"]
+        gem.execute(
+            """INSERT INTO state (key, value, updated_at) VALUES (?, ?, ?)
+               ON CONFLICT(key) DO UPDATE SET value = excluded.value,
+                                              updated_at = excluded.updated_at""",
+            (STATE_KEY, json.dumps(report.as_dict()), report.finished_at),
+        )
+        gem.commit()
+    finally:
+        for conn in conns.values():
+            conn.close()
+
+    return report
+
+
+def last_report(db_path: Path) -> dict | None:
+    """The stored report from the last run, or None."""
+    conn = _connect_gem(Path(db_path))
+    try:
+        row = conn.execute("SELECT value FROM state WHERE key = ?", (STATE_KEY,)).fetchone()
+    finally:
+        conn.close()
+    return json.loads(row["value"]) if row else None
+
+
+def due(db_path: Path, now: datetime | None = None) -> bool:
+    """True if the last run was cut short, or is older than INTERVAL."""
+    last = last_report(db_path)
+    if last is None or not last.get("complete") or not last.get("finished_at"):
+        return True
+    now = now or datetime.now(timezone.utc)
+    return now - datetime.fromisoformat(last["finished_at"]) >= INTERVAL
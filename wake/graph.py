@@ -0,0 +1,320 @@
+"""
+Graph — how far a thought travels.
+
+recall() shows a fragment's direct neighbors; the Lens intersects
+one-hop neighborhoods. Both stop at one hop. This looks further: from
+one or more seed keys, rank everything reachable by how strongly the
+graph ties it back to the seeds, then fill a token budget at ambient
+depth, best first.
+
+Two rankings:
+  ppr — personalized PageRank by local push. Mass starts on the seeds
+        and leaks outward; a key reached by many short paths outranks
+        one reached by a single long one. Cost depends on the
+        neighborhood touched, not on the size of the Gem.
+  bfs — decayed breadth-first: decay ** hops, summed over seeds, so
+        keys close to several seeds float up. Cheaper, blunter.
+
+Edges are treated as undirected — "fairy → jirai" ties them both ways.
+The adjacency is compact (CSR: one offsets array, one targets array)
+and built from the fragment cache. The gem generation moves on any
+fragment write, not just edges, so a new generation is not a rebuild:
+if the keys and edges are what they were, only the ambient text is
+refreshed; if some edges changed, only the rows they touch are rebuilt
+and spliced in. A new or removed key renumbers everything — that one
+is built from scratch.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from array import array
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+
+from .display import estimate_tokens
+from .fragment_cache import FragmentCache, get_cache
+
+
+# Personalized PageRank defaults
+PPR_ALPHA = 0.15        # teleport back to the seeds
+PPR_EPSILON = 1e-4      # residual per unit degree below which push stops
+
+# Decayed BFS defaults
+BFS_DECAY = 0.5
+BFS_MAX_HOPS = 3
+
+EXPANSION_METHODS = ("ppr", "bfs")
+
+
+@dataclass
+class Expansion:
+    """A key reached from the seeds, with why."""
+    key: str
+    score: float
+    hops: int                   # shortest distance from any seed
+    via: str                    # the key it was reached from on that path
+    relation: str | None        # relation on the last edge of that path
+    ambient: str
+    tokens: int
+
+
+class FragmentGraph:
+    """Undirected adjacency over fragment_edges, in CSR form."""
+
+    def __init__(self, cache: FragmentCache):
+        self.generation = cache.generation
+        self.keys: list[str] = sorted(cache.ambient)
+        self.index: dict[str, int] = {k: i for i, k in enumerate(self.keys)}
+        self.ambient: list[str] = [cache.ambient[k] or "" for k in self.keys]
+
+        neighbors: list[dict[int, str | None]] = [{} for _ in self.keys]
+        for source, edges in cache.out_edges.items():
+            i = self.index.get(source)
+            if i is None:
+                continue
+            for target, relation in edges:
+                j = self.index.get(target)
+                if j is None or j == i:
+                    continue
+                neighbors[i].setdefault(j, relation)
+                neighbors[j].setdefault(i, relation)
+
+        self.offsets = array("i", [0])
+        self.targets = array("i")
+        self.relations: list[str | None] = []
+        for adj in neighbors:
+            for j in sorted(adj):
+                self.targets.append(j)
+                self.relations.append(adj[j])
+            self.offsets.append(len(self.targets))
+
+        # The edges this was built from — the cache swaps in new dicts on
+        # reload, never mutates these, so they stay a snapshot
+        self.out_edges = cache.out_edges
+
+    def refresh(self, cache: FragmentCache) -> bool:
+        """Catch up with a reloaded cache in place. False if it needs a rebuild.
+
+        Same keys: ambient is re-read, and rows whose edges changed are
+        rebuilt — each relation picked as the full build would pick it,
+        first edge in source order — and spliced into the arrays.
+        """
+        if len(cache.ambient) != len(self.keys) or any(k not in cache.ambient for k in self.keys):
+            return False
+
+        old, new = self.out_edges, cache.out_edges
+        affected: set[int] = set()
+        if old != new:
+            # Relations are picked by source order; if that moved, so might they
+            common = old.keys() & new.keys()
+            if [s for s in old if s in common] != [s for s in new if s in common]:
+                return False
+            for source in old.keys() | new.keys():
+                before, after = old.get(source, []), new.get(source, [])
+                if before == after:
+                    continue
+                for key in [source] + [target for target, _ in before + after]:
+                    i = self.index.get(key)
+                    if i is not None:
+                        affected.add(i)
+
+        if affected:
+            order = {source: n for n, source in enumerate(new)}
+            rows = {i: self._row(cache, order, self.keys[i]) for i in affected}
+            offsets = array("i", [0])
+            targets = array("i")
+            relations: list[str | None] = []
+            for i in range(len(self.keys)):
+                if i in rows:
+                    for j, relation in rows[i]:
+                        targets.append(j)
+                        relations.append(relation)
+                else:
+                    start, end = self.offsets[i], self.offsets[i + 1]
+                    targets.extend(self.targets[start:end])
+                    relations.extend(self.relations[start:end])
+                offsets.append(len(targets))
+            self.offsets, self.targets, self.relations = offsets, targets, relations
+
+        self.ambient = [cache.ambient[k] or "" for k in self.keys]
+        self.out_edges = new
+        self.generation = cache.generation
+        return True
+
+    def _row(
+        self, cache: FragmentCache, order: dict[str, int], key: str,
+    ) -> list[tuple[int, str | None]]:
+        """One key's neighbors, sorted, with the relation the full build keeps."""
+        i = self.index[key]
+        adj: dict[int, tuple[int, str | None]] = {}
+        for target, relation in cache.out_edges.get(key, ()):
+            j = self.index.get(target)
+            if j is not None and j != i:
+                adj.setdefault(j, (order[key], relation))
+        for source, relation in cache.in_edges.get(key, ()):
+            j = self.index.get(source)
+            if j is None or j == i:
+                continue
+            if j not in adj or order[source] < adj[j][0]:
+                adj[j] = (order[source], relation)
+        return [(j, adj[j][1]) for j in sorted(adj)]
+
+    def degree(self, i: int) -> int:
+        return self.offsets[i + 1] - self.offsets[i]
+
+    def _seed_ids(self, seeds: list[str]) -> list[int]:
+        return list(dict.fromkeys(self.index[k] for k in seeds if k in self.index))
+
+    def ppr(
+        self,
+        seeds: list[str],
+        alpha: float = PPR_ALPHA,
+        epsilon: float = PPR_EPSILON,
+    ) -> dict[int, float]:
+        """Approximate personalized PageRank from seeds (local push)."""
+        ids = self._seed_ids(seeds)
+        if not ids:
+            return {}
+
+        offsets, targets = self.offsets, self.targets
+        rank: dict[int, float] = {}
+        residual: dict[int, float] = {i: 1.0 / len(ids) for i in ids}
+        queue = deque(ids)
+        queued = set(ids)
+
+        while queue:
+            u = queue.popleft()
+            queued.discard(u)
+            r = residual.pop(u, 0.0)
+            start, end = offsets[u], offsets[u + 1]
+            degree = end - start
+            if degree == 0:
+                rank[u] = rank.get(u, 0.0) + r  # nowhere to go — keep it
+                continue
+
+            rank[u] = rank.get(u, 0.0) + alpha * r
+            share = (1.0 - alpha) * r / degree
+            for k in range(start, end):
+                v = targets[k]
+                rv = residual.get(v, 0.0) + share
+                residual[v] = rv
+                if v not in queued and rv >= epsilon * (offsets[v + 1] - offsets[v]):
+                    queue.append(v)
+                    queued.add(v)
+
+        return rank
+
+    def bfs(
+        self,
+        seeds: list[str],
+        decay: float = BFS_DECAY,
+        max_hops: int = BFS_MAX_HOPS,
+    ) -> dict[int, float]:
+        """decay ** hops from each seed, summed over seeds."""
+        offsets, targets = self.offsets, self.targets
+        scores: dict[int, float] = {}
+        for seed in self._seed_ids(seeds):
+            seen = {seed: 0}
+            frontier = [seed]
+            for hop in range(1, max_hops + 1):
+                nxt = []
+                for u in frontier:
+                    for k in range(offsets[u], offsets[u + 1]):
+                        v = targets[k]
+                        if v not in seen:
+                            seen[v] = hop
+                            nxt.append(v)
+                frontier = nxt
+            for v, hops in seen.items():
+                scores[v] = scores.get(v, 0.0) + decay ** hops
+        return scores
+
+    def _paths(self, ids: list[int], max_hops: int) -> dict[int, tuple[int, int, int]]:
+        """Shortest path back to a seed: node → (hops, parent, edge index)."""
+        paths = {i: (0, i, -1) for i in ids}
+        frontier = list(ids)
+        for hop in range(1, max_hops + 1):
+            nxt = []
+            for u in frontier:
+                for k in range(self.offsets[u], self.offsets[u + 1]):
+                    v = self.targets[k]
+                    if v not in paths:
+                        paths[v] = (hop, u, k)
+                        nxt.append(v)
+            frontier = nxt
+            if not frontier:
+                break
+        return paths
+
+    def expand(
+        self,
+        seeds: list[str],
+        token_budget: int,
+        method: str = "ppr",
+        exclude: set[str] | frozenset[str] = frozenset(),
+        max_hops: int = BFS_MAX_HOPS,
+    ) -> list[Expansion]:
+        """Best keys around the seeds, at ambient depth, within token_budget.
+
+        Seeds and exclude never come back, nor do keys with no ambient
+        tier or more than max_hops away. Highest score first; a key
+        too big for what's left is skipped, not a stop.
+        """
+        if method not in EXPANSION_METHODS:
+            raise ValueError(f"unknown expansion method: {method!r}")
+
+        ids = self._seed_ids(seeds)
+        if not ids or token_budget <= 0:
+            return []
+
+        scores = self.ppr(seeds) if method == "ppr" else self.bfs(seeds, max_hops=max_hops)
+        paths = self._paths(ids, max_hops)
+        skip = set(ids) | {self.index[k] for k in exclude if k in self.index}
+
+        ranked = sorted(
+            (i for i in scores if i not in skip and i in paths and self.ambient[i]),
+            key=lambda i: (-scores[i], paths[i][0], self.keys[i]),
+        )
+
+        picked = []
+        remaining = token_budget
+        for i in ranked:
+            tokens = estimate_tokens(self.ambient[i])
+            if tokens > remaining:
+                continue
+            hops, parent, edge = paths[i]
+            picked.append(Expansion(
+                key=self.keys[i],
+                score=scores[i],
+                hops=hops,
+                via=self.keys[parent],
+                relation=self.relations[edge],
+                ambient=self.ambient[i],
+                tokens=tokens,
+            ))
+            remaining -= tokens
+        return picked
+
+
+# id(FragmentCache) → the graph built from it
+_graphs: dict[int, FragmentGraph] = {}
+
+
+def get_graph(conn: sqlite3.Connection, db_path: Path | None = None) -> FragmentGraph:
+    """The graph for this Gem, caught up when the gem generation moves.
+
+    Without a usable fragment cache (pre-v7 Gem, or mid-write) the
+    graph is built from the tables for this call and not kept.
+    """
+    cache = get_cache(conn, db_path)
+    if cache is None:
+        scratch = FragmentCache()
+        scratch.load(conn, generation=-1)
+        return FragmentGraph(scratch)
+
+    graph = _graphs.get(id(cache))
+    if graph is None or (graph.generation != cache.generation and not graph.refresh(cache)):
+        graph = _graphs[id(cache)] = FragmentGraph(cache)
+    return graph
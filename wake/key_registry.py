@@ -0,0 +1,71 @@
+"""
+Key registry — which fragment keys exist.
+
+Linking a WM item to the [keys] it mentions, catching a maintenance
+CREATE for a key that's already there, comparing a missed recall
+against every key: each used to ask the Gem one key at a time. The fragment cache already holds
+every key, current as of state.gem_generation (wake/fragment_cache.py),
+so the registry answers from that — a whole list of keys in one pass,
+no query at all.
+
+Making sure the cache is current costs a generation read, a PRAGMA and
+a stat — more than one IN (...) query for a handful of keys. So a short
+list (a WM span naming a key or two) is one query; a long one is the
+cache. The query also answers when the cache can't: a Gem without the
+generation counter, or a stale cache inside a write transaction, which
+may be looking at its own new fragments. Either way it's one round,
+however many keys are asked about.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+from typing import Iterable
+
+from .fragment_cache import get_cache
+
+
+# Keys per IN (...) on the SQL path
+_IN_BATCH = 500
+
+# Up to this many keys, one IN (...) beats checking the cache is current
+DIRECT_MAX = 8
+
+
+def existing_keys(
+    conn: sqlite3.Connection,
+    keys: Iterable[str],
+    db_path: Path | None = None,
+) -> set[str]:
+    """The keys among these that are fragments."""
+    wanted = list(dict.fromkeys(keys))
+    if not wanted:
+        return set()
+
+    cache = get_cache(conn, db_path) if len(wanted) > DIRECT_MAX else None
+    if cache is not None:
+        return {key for key in wanted if key in cache}
+
+    found = set()
+    for i in range(0, len(wanted), _IN_BATCH):
+        chunk = wanted[i:i + _IN_BATCH]
+        placeholders = ",".join("?" * len(chunk))
+        found.update(
+            row[0] for row in conn.execute(
+                f"SELECT key FROM main.fragments WHERE key IN ({placeholders})", chunk,
+            )
+        )
+    return found
+
+
+def key_exists(conn: sqlite3.Connection, key: str, db_path: Path | None = None) -> bool:
+    return bool(existing_keys(conn, [key], db_path))
+
+
+def all_keys(conn: sqlite3.Connection, db_path: Path | None = None) -> Iterable[str]:
+    """Every fragment key."""
+    cache = get_cache(conn, db_path)
+    if cache is not None:
+        return cache.ambient.keys()
+    return [row[0] for row in conn.execute("SELECT key FROM main.fragments")]
@@ -3,7 +3,9 @@ Recall — how I look things up.
 
 Exact key lookup. No fuzzy matching. The keys I know come from
 ambient prose — [bracketed words] that are simultaneously my
-vocabulary and the database index.
+vocabulary and the database index. A miss can come back with the
+nearest keys (trigram index, schema v9) — as a hint, never a
+substitute.
 
 Three depths:
   ambient     — always visible, never needs lookup
@@ -20,6 +22,19 @@ while inventory tiers hold item-level detail.
 Neighbor-pull: when I recall a fragment, its graph neighbors
 surface briefly at ambient depth with faster decay.
 
+Lookups are batched: however many keys I ask for, it's one query for
+the fragments and one for their edges and neighbor ambients. In the
+long-lived worker even that is skipped — the fragment cache holds the
+graph, and only inventory tiers it hasn't seen are read.
+
+neighbor_budget swaps the one-hop pull for a ranked multi-hop one
+(wake/graph.py): the best keys within a few hops, filling that many
+tokens at ambient depth.
+
+What I ask for mid-reply is shown to me next turn: it waits in
+state.pending_recall until then (encode_recall / write_pending_recall /
+load_pending_recall).
+
 Plans: a separate lookup for working memory items. Queryable
 by topic (fragment key) or time window. Bypasses submersion —
 shows everything active regardless of current decay score.
@@ -27,19 +42,21 @@ shows everything active regardless of current decay score.
 
 from __future__ import annotations
 
+import json
 import sqlite3
 from dataclasses import dataclass, field
 from datetime import datetime, timezone, timedelta
-from pathlib import Path
+from difflib import get_close_matches
 
 
 @dataclass
 class RecallResult:
     """What comes back when I tug a thread."""
     key: str
-    content: str                          # the tier content I asked for
-    depth: str                            # which tier was returned
+    content: str                          # the tier content returned
+    depth: str                            # which tier that is
     neighbors: list[NeighborResult]       # adjacent fragments, ambient tier
+    tiers: dict[str, str] = field(default_factory=dict)  # every non-empty tier asked for, deepest first
 
 
 @dataclass
@@ -50,13 +67,158 @@ class NeighborResult:
     relation: str                         # how it connects
 
 
-from .schema import connect as _connect
+from .fragment_cache import get_cache
+from .key_registry import all_keys
+from .graph import get_graph
+from .session import GemSource, TurnSession, borrow
+from .timeparse import parse_when
+
+
+# Keys per IN (...) — well under SQLite's bound-parameter limit
+_IN_BATCH = 500
+
+# Deepest first
+TIERS = ("inventory", "recognition", "ambient")
+
+# Nearest-key suggestions for a recall that misses
+SUGGEST_LIMIT = 3
+SUGGEST_CANDIDATES = 20      # trigram hits re-ranked by similarity
+SUGGEST_MIN_RATIO = 0.6      # difflib ratio to count as "meant"
+
+# Shortest text the trigram indexes can match
+TRIGRAM_MIN = 3
+
+
+def _fetch(
+    session: TurnSession,
+    requests: list[tuple[str, bool]],
+) -> tuple[dict[str, dict], dict[str, list[NeighborResult]]]:
+    """Fragments and outgoing neighbors for every (key, deep) request.
+
+    Returns (rows by key, neighbors by source key). Unknown keys are
+    simply absent. Neighbors with no ambient content are skipped.
+    Served from the fragment cache when it is current, else two queries.
+    """
+    cache = get_cache(session.conn, session.db_path)
+    if cache is None:
+        return _fetch_sql(session.conn, [key for key, _ in requests])
+
+    keys = [key for key in dict.fromkeys(k for k, _ in requests) if key in cache]
+    inventory = cache.inventory(
+        session.conn, [key for key, deep in requests if deep and key in cache],
+    )
+    rows = {
+        key: {
+            "key": key,
+            "ambient": cache.ambient[key],
+            "recognition": cache.recognition[key],
+            "inventory": inventory.get(key),
+        }
+        for key in keys
+    }
+    neighbors = {
+        key: [
+            NeighborResult(key=target, ambient=cache.ambient[target], relation=relation or "")
+            for target, relation in cache.out_edges.get(key, ())
+            if cache.ambient.get(target)  # skip neighbors with no ambient content
+        ]
+        for key in keys
+    }
+    return rows, neighbors
+
+
+def _fetch_sql(
+    conn: sqlite3.Connection,
+    keys: list[str],
+) -> tuple[dict[str, sqlite3.Row], dict[str, list[NeighborResult]]]:
+    """_fetch() straight from the Gem — two queries total."""
+    unique = list(dict.fromkeys(keys))
+    rows: dict[str, sqlite3.Row] = {}
+    for i in range(0, len(unique), _IN_BATCH):
+        chunk = unique[i:i + _IN_BATCH]
+        placeholders = ",".join("?" * len(chunk))
+        for row in conn.execute(
+            f"""SELECT key, ambient, recognition, inventory FROM fragments
+                WHERE key IN ({placeholders})""",
+            chunk,
+        ):
+            rows[row["key"]] = row
+
+    found = [k for k in unique if k in rows]
+    neighbors: dict[str, list[NeighborResult]] = {k: [] for k in found}
+    for i in range(0, len(found), _IN_BATCH):
+        chunk = found[i:i + _IN_BATCH]
+        placeholders = ",".join("?" * len(chunk))
+        for edge in conn.execute(
+            f"""
+            SELECT e.source_key, f.key, f.ambient, e.relation
+            FROM fragment_edges e
+            JOIN fragments f ON f.key = e.target_key
+            WHERE e.source_key IN ({placeholders})
+            ORDER BY e.rowid
+            """,
+            chunk,
+        ):
+            if edge["ambient"]:  # skip neighbors with no ambient content
+                neighbors[edge["source_key"]].append(NeighborResult(
+                    key=edge["key"],
+                    ambient=edge["ambient"],
+                    relation=edge["relation"] or "",
+                ))
+
+    return rows, neighbors
+
+
+def _result(
+    key: str,
+    row: sqlite3.Row | dict,
+    neighbors: list[NeighborResult],
+    deep: bool,
+) -> RecallResult:
+    # Use requested tier, fall back to recognition, then ambient.
+    # The shallower tiers ride along so assembly can step down to fit.
+    tiers = {t: row[t] for t in TIERS[0 if deep else 1:] if row[t]}
+    depth, content = next(iter(tiers.items()), ("ambient", ""))
+    return RecallResult(
+        key=key,
+        content=content,
+        depth=depth,
+        neighbors=list(neighbors),
+        tiers=tiers,
+    )
+
+
+def _expand_neighbors(
+    session: TurnSession,
+    results: list[RecallResult],
+    neighbor_budget: int,
+    exclude: set[str],
+) -> None:
+    """Replace each result's one-hop neighbors with ranked multi-hop ones.
+
+    The budget is split evenly between results.
+    """
+    if not results:
+        return
+    graph = get_graph(session.conn, session.db_path)
+    share = neighbor_budget // len(results)
+    for result in results:
+        result.neighbors = [
+            NeighborResult(
+                key=e.key,
+                ambient=e.ambient,
+                relation=(e.relation or "") if e.hops == 1
+                else ", ".join(p for p in (e.relation, f"via {e.via}") if p),
+            )
+            for e in graph.expand([result.key], share, exclude=exclude)
+        ]
 
 
 def recall(
     key: str,
-    db_path: str | Path,
+    source: GemSource,
     deep: bool = True,
+    neighbor_budget: int | None = None,
 ) -> RecallResult | None:
     """
     Look up a fragment by exact key.
@@ -66,78 +228,132 @@ def recall(
     on 2-3 fragments per turn is fine. Pass deep=False for recognition
     only (lighter, used by tools that need many keys at once).
 
-    Also pulls neighbor fragments at ambient depth.
+    Also pulls neighbor fragments at ambient depth — direct ones, or
+    with neighbor_budget the best within a few hops (wake/graph.py).
 
     Returns None if the key doesn't exist — which means the ambient
     prose referenced something that isn't in the database. That's
     a sync issue the maintenance agent should catch.
-    """
-    conn = _connect(db_path)
 
-    try:
-        # Pull the fragment
-        tier = "inventory" if deep else "recognition"
-        row = conn.execute(
-            "SELECT key, ambient, recognition, inventory FROM fragments WHERE key = ?",
-            (key,),
-        ).fetchone()
-
-        if row is None:
+    source is a db_path or an open TurnSession.
+    """
+    with borrow(source) as session:
+        rows, neighbors = _fetch(session, [(key, deep)])
+        if key not in rows:
             return None
+        result = _result(key, rows[key], neighbors[key], deep)
+        if neighbor_budget:
+            _expand_neighbors(session, [result], neighbor_budget, {key})
+        return result
 
-        # Use requested tier, fall back to recognition, then ambient
-        content = row[tier] or row["recognition"] or row["ambient"] or ""
 
-        # Pull neighbors via edges
-        edges = conn.execute(
-            """
-            SELECT f.key, f.ambient, e.relation
-            FROM fragment_edges e
-            JOIN fragments f ON f.key = e.target_key
-            WHERE e.source_key = ?
-            """,
-            (key,),
-        ).fetchall()
+def recall_requests(
+    requests: list[tuple[str, bool]],
+    source: GemSource,
+    neighbor_budget: int | None = None,
+    suggest: bool = False,
+) -> list[RecallResult]:
+    """
+    Look up (key, deep) pairs as parsed from recall() calls, in order.
 
-        neighbors = [
-            NeighborResult(
-                key=edge["key"],
-                ambient=edge["ambient"] or "",
-                relation=edge["relation"] or "",
+    Same results as calling recall() for each — unknown keys dropped,
+    neighbors not deduplicated — in two queries instead of two per key.
+    With suggest, an unknown key comes back as depth "missing" with the
+    nearest real keys in its content instead of being dropped.
+    """
+    if not requests:
+        return []
+
+    with borrow(source) as session:
+        rows, neighbors = _fetch(session, requests)
+        found = {
+            i: _result(key, rows[key], neighbors[key], deep)
+            for i, (key, deep) in enumerate(requests)
+            if key in rows
+        }
+        if neighbor_budget:
+            _expand_neighbors(session, list(found.values()), neighbor_budget, set(rows))
+        if not suggest:
+            return list(found.values())
+
+        results = []
+        for i, (key, _) in enumerate(requests):
+            if i in found:
+                results.append(found[i])
+            else:
+                results.append(_missing(key, _suggest(session.conn, key, SUGGEST_LIMIT)))
+        return results
+
+
+def _missing(key: str, near: list[str]) -> RecallResult:
+    if near:
+        hint = "did you mean " + ", ".join(f"[{k}]" for k in near) + "?"
+    else:
+        hint = "nothing close"
+    return RecallResult(key=key, content=f"not a key I have — {hint}", depth="missing", neighbors=[])
+
+
+def _fts_string(text: str) -> str:
+    """text as one quoted FTS5 string — no operators, quotes escaped."""
+    return '"' + text.replace('"', '""') + '"'
+
+
+def _closest(text: str, candidates, exclude: str, limit: int) -> list[str]:
+    by_lower = {c.lower(): c for c in candidates if c != exclude}
+    return [
+        by_lower[match]
+        for match in get_close_matches(text, by_lower, n=limit, cutoff=SUGGEST_MIN_RATIO)
+    ]
+
+
+def _suggest(conn: sqlite3.Connection, key: str, limit: int) -> list[str]:
+    """Real keys that look like key, most similar first.
+
+    Candidates are keys sharing any trigram with it, best BM25 first;
+    they're re-ranked by difflib similarity, cut at SUGGEST_MIN_RATIO.
+    A short key can lose every trigram to one typo ("fary") — if the
+    index finds nothing close, every key is compared, from the
+    fragment cache when there is one.
+    """
+    text = key.lower()
+    grams = sorted({text[i:i + 3] for i in range(len(text) - 2)})
+    if grams:
+        candidates = [
+            row["key"] for row in conn.execute(
+                """SELECT key FROM fragment_keys_trigram
+                   WHERE fragment_keys_trigram MATCH ?
+                   ORDER BY rank LIMIT ?""",
+                (" OR ".join(_fts_string(g) for g in grams), SUGGEST_CANDIDATES),
             )
-            for edge in edges
-            if edge["ambient"]  # skip neighbors with no ambient content
         ]
+        near = _closest(text, candidates, key, limit)
+        if near:
+            return near
+
+    return _closest(text, all_keys(conn), key, limit)
 
-        return RecallResult(
-            key=key,
-            content=content,
-            depth=tier,
-            neighbors=neighbors,
-        )
 
-    finally:
-        conn.close()
+def suggest_keys(key: str, source: GemSource, limit: int = SUGGEST_LIMIT) -> list[str]:
+    """Keys that look like key — for a recall that missed. Never a substitute."""
+    with borrow(source) as session:
+        return _suggest(session.conn, key, limit)
 
 
 def recall_multi(
     keys: list[str],
-    db_path: str | Path,
+    source: GemSource,
     deep: bool = True,
+    neighbor_budget: int | None = None,
 ) -> list[RecallResult]:
     """
     Look up multiple fragments. Deduplicates neighbors —
     if I recall fairy and jirai, and they're neighbors of each other,
     each appears once as a primary result, not again as a neighbor.
-    """
-    results = []
-    seen_keys = set()
 
-    for key in keys:
-        result = recall(key, db_path, deep=deep)
-        if result is not None:
-            results.append(result)
-            seen_keys.add(key)
+    One query for all fragments, one for all their edges.
+    """
+    results = recall_requests([(key, deep) for key in keys], source, neighbor_budget)
+    seen_keys = {r.key for r in results}
 
     # Deduplicate neighbors — don't surface a key as a neighbor
     # if it was already recalled directly
@@ -150,6 +366,62 @@ def recall_multi(
     return results
 
 
+# --- Pending recall ---
+
+
+def encode_recall(results: list[RecallResult]) -> list[dict]:
+    """Recall results as stored in state.pending_recall."""
+    return [
+        {
+            "key": r.key, "content": r.content, "depth": r.depth,
+            "tiers": r.tiers,
+            "neighbors": [
+                {"key": n.key, "ambient": n.ambient, "relation": n.relation}
+                for n in r.neighbors
+            ],
+        }
+        for r in results
+    ]
+
+
+def decode_recall(data: list[dict]) -> list[RecallResult]:
+    """The reverse of encode_recall()."""
+    return [
+        RecallResult(
+            key=item["key"], content=item["content"], depth=item["depth"],
+            neighbors=[
+                NeighborResult(key=n["key"], ambient=n["ambient"], relation=n["relation"])
+                for n in item.get("neighbors", [])
+            ],
+            tiers=item.get("tiers", {}),
+        )
+        for item in data
+    ]
+
+
+def write_pending_recall(conn: sqlite3.Connection, data: list[dict]) -> None:
+    """Store encoded recall results for next turn, or clear if empty.
+
+    Runs inside the caller's transaction.
+    """
+    if not data:
+        conn.execute("DELETE FROM state WHERE key = 'pending_recall'")
+    else:
+        now = datetime.now(timezone.utc).isoformat()
+        conn.execute(
+            "INSERT OR REPLACE INTO state (key, value, updated_at) VALUES ('pending_recall', ?, ?)",
+            (json.dumps(data), now),
+        )
+
+
+def load_pending_recall(conn: sqlite3.Connection) -> list[RecallResult]:
+    """What the last reply asked for, waiting to be shown."""
+    row = conn.execute(
+        "SELECT value FROM state WHERE key = 'pending_recall'"
+    ).fetchone()
+    return decode_recall(json.loads(row["value"])) if row else []
+
+
 # --- Plans lookup ---
 
 
@@ -196,7 +468,7 @@ def _classify_plan_phase(
 
 
 def plans(
-    db_path: str | Path,
+    source: GemSource,
     topic: str | None = None,
     when: str | None = None,
 ) -> list[PlanSummary]:
@@ -208,24 +480,38 @@ def plans(
     plans(topic="body-training") → items linked to a fragment key or
                                     matching subject/content
     plans(when="next tuesday")   → items with due dates in a time window
-                                    (requires dateparser for natural language)
+                                    (common forms by rule, dateparser for the rest)
 
     Returns PlanSummary objects with phase classification.
     """
-    conn = _connect(db_path)
     now = datetime.now(timezone.utc)
 
-    try:
+    with borrow(source) as session:
+        conn = session.conn
         if topic:
             return _plans_by_topic(conn, now, topic)
         if when:
             return _plans_by_time(conn, now, when)
         return _plans_all(conn, now)
-    finally:
-        conn.close()
 
 
-def _row_to_summary(row: sqlite3.Row, now: datetime, conn: sqlite3.Connection) -> PlanSummary:
+def _refs_by_wm(conn: sqlite3.Connection, ids: list[int]) -> dict[int, list[str]]:
+    """Fragment keys linked to each working memory id — one query per batch."""
+    refs: dict[int, list[str]] = {}
+    for i in range(0, len(ids), _IN_BATCH):
+        chunk = ids[i:i + _IN_BATCH]
+        placeholders = ",".join("?" * len(chunk))
+        for r in conn.execute(
+            f"""SELECT wm_id, fragment_key FROM working_memory_refs
+                WHERE wm_id IN ({placeholders})
+                ORDER BY wm_id, fragment_key""",
+            chunk,
+        ):
+            refs.setdefault(r["wm_id"], []).append(r["fragment_key"])
+    return refs
+
+
+def _row_to_summary(row: sqlite3.Row, now: datetime, related_keys: list[str]) -> PlanSummary:
     """Convert a working_memory row to a PlanSummary."""
     created = datetime.fromisoformat(row["created_at"]).replace(tzinfo=timezone.utc)
     refreshed = datetime.fromisoformat(row["refreshed_at"]).replace(tzinfo=timezone.utc)
@@ -233,13 +519,6 @@ def _row_to_summary(row: sqlite3.Row, now: datetime, conn: sqlite3.Connection) -
     if row["due"]:
         due = datetime.fromisoformat(row["due"]).replace(tzinfo=timezone.utc)
 
-    # Get related fragment keys
-    refs = conn.execute(
-        "SELECT fragment_key FROM working_memory_refs WHERE wm_id = ?",
-        (row["id"],),
-    ).fetchall()
-    related_keys = [r["fragment_key"] for r in refs]
-
     return PlanSummary(
         id=row["id"],
         type=row["type"],
@@ -255,6 +534,11 @@ def _row_to_summary(row: sqlite3.Row, now: datetime, conn: sqlite3.Connection) -
     )
 
 
+def _summaries(conn: sqlite3.Connection, rows: list[sqlite3.Row], now: datetime) -> list[PlanSummary]:
+    refs = _refs_by_wm(conn, [r["id"] for r in rows])
+    return [_row_to_summary(r, now, refs.get(r["id"], [])) for r in rows]
+
+
 def _plans_all(conn: sqlite3.Connection, now: datetime) -> list[PlanSummary]:
     """All active working memory items, due-dated first (sorted by due),
     then open-ended (sorted by created_at)."""
@@ -267,7 +551,34 @@ def _plans_all(conn: sqlite3.Connection, now: datetime) -> list[PlanSummary]:
             created_at DESC
     """).fetchall()
 
-    return [_row_to_summary(r, now, conn) for r in rows]
+    return _summaries(conn, rows, now)
+
+
+def _active_containing(
+    conn: sqlite3.Connection,
+    text: str,
+    columns: tuple[str, ...],
+) -> list[sqlite3.Row]:
+    """Active items with text inside any of columns, any case, by id.
+
+    Goes through working_memory_trigram, which only holds active rows
+    (CROSS JOIN keeps it outermost). Text too short for trigrams scans
+    the active rows instead.
+    """
+    if len(text) >= TRIGRAM_MIN:
+        return conn.execute("""
+            SELECT wm.* FROM working_memory_trigram
+            CROSS JOIN working_memory wm ON wm.id = working_memory_trigram.rowid
+            WHERE working_memory_trigram MATCH ?
+              AND wm.status = 'active'
+            ORDER BY wm.id
+        """, ("{" + " ".join(columns) + "} : " + _fts_string(text),)).fetchall()
+
+    conditions = " OR ".join(f"{col} LIKE ?" for col in columns)
+    return conn.execute(
+        f"SELECT * FROM working_memory WHERE status = 'active' AND ({conditions}) ORDER BY id",
+        [f"%{text}%"] * len(columns),
+    ).fetchall()
 
 
 def _plans_by_topic(
@@ -278,20 +589,16 @@ def _plans_by_topic(
     """Items linked to a fragment key, or matching subject/content."""
     # First: check working_memory_refs for fragment key matches
     by_ref = conn.execute("""
-        SELECT wm.* FROM working_memory wm
-        INNER JOIN working_memory_refs ref ON ref.wm_id = wm.id
-        WHERE wm.status = 'active'
-          AND ref.fragment_key = ?
+        SELECT wm.* FROM working_memory_refs ref
+        INNER JOIN working_memory wm ON wm.id = ref.wm_id
+        WHERE ref.fragment_key = ?
+          AND wm.status = 'active'
     """, (topic,)).fetchall()
 
     ref_ids = {r["id"] for r in by_ref}
 
-    # Second: text match on subject and content
-    by_text = conn.execute("""
-        SELECT * FROM working_memory
-        WHERE status = 'active'
-          AND (subject LIKE ? OR content LIKE ?)
-    """, (f"%{topic}%", f"%{topic}%")).fetchall()
+    # Second: substring match on subject and content
+    by_text = _active_containing(conn, topic, ("subject", "content"))
 
     # Merge, dedup
     all_rows = list(by_ref)
@@ -299,7 +606,7 @@ def _plans_by_topic(
         if r["id"] not in ref_ids:
             all_rows.append(r)
 
-    return [_row_to_summary(r, now, conn) for r in all_rows]
+    return _summaries(conn, all_rows, now)
 
 
 def _plans_by_time(
@@ -309,20 +616,24 @@ def _plans_by_time(
 ) -> list[PlanSummary]:
     """Items with due dates matching a time expression.
 
-    Tries dateparser for natural language. Falls back to simple
-    keyword matching if dateparser isn't available.
+    Parses the expression (wake/timeparse.py). Falls back to simple
+    keyword matching if it isn't a time anything understands.
     """
     # Try to parse the time expression
     target = _parse_time_expression(when, now)
 
     if target is None:
         # Fallback: text search for the time expression in content
-        rows = conn.execute("""
-            SELECT * FROM working_memory
-            WHERE status = 'active'
-              AND (content LIKE ? OR due LIKE ?)
-        """, (f"%{when}%", f"%{when}%")).fetchall()
-        return [_row_to_summary(r, now, conn) for r in rows]
+        rows = _active_containing(conn, when, ("content",))
+        seen = {r["id"] for r in rows}
+        rows += [
+            r for r in conn.execute("""
+                SELECT * FROM working_memory
+                WHERE status = 'active' AND due LIKE ?
+            """, (f"%{when}%",))
+            if r["id"] not in seen
+        ]
+        return _summaries(conn, rows, now)
 
     # Search within a day window around the target
     window_start = target - timedelta(hours=12)
@@ -336,24 +647,10 @@ def _plans_by_time(
         ORDER BY due ASC
     """, (window_start.isoformat(), window_end.isoformat())).fetchall()
 
-    return [_row_to_summary(r, now, conn) for r in rows]
+    return _summaries(conn, rows, now)
 
 
 def _parse_time_expression(when: str, now: datetime) -> datetime | None:
     """Parse a natural language time expression into a datetime.
-    Uses dateparser if available, otherwise returns None."""
-    try:
-        import dateparser
-        result = dateparser.parse(
-            when,
-            settings={
-                "RELATIVE_BASE": now.replace(tzinfo=None),
-                "PREFER_DATES_FROM": "future",
-            },
-        )
-        if result:
-            return result.replace(tzinfo=timezone.utc)
-    except ImportError:
-        pass
-
-    return None
+    Common forms by rule; dateparser (if installed) on a miss."""
+    return parse_when(when, now)
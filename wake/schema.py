@@ -8,17 +8,18 @@ Tables:
                           holding right now.
   fragments + edges     — compiled knowledge, three tiers. The maintenance
                           agent writes these. I read them.
-  state                 — metadata (turn counter, etc.)
+  state                 — metadata (turn counter, gem generation, etc.)
   maintenance_runs      — when the maintenance agent last ran
 """
 
 from __future__ import annotations
 
+import os
 import sqlite3
 from pathlib import Path
 
 
-SCHEMA_VERSION = 5  # bump when schema changes
+SCHEMA_VERSION = 10  # bump when schema changes
 
 
 def connect(db_path: Path, events_path: Path | None = None) -> sqlite3.Connection:
@@ -82,18 +83,100 @@ def migrate(db_path: Path) -> None:
             if not _migrate_v4_to_v5(conn, db_path):
                 target_version = 4  # stay at v4 until migrate_data_split.py runs
 
+        if target_version < 5:
+            # Events still live here — they need the display projection
+            # and spans that events.sqlite carries (events schema v2, v4)
+            from .display import create_display_table, backfill_display
+            from .tags import create_spans_table
+            create_display_table(conn, "main")
+            create_spans_table(conn, "main")
+            backfill_display(conn, "main")
+            # Paged by event_id; the ts index it once had is never read
+            conn.execute("DROP INDEX IF EXISTS main.idx_event_display_ts")
+
+        # Independent of v5 — runs (idempotently) even while v5 waits
+        if current < 6:
+            _migrate_v5_to_v6(conn)
+
+        if current < 7:
+            _migrate_v6_to_v7(conn)
+
+        if current < 8:
+            _migrate_v7_to_v8(conn)
+
+        if current < 9:
+            _migrate_v8_to_v9(conn)
+
+        if current < 10:
+            _migrate_v9_to_v10(conn)
+
         # Update version
         conn.execute("DELETE FROM schema_version")
         conn.execute(
             "INSERT INTO schema_version (version) VALUES (?)",
             (target_version,),
         )
+        # Mirror into the file header so ensure_schema() can check it
+        # without touching a table
+        conn.execute(f"PRAGMA main.user_version = {int(target_version)}")
 
         conn.commit()
     finally:
         conn.close()
 
 
+# --- Hot-path schema check ---
+#
+# migrate() writes and commits every time it runs. That belongs at worker
+# startup, not in front of every message. ensure_schema() is what the hot
+# path calls: once a Gem file has been seen at the current version, later
+# calls cost two stat() calls and nothing else. If the file is replaced
+# (restore from backup, migrate_data_split) its inode changes, the cache
+# misses, and the header is read again.
+
+# (dev, ino) of Gem + events files → True once verified current
+_schema_checked: dict[tuple, bool] = {}
+
+
+def file_identity(path: Path) -> tuple | None:
+    """(dev, inode) of a file — the same Gem under any path. None if missing."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_dev, st.st_ino)
+
+
+def ensure_schema(conn: sqlite3.Connection, db_path: Path) -> None:
+    """Make sure the Gem is current. Migrates only when it isn't.
+
+    conn must be a connect() connection to db_path (ev attached).
+    Reads PRAGMA user_version from both file headers on a cache miss;
+    runs migrate() only if either is behind.
+    """
+    from .events_schema import SCHEMA_VERSION as EVENTS_SCHEMA_VERSION
+
+    db_path = Path(db_path)
+    events_path = db_path.parent / "events.sqlite"
+    key = (file_identity(db_path), file_identity(events_path))
+    if key in _schema_checked:
+        return
+
+    gem_version = conn.execute("PRAGMA main.user_version").fetchone()[0]
+    stale = gem_version < SCHEMA_VERSION
+    if events_path.exists():
+        ev_version = conn.execute("PRAGMA ev.user_version").fetchone()[0]
+        stale = stale or ev_version < EVENTS_SCHEMA_VERSION
+
+    if stale:
+        # Also covers a deferred v5 (events.sqlite still empty) — that
+        # re-checks once per process, which is the old behaviour anyway
+        migrate(db_path)
+        key = (file_identity(db_path), file_identity(events_path))
+
+    _schema_checked[key] = True
+
+
 def _create_v1(conn: sqlite3.Connection) -> None:
     """Original schema — events, fragments, plans, state."""
 
@@ -340,20 +423,284 @@ def _migrate_v4_to_v5(conn: sqlite3.Connection, db_path: Path) -> bool:
     if count == 0:
         return False  # events.sqlite exists but empty — keep main tables
 
-    # Safe to drop — events live in events.sqlite now
+    # Safe to drop — events live in events.sqlite now. Qualified: an
+    # unqualified name missing from main resolves to ev's copy.
     for stmt in [
-        "DROP TRIGGER IF EXISTS events_ai",
-        "DROP TRIGGER IF EXISTS events_ad",
-        "DROP TRIGGER IF EXISTS events_au",
-        "DROP TABLE IF EXISTS events_fts",
-        "DROP TABLE IF EXISTS event_tags",
-        "DROP TABLE IF EXISTS events",
+        "DROP TRIGGER IF EXISTS main.events_ai",
+        "DROP TRIGGER IF EXISTS main.events_ad",
+        "DROP TRIGGER IF EXISTS main.events_au",
+        "DROP TABLE IF EXISTS main.event_display",
+        "DROP TABLE IF EXISTS main.events_fts",
+        "DROP TABLE IF EXISTS main.event_tags",
+        "DROP TABLE IF EXISTS main.events",
     ]:
         conn.execute(stmt)
 
     return True
 
 
+def _migrate_v5_to_v6(conn: sqlite3.Connection) -> None:
+    """Precomputed expiry for working memory.
+
+    expires_at / expires_turn are when an item's decay score crosses
+    SWEEP_THRESHOLD on each axis (see decay.expiry_bounds). The sweep
+    reads them through partial indexes to pick the rows worth scoring
+    instead of scoring every row.
+    Backfills active rows that don't have them yet.
+    """
+    from datetime import datetime, timezone
+    from .decay import (
+        WM_TYPE_TO_PERSISTENCE, Persistence, estimate_turn_rate, expiry_bounds,
+    )
+
+    cols = {row[1] for row in conn.execute("PRAGMA table_info(working_memory)")}
+    if "expires_at" not in cols:
+        conn.execute("ALTER TABLE working_memory ADD COLUMN expires_at TEXT")
+    if "expires_turn" not in cols:
+        conn.execute("ALTER TABLE working_memory ADD COLUMN expires_turn REAL")
+
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_wm_expires_at
+            ON working_memory(expires_at)
+            WHERE status = 'active'
+    """)
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_wm_expires_turn
+            ON working_memory(expires_turn)
+            WHERE status = 'active'
+    """)
+
+    rows = conn.execute("""
+        SELECT id, type, due, turn, created_at, refreshed_at
+        FROM working_memory
+        WHERE status = 'active' AND expires_at IS NULL AND expires_turn IS NULL
+    """).fetchall()
+    if not rows:
+        return
+
+    now = datetime.now(timezone.utc)
+    state = conn.execute(
+        "SELECT value FROM state WHERE key = 'current_turn'"
+    ).fetchone()
+    current_turn = int(state["value"]) if state else 0
+    turn_rate = estimate_turn_rate(conn, now, current_turn)
+
+    def _ts(value: str | None) -> datetime | None:
+        if not value:
+            return None
+        return datetime.fromisoformat(value).replace(tzinfo=timezone.utc)
+
+    updates = []
+    for row in rows:
+        created = _ts(row["created_at"])
+        turn = row["turn"]
+        if turn is None and turn_rate > 0:
+            age_seconds = max((now - created).total_seconds(), 0.0)
+            turn = max(0, current_turn - int(age_seconds * turn_rate))
+        expires_at, expires_turn = expiry_bounds(
+            WM_TYPE_TO_PERSISTENCE.get(row["type"], Persistence.THOUGHT),
+            created, _ts(row["refreshed_at"]), turn, _ts(row["due"]),
+        )
+        if expires_at is None and expires_turn is None:
+            continue
+        updates.append((
+            expires_at.isoformat() if expires_at else None,
+            expires_turn,
+            row["id"],
+        ))
+
+    conn.executemany(
+        "UPDATE working_memory SET expires_at = ?, expires_turn = ? WHERE id = ?",
+        updates,
+    )
+
+
+def _migrate_v6_to_v7(conn: sqlite3.Connection) -> None:
+    """Gem generation — a counter that moves only when knowledge does.
+
+    Every insert, update or delete on fragments or fragment_edges bumps
+    state.gem_generation, in the writer's own transaction, whichever
+    process it is. The fragment cache compares it to decide whether it
+    is still looking at the current graph. (PRAGMA data_version can't do
+    this job: it is per-connection and ticks on every working memory
+    write too.)
+    """
+    conn.execute("""
+        INSERT OR IGNORE INTO state (key, value, updated_at)
+        VALUES ('gem_generation', '0', datetime('now'))
+    """)
+
+    bump = """
+        UPDATE state SET value = CAST(value AS INTEGER) + 1,
+                         updated_at = datetime('now')
+        WHERE key = 'gem_generation';
+    """
+    for table, short in (("fragments", "fragments"), ("fragment_edges", "edges")):
+        for event, suffix in (("INSERT", "ai"), ("UPDATE", "au"), ("DELETE", "ad")):
+            conn.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {short}_gen_{suffix}
+                AFTER {event} ON {table} BEGIN {bump} END
+            """)
+
+
+def _migrate_v7_to_v8(conn: sqlite3.Connection) -> None:
+    """Indexes for plans() as resolved history piles up.
+
+    Active rows are a sliver of working_memory once it has lived a
+    while; a partial index on them keeps plans() from walking the
+    resolved ones. Refs get an index by fragment key — the primary key
+    leads with wm_id, so plans(topic=...) scanned the whole table.
+    """
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_wm_active_due
+            ON working_memory(due, created_at)
+            WHERE status = 'active'
+    """)
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_wm_refs_key
+            ON working_memory_refs(fragment_key)
+    """)
+
+
+def _migrate_v8_to_v9(conn: sqlite3.Connection) -> None:
+    """Trigram indexes — substring matching without a table scan.
+
+    fragment_keys_trigram covers fragment keys, so a recall that misses
+    can say which key was probably meant. working_memory_trigram covers
+    subject and content, for plans(topic=...) and the plans(when=...)
+    fallback. Both are external-content over their tables, synced by
+    triggers like the v4 indexes. Queries need 3+ characters.
+
+    working_memory_trigram holds active rows only — its triggers add a
+    row when it is or becomes active and remove it when it stops being.
+    Every caller filters on active anyway, and this way a match costs
+    what the live set costs, not what years of resolved history cost.
+    (It never matches the content table row for row, so FTS5's
+    'rebuild' and 'integrity-check' don't apply to it.)
+    """
+    existing = {
+        row[0] for row in conn.execute(
+            """SELECT name FROM sqlite_master WHERE type = 'table'
+               AND name IN ('fragment_keys_trigram', 'working_memory_trigram')"""
+        )
+    }
+
+    conn.executescript("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS fragment_keys_trigram USING fts5(
+            key,
+            content='fragments', content_rowid='rowid',
+            tokenize='trigram'
+        );
+
+        CREATE VIRTUAL TABLE IF NOT EXISTS working_memory_trigram USING fts5(
+            subject, content,
+            content='working_memory', content_rowid='id',
+            tokenize='trigram'
+        );
+
+        CREATE TRIGGER IF NOT EXISTS fragment_keys_tri_ai AFTER INSERT ON fragments BEGIN
+            INSERT INTO fragment_keys_trigram(rowid, key) VALUES (new.rowid, new.key);
+        END;
+        CREATE TRIGGER IF NOT EXISTS fragment_keys_tri_ad AFTER DELETE ON fragments BEGIN
+            INSERT INTO fragment_keys_trigram(fragment_keys_trigram, rowid, key)
+            VALUES ('delete', old.rowid, old.key);
+        END;
+        CREATE TRIGGER IF NOT EXISTS fragment_keys_tri_au AFTER UPDATE OF key ON fragments BEGIN
+            INSERT INTO fragment_keys_trigram(fragment_keys_trigram, rowid, key)
+            VALUES ('delete', old.rowid, old.key);
+            INSERT INTO fragment_keys_trigram(rowid, key) VALUES (new.rowid, new.key);
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS wm_tri_ai AFTER INSERT ON working_memory
+        WHEN new.status = 'active' BEGIN
+            INSERT INTO working_memory_trigram(rowid, subject, content)
+            VALUES (new.id, new.subject, new.content);
+        END;
+        CREATE TRIGGER IF NOT EXISTS wm_tri_ad AFTER DELETE ON working_memory
+        WHEN old.status = 'active' BEGIN
+            INSERT INTO working_memory_trigram(working_memory_trigram, rowid, subject, content)
+            VALUES ('delete', old.id, old.subject, old.content);
+        END;
+        CREATE TRIGGER IF NOT EXISTS wm_tri_au AFTER UPDATE OF status, subject, content ON working_memory BEGIN
+            INSERT INTO working_memory_trigram(working_memory_trigram, rowid, subject, content)
+            SELECT 'delete', old.id, old.subject, old.content WHERE old.status = 'active';
+            INSERT INTO working_memory_trigram(rowid, subject, content)
+            SELECT new.id, new.subject, new.content WHERE new.status = 'active';
+        END;
+    """)
+
+    # Index what's already there — once; v9 re-runs while v5 is deferred
+    if "fragment_keys_trigram" not in existing:
+        conn.execute("INSERT INTO fragment_keys_trigram(fragment_keys_trigram) VALUES ('rebuild')")
+    if "working_memory_trigram" not in existing:
+        conn.execute("""
+            INSERT INTO working_memory_trigram(rowid, subject, content)
+            SELECT id, subject, content FROM working_memory WHERE status = 'active'
+        """)
+
+
+def _migrate_v9_to_v10(conn: sqlite3.Connection) -> None:
+    """Word index for resolving plans and pins by description.
+
+    <plan>done ...</plan> and <pin>drop ...</pin> pick the active item
+    whose words overlap the description most. Finding candidates meant
+    scoring every active item of the type. working_memory_resolvable_fts
+    holds only active plans and pins, kept that way by triggers like
+    working_memory_trigram's, so lifecycle looks up the description's
+    words and scores only the items that share one. Patterns, feelings
+    and resolved history never enter it.
+
+    The matching splits on whitespace only, so a lone "—" or "&" is a
+    word that can carry overlap. RESOLVE_TOKENCHARS makes punctuation
+    part of tokens here, so those words have tokens to look up too.
+    working_memory_resolvable_vocab gives each term's item count, so
+    the rarest words are looked up first.
+    """
+    exists = conn.execute(
+        """SELECT 1 FROM sqlite_master WHERE type = 'table'
+           AND name = 'working_memory_resolvable_fts'"""
+    ).fetchone()
+
+    conn.execute(f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS working_memory_resolvable_fts USING fts5(
+            content, type,
+            content='working_memory', content_rowid='id',
+            tokenize="unicode61 tokenchars '{RESOLVE_TOKENCHARS}'"
+        )
+    """)
+
+    conn.executescript("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS working_memory_resolvable_vocab
+            USING fts5vocab(working_memory_resolvable_fts, 'row');
+
+        CREATE TRIGGER IF NOT EXISTS wm_res_ai AFTER INSERT ON working_memory
+        WHEN new.status = 'active' AND new.type IN ('plan', 'pin') BEGIN
+            INSERT INTO working_memory_resolvable_fts(rowid, content, type)
+            VALUES (new.id, new.content, new.type);
+        END;
+        CREATE TRIGGER IF NOT EXISTS wm_res_ad AFTER DELETE ON working_memory
+        WHEN old.status = 'active' AND old.type IN ('plan', 'pin') BEGIN
+            INSERT INTO working_memory_resolvable_fts(working_memory_resolvable_fts, rowid, content, type)
+            VALUES ('delete', old.id, old.content, old.type);
+        END;
+        CREATE TRIGGER IF NOT EXISTS wm_res_au AFTER UPDATE OF status, content, type ON working_memory BEGIN
+            INSERT INTO working_memory_resolvable_fts(working_memory_resolvable_fts, rowid, content, type)
+            SELECT 'delete', old.id, old.content, old.type
+            WHERE old.status = 'active' AND old.type IN ('plan', 'pin');
+            INSERT INTO working_memory_resolvable_fts(rowid, content, type)
+            SELECT new.id, new.content, new.type
+            WHERE new.status = 'active' AND new.type IN ('plan', 'pin');
+        END;
+    """)
+
+    if not exists:
+        conn.execute("""
+            INSERT INTO working_memory_resolvable_fts(rowid, content, type)
+            SELECT id, content, type FROM working_memory
+            WHERE status = 'active' AND type IN ('plan', 'pin')
+        """)
+
+
 # Valid types and statuses for working_memory
 VALID_WM_TYPES = frozenset({
     "feeling", "thought", "pattern", "desc",
@@ -364,6 +711,10 @@ VALID_WM_STATUSES = frozenset({
     "active", "resolved", "dropped", "decayed", "superseded",
 })
 
+# Punctuation working_memory_resolvable_fts keeps inside tokens (v10).
+# Changing it means rebuilding that index.
+RESOLVE_TOKENCHARS = "!#$%&()*+,-./:;<=>?@[\\]^_{|}~–—…•·"
+
 # Display tags (stored in event_tags, no working_memory record)
 DISPLAY_TAGS = frozenset({"say", "do", "narrate"})
 
@@ -3,6 +3,10 @@ Search — full-text search across the Gem.
 
 Uses FTS5 indexes created by schema v4 migration.
 Requires: fragments_fts, events_fts, working_memory_fts virtual tables.
+
+One table at a time, on the caller's connection, raw BM25 ranks. For
+one ranked list across every table (summaries included), with paging
+and time filters, use wake/search_engine.py.
 """
 
 from __future__ import annotations
@@ -0,0 +1,279 @@
+"""
+Search engine — one ranked list across everything I can search.
+
+wake/search.py asks each index in turn and hands back separate lists
+whose BM25 ranks can't be compared. This asks them all at once — one
+read connection per table, on its own thread, so SQLite runs the
+queries side by side — and merges the hits into one list.
+
+Scores are comparable because each raw BM25 (FTS5 gives it negated,
+lower is better) is squashed the same way, b / (1 + b) into 0..1, and
+then multiplied by the table's weight. The squash depends only on the
+row, never on what else matched, so a hit's score is the same on
+every page — which is what makes keyset paging work: the cursor is
+the last hit's (score, table, rowid), and each table's next page
+starts strictly after it.
+
+Tables (all optional, all FTS5):
+  fragments — fragments_fts, every tier        (time: updated_at)
+  wm        — working_memory_fts               (time: created_at)
+  summaries — summaries_fts in summaries.sqlite (time: created_at)
+  events    — events_fts in events.sqlite      (time: ts)
+
+Queries are FTS5 syntax, passed through as-is.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+from .schema import connect
+from .summaries_schema import connect_summaries_readonly
+
+
+# Per-table multipliers on the normalized score. 0 leaves a table out.
+DEFAULT_WEIGHTS = {
+    "fragments": 1.0,
+    "wm": 0.8,
+    "summaries": 0.7,
+    "events": 0.6,
+}
+
+DEFAULT_LIMIT = 20
+
+
+@dataclass(frozen=True)
+class _Table:
+    name: str
+    schema: str         # main, or ev for the attached events file
+    fts: str            # FTS5 table
+    base: str           # content table
+    pk: str             # base column matching the FTS rowid
+    ref: str            # what identifies a hit to the caller
+    text: str           # what a hit shows without the snippet
+    ts: str             # column the time filter applies to
+    snippet_column: int
+    extra: tuple[str, ...] = ()
+
+
+TABLES = {
+    t.name: t for t in (
+        _Table("fragments", "main", "fragments_fts", "fragments", "rowid",
+               "key", "ambient", "updated_at", -1),
+        _Table("wm", "main", "working_memory_fts", "working_memory", "id",
+               "id", "content", "created_at", 0, ("type", "subject", "actor", "status")),
+        _Table("summaries", "main", "summaries_fts", "summaries", "id",
+               "id", "content", "created_at", 0, ("level", "chunk_start", "chunk_end")),
+        _Table("events", "ev", "events_fts", "events", "id",
+               "id", "content", "ts", 0, ("actor",)),
+    )
+}
+
+# Tie order when two hits score the same
+_TABLE_ORDER = {name: i for i, name in enumerate(TABLES)}
+
+
+@dataclass
+class SearchHit:
+    """One match, scored so it can sit next to matches from other tables."""
+    table: str
+    ref: str | int              # fragment key, or row id
+    rowid: int
+    score: float                # weight × bm25 / (1 + bm25), higher is better
+    bm25: float                 # raw, as FTS5 reports it (negative)
+    ts: str | None
+    snippet: str
+    text: str
+    extra: dict = field(default_factory=dict)
+
+
+@dataclass
+class SearchPage:
+    hits: list[SearchHit]
+    cursor: str | None          # pass back for the next page; None when done
+    tables: list[str]           # tables actually searched
+
+
+def _encode_cursor(hit: SearchHit) -> str:
+    return f"{hit.score!r}:{hit.table}:{hit.rowid}"
+
+
+def _decode_cursor(cursor: str) -> tuple[float, str, int]:
+    try:
+        score, table, rowid = cursor.split(":")
+        if table not in TABLES:
+            raise ValueError(table)
+        return float(score), table, int(rowid)
+    except ValueError:
+        raise ValueError(f"bad search cursor: {cursor!r}") from None
+
+
+def _iso(value: datetime | str | None) -> str | None:
+    if value is None:
+        return None
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _search_table(
+    table: _Table,
+    conn: sqlite3.Connection,
+    query: str,
+    weight: float,
+    limit: int,
+    after: tuple[float, str, int] | None,
+    since: str | None,
+    until: str | None,
+) -> list[SearchHit]:
+    """One table's page, best first. Runs on its own thread and connection."""
+    fts = table.fts  # FTS5 functions want the bare table name, not an alias
+    score_expr = f"(? * -bm25({fts}) / (1.0 - bm25({fts})))"
+    extra = "".join(f", b.{col} AS {col}" for col in table.extra)
+    where = [f"{fts} MATCH ?"]
+    params: list = [query]
+
+    if since is not None:
+        where.append(f"b.{table.ts} >= ?")
+        params.append(since)
+    if until is not None:
+        where.append(f"b.{table.ts} < ?")
+        params.append(until)
+
+    if after is not None:
+        score, after_table, rowid = after
+        order = _TABLE_ORDER[table.name] - _TABLE_ORDER[after_table]
+        if order > 0:
+            where.append(f"{score_expr} <= ?")
+            params += [weight, score]
+        elif order < 0:
+            where.append(f"{score_expr} < ?")
+            params += [weight, score]
+        else:
+            where.append(f"({score_expr} < ? OR ({score_expr} = ? AND {fts}.rowid > ?))")
+            params += [weight, score, weight, score, rowid]
+
+    rows = conn.execute(
+        f"""
+        SELECT b.{table.ref} AS ref, {fts}.rowid AS rowid,
+               b.{table.text} AS text, b.{table.ts} AS ts,
+               snippet({fts}, {table.snippet_column}, '»', '«', '...', 32) AS snippet,
+               bm25({fts}) AS bm25, {score_expr} AS score{extra}
+        FROM {table.schema}.{fts}
+        CROSS JOIN {table.schema}.{table.base} AS b ON b.{table.pk} = {fts}.rowid
+        WHERE {" AND ".join(where)}
+        ORDER BY score DESC, {fts}.rowid
+        LIMIT ?
+        """,
+        [weight] + params + [limit],
+    ).fetchall()
+
+    return [
+        SearchHit(
+            table=table.name,
+            ref=row["ref"],
+            rowid=row["rowid"],
+            score=row["score"],
+            bm25=row["bm25"],
+            ts=row["ts"],
+            snippet=row["snippet"] or "",
+            text=row["text"] or "",
+            extra={col: row[col] for col in table.extra},
+        )
+        for row in rows
+    ]
+
+
+# One worker per table, kept for the life of the process — spawning
+# threads per call costs more than the smaller queries themselves
+_pool: ThreadPoolExecutor | None = None
+
+def _run(
+    name: str,
+    db_path: Path,
+    summaries_path: Path,
+    query: str,
+    weight: float,
+    limit: int,
+    after: tuple[float, str, int] | None,
+    since: str | None,
+    until: str | None,
+) -> list[SearchHit]:
+    if name == "summaries":
+        # Search only reads: the Mirror creates and migrates this file.
+        # Not there yet, or from before summaries_fts (v2) — no hits
+        if not summaries_path.exists():
+            return []
+        conn = connect_summaries_readonly(summaries_path)
+        if conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'summaries_fts'"
+        ).fetchone() is None:
+            conn.close()
+            return []
+    else:
+        conn = connect(db_path)
+    try:
+        return _search_table(TABLES[name], conn, query, weight, limit, after, since, until)
+    finally:
+        conn.close()
+
+
+def search(
+    db_path: Path,
+    query: str,
+    tables: list[str] | tuple[str, ...] | None = None,
+    limit: int = DEFAULT_LIMIT,
+    cursor: str | None = None,
+    since: datetime | str | None = None,
+    until: datetime | str | None = None,
+    weights: dict[str, float] | None = None,
+    summaries_path: Path | None = None,
+) -> SearchPage:
+    """Ranked hits across tables, best first, one page at a time.
+
+    tables defaults to every table that exists (summaries only when
+    summaries.sqlite does). weights override DEFAULT_WEIGHTS per table.
+    since / until bound each table's time column, [since, until).
+    cursor is the previous page's SearchPage.cursor.
+
+    Raises ValueError for an unknown table or a malformed cursor, and
+    sqlite3.OperationalError for a malformed FTS5 query.
+    """
+    db_path = Path(db_path)
+    summaries_path = Path(summaries_path or db_path.parent / "summaries.sqlite")
+    weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+
+    names = list(tables) if tables else list(TABLES)
+    for name in names:
+        if name not in TABLES:
+            raise ValueError(f"unknown search table: {name!r}")
+    if tables is None and not summaries_path.exists():
+        names.remove("summaries")
+    names = [n for n in names if weights.get(n, 0) > 0]
+
+    after = _decode_cursor(cursor) if cursor else None
+    since, until = _iso(since), _iso(until)
+    if not names or limit <= 0:
+        return SearchPage(hits=[], cursor=None, tables=names)
+
+    global _pool
+    if _pool is None:
+        _pool = ThreadPoolExecutor(max_workers=len(TABLES), thread_name_prefix="search")
+    futures = [
+        _pool.submit(_run, name, db_path, summaries_path, query,
+                     weights[name], limit, after, since, until)
+        for name in names
+    ]
+    per_table = [f.result() for f in futures]
+
+    hits = sorted(
+        (hit for found in per_table for hit in found),
+        key=lambda h: (-h.score, _TABLE_ORDER[h.table], h.rowid),
+    )
+    page = hits[:limit]
+    # More may follow if anything was left over or any table filled its page
+    more = len(hits) > limit or any(len(found) == limit for found in per_table)
+    next_cursor = _encode_cursor(page[-1]) if more and page else None
+    return SearchPage(hits=page, cursor=next_cursor, tables=names)
@@ -0,0 +1,82 @@
+"""
+Session — one connection for one heartbeat.
+
+A turn touches the Gem many times: ingest Mono's message, load pending
+recall, assemble, recall, ingest Claude's reply, save recall for next
+turn. Opening a connection for each of those re-runs the WAL pragma
+and the ATTACH every time. A TurnSession opens once and is handed to
+everything that would otherwise take a db_path.
+
+Transactions are explicit. Reads run outside any transaction. Writes
+go inside session.transaction(), which commits on success and rolls
+back on error. Nested transaction() blocks join the outermost one, so
+ingest() can open its own block and still be wrapped by a caller.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Union
+
+from .schema import connect
+
+
+class TurnSession:
+    """Holds one Gem connection (with ev attached) for the length of a turn."""
+
+    def __init__(self, db_path: Path, events_path: Path | None = None):
+        self.db_path = Path(db_path)
+        self.conn: sqlite3.Connection = connect(self.db_path, events_path)
+        self._depth = 0
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Commit on success, roll back on error. Inner blocks join the outer one."""
+        self._depth += 1
+        try:
+            yield self.conn
+        except BaseException:
+            self._depth -= 1
+            if self._depth == 0:
+                self.conn.rollback()
+            raise
+        self._depth -= 1
+        if self._depth == 0:
+            self.conn.commit()
+
+    def close(self) -> None:
+        if self.conn is not None:
+            if self.conn.in_transaction:
+                self.conn.rollback()
+            self.conn.close()
+            self.conn = None
+
+    def __enter__(self) -> "TurnSession":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+# Anything that can reach the Gem: a path (own connection) or a live session.
+GemSource = Union[str, Path, TurnSession]
+
+
+@contextmanager
+def borrow(source: GemSource) -> Iterator[TurnSession]:
+    """Yield a session for source.
+
+    A TurnSession is passed through untouched — the caller owns it.
+    A path gets a short-lived session that is closed on exit.
+    """
+    if isinstance(source, TurnSession):
+        yield source
+        return
+
+    session = TurnSession(Path(source))
+    try:
+        yield session
+    finally:
+        session.close()
@@ -3,6 +3,7 @@ Summaries schema — the Mirror's output store.
 
 Tables:
   summaries       — chunk summaries at all levels (L0, L1, L2)
+  summaries_fts   — FTS5 over summaries.content (v2)
   tag_suggestions — WM tags proposed by compression, staged for promotion
 """
 
@@ -12,7 +13,7 @@ import sqlite3
 from pathlib import Path
 
 
-SCHEMA_VERSION = 1
+SCHEMA_VERSION = 2
 
 
 def connect_summaries(db_path: Path) -> sqlite3.Connection:
@@ -24,6 +25,17 @@ def connect_summaries(db_path: Path) -> sqlite3.Connection:
     return conn
 
 
+def connect_summaries_readonly(db_path: Path) -> sqlite3.Connection:
+    """A read-only connection — never creates or migrates the file.
+
+    Raises sqlite3.OperationalError if it isn't there.
+    """
+    conn = sqlite3.connect(f"{Path(db_path).resolve().as_uri()}?mode=ro", uri=True)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA busy_timeout = 5000")
+    return conn
+
+
 def migrate_summaries(db_path: Path) -> None:
     """Create or update the summaries schema. Safe to call every startup."""
     conn = connect_summaries(db_path)
@@ -41,6 +53,9 @@ def migrate_summaries(db_path: Path) -> None:
         if current < 1:
             _create_v1(conn)
 
+        if current < 2:
+            _migrate_v1_to_v2(conn)
+
         conn.execute("DELETE FROM schema_version")
         conn.execute(
             "INSERT INTO schema_version (version) VALUES (?)",
@@ -89,3 +104,29 @@ def _create_v1(conn: sqlite3.Connection) -> None:
         CREATE INDEX IF NOT EXISTS idx_tag_suggestions_status
             ON tag_suggestions(status);
     """)
+
+
+def _migrate_v1_to_v2(conn: sqlite3.Connection) -> None:
+    """Full-text index on summary content, kept in sync by triggers."""
+    conn.executescript("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS summaries_fts USING fts5(
+            content,
+            content='summaries', content_rowid='id'
+        );
+
+        CREATE TRIGGER IF NOT EXISTS summaries_ai AFTER INSERT ON summaries BEGIN
+            INSERT INTO summaries_fts(rowid, content) VALUES (new.id, new.content);
+        END;
+        CREATE TRIGGER IF NOT EXISTS summaries_ad AFTER DELETE ON summaries BEGIN
+            INSERT INTO summaries_fts(summaries_fts, rowid, content)
+            VALUES ('delete', old.id, old.content);
+        END;
+        CREATE TRIGGER IF NOT EXISTS summaries_au AFTER UPDATE OF content ON summaries BEGIN
+            INSERT INTO summaries_fts(summaries_fts, rowid, content)
+            VALUES ('delete', old.id, old.content);
+            INSERT INTO summaries_fts(rowid, content) VALUES (new.id, new.content);
+        END;
+    """)
+
+    # Index what's already there
+    conn.execute("INSERT INTO summaries_fts(summaries_fts) VALUES ('rebuild')")
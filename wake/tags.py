@@ -0,0 +1,189 @@
+"""
+Tags — one pass over an event's text.
+
+Every consumer of raw event text used to scan it with its own regex:
+parse for spans and untagged text, display for say / do and the
+stripped fallback, the Mirror for DO-density, parse_mono_message for
+a tag-stripped copy. tokenize() does it once. One finditer finds every
+tag marker; spans are paired from those markers in one more walk, so
+the work is linear in the text however malformed it is.
+
+The pairing rules are the ones parse_response always had:
+  - a span is <tag> ... the first </tag> after it, for the same tag
+  - spans don't nest: whatever sits inside a span is its content, and
+    scanning resumes after its close
+  - an opener with no close is left as text; so is a stray close
+  - a leading identity tag (<hasuki>) is the actor, not a span
+
+Display pairs say / do / narrate among themselves (spans_of()), as its
+own regex always did, from the same markers.
+
+What's worth keeping — actor, span offsets, chars per tag — is stored
+per event in ev.event_spans (events schema v4), written alongside the
+display row, so later readers never parse again.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import sqlite3
+from dataclasses import dataclass, field
+
+from .schema import ALL_TAGS, IDENTITY_TAGS
+
+
+# Every tag the tokenizer recognizes, span or identity
+TAG_NAMES = ALL_TAGS | IDENTITY_TAGS
+
+_MARKER = re.compile(
+    r"<(/?)(" + "|".join(re.escape(t) for t in sorted(TAG_NAMES, key=len, reverse=True)) + r")>",
+)
+
+# <hasuki> at the start of a message, and the whitespace around it
+_LEADING_IDENTITY = re.compile(
+    r"^\s*<(" + "|".join(re.escape(t) for t in IDENTITY_TAGS) + r")>\s*",
+)
+
+
+@dataclass(frozen=True)
+class Span:
+    """One tagged region, as offsets into the raw text."""
+    tag: str
+    start: int          # the opening tag's '<'
+    end: int            # just past the closing tag's '>'
+    inner_start: int    # content, between the tags
+    inner_end: int
+
+
+@dataclass
+class Tokens:
+    """Everything tokenize() found in one text."""
+    raw: str
+    actor: str | None = None            # leading identity tag
+    body_start: int = 0                 # offset past it
+    spans: list[Span] = field(default_factory=list)
+    tag_chars: dict[str, int] = field(default_factory=dict)  # tag → chars inside its spans
+    markers: list[tuple[int, int, str, bool]] = field(default_factory=list)  # every tag marker: (start, end, name, closing)
+
+    def content(self, span: Span) -> str:
+        return self.raw[span.inner_start:span.inner_end]
+
+    @property
+    def untagged(self) -> str:
+        """The body with every span removed (stray tags stay), stripped."""
+        parts = []
+        pos = self.body_start
+        for span in self.spans:
+            parts.append(self.raw[pos:span.start])
+            pos = span.end
+        parts.append(self.raw[pos:])
+        return "".join(parts).strip()
+
+    def spans_of(self, names: frozenset[str]) -> list[Span]:
+        """Spans paired among these tags only, over the whole text.
+
+        Other tags don't shadow them: a <say> inside a <plan> is a span
+        here, where it's plan content in spans.
+        """
+        return _pair(self.markers, names)
+
+    def strip_tags(self, names: frozenset[str] = TAG_NAMES) -> str:
+        """The raw text with every marker for these tags removed, stripped."""
+        parts = []
+        pos = 0
+        for start, end, name, _ in self.markers:
+            if name in names:
+                parts.append(self.raw[pos:start])
+                pos = end
+        parts.append(self.raw[pos:])
+        return "".join(parts).strip()
+
+
+def _pair(
+    markers: list[tuple[int, int, str, bool]],
+    names: frozenset[str],
+    start_at: int = 0,
+) -> list[Span]:
+    """Spans from markers, considering only tags in names.
+
+    An opener starts a span only if its tag closes somewhere after it —
+    the last close of each tag is all that needs knowing. Then the
+    first close of that tag ends it, and anything between is content.
+    """
+    last_close = {name: start for start, _, name, closing in markers if closing}
+
+    spans = []
+    open_tag = None
+    for start, end, name, closing in markers:
+        if start < start_at or name not in names:
+            continue
+        if open_tag is None:
+            if not closing and last_close.get(name, -1) >= end:
+                open_tag, open_start, inner_start = name, start, end
+        elif closing and name == open_tag:
+            spans.append(Span(name, open_start, end, inner_start, start))
+            open_tag = None
+    return spans
+
+
+def tokenize(text: str) -> Tokens:
+    """Actor, spans and per-tag character counts, in one pass."""
+    tokens = Tokens(raw=text)
+
+    leading = _LEADING_IDENTITY.match(text)
+    if leading:
+        tokens.actor = leading.group(1)
+        tokens.body_start = leading.end()
+
+    tokens.markers = [
+        (m.start(), m.end(), m.group(2), bool(m.group(1)))
+        for m in _MARKER.finditer(text)
+    ]
+    tokens.spans = _pair(tokens.markers, ALL_TAGS, tokens.body_start)
+    for span in tokens.spans:
+        tokens.tag_chars[span.tag] = tokens.tag_chars.get(span.tag, 0) + span.inner_end - span.inner_start
+    return tokens
+
+
+EVENT_SPANS_SQL = """
+    CREATE TABLE IF NOT EXISTS {schema}.event_spans (
+        event_id    INTEGER PRIMARY KEY,
+        actor       TEXT,               -- leading identity tag
+        body_start  INTEGER NOT NULL,   -- offset past it
+        spans       TEXT NOT NULL,      -- JSON [[tag, start, end, inner_start, inner_end], ...]
+        tag_chars   TEXT NOT NULL       -- JSON {{tag: chars inside}}
+    );
+"""
+
+
+def create_spans_table(conn: sqlite3.Connection, schema: str = "ev") -> None:
+    conn.executescript(EVENT_SPANS_SQL.format(schema=schema))
+
+
+def _spans_row(event_id: int, tokens: Tokens) -> tuple:
+    return (
+        event_id,
+        tokens.actor,
+        tokens.body_start,
+        json.dumps([[s.tag, s.start, s.end, s.inner_start, s.inner_end] for s in tokens.spans]),
+        json.dumps(tokens.tag_chars),
+    )
+
+
+def store_spans(
+    conn: sqlite3.Connection,
+    rows: list[tuple[int, Tokens]],
+    schema: str = "ev",
+) -> None:
+    """Write (or rewrite) event_spans for (event_id, tokens) pairs.
+
+    Runs inside the caller's transaction.
+    """
+    conn.executemany(
+        f"""INSERT OR REPLACE INTO {schema}.event_spans
+            (event_id, actor, body_start, spans, tag_chars)
+            VALUES (?, ?, ?, ?, ?)""",
+        [_spans_row(event_id, tokens) for event_id, tokens in rows],
+    )
+
@@ -0,0 +1,253 @@
+"""
+Timeparse — when "by tuesday" is.
+
+Plans carry their due date in plain words. Most of those words are a
+handful of shapes: a weekday, today / tomorrow, "in 2 days", a clock
+time, a month and day, an ISO date. Those are matched here by rule,
+in microseconds. Anything else falls back to dateparser, which costs
+a second or more to import and milliseconds per call.
+
+The import is lazy: it happens on the first rule miss, so a process
+that only ever sees rule-shaped dates never pays for it.
+
+Rule results are memoized per (text, day). What's kept is the match —
+"2 days ahead, 15:00" — not the datetime, so "in 2 hours" is still
+measured from the moment of asking. dateparser's answer is a bare
+datetime that doesn't say which parts came from the moment of asking,
+so a fallback hit is never memoized; only a miss is.
+
+Times are UTC, same as everything else in the Gem.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+
+
+# Memoized (text, day) entries held at once
+MEMO_SIZE = 4096
+
+# No "mon", "wed", "sat", "sun" — too often words of their own
+WEEKDAYS = {
+    "monday": 0, "tue": 1, "tues": 1, "tuesday": 1, "wednesday": 2,
+    "thu": 3, "thur": 3, "thurs": 3, "thursday": 3,
+    "fri": 4, "friday": 4, "saturday": 5, "sunday": 6,
+}
+
+MONTHS = {
+    "jan": 1, "january": 1, "feb": 2, "february": 2, "mar": 3, "march": 3,
+    "apr": 4, "april": 4, "may": 5, "jun": 6, "june": 6, "jul": 7, "july": 7,
+    "aug": 8, "august": 8, "sep": 9, "sept": 9, "september": 9,
+    "oct": 10, "october": 10, "nov": 11, "november": 11, "dec": 12, "december": 12,
+}
+
+NUMBER_WORDS = {
+    "a": 1, "an": 1, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5,
+    "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10, "couple of": 2,
+}
+
+_UNIT_SECONDS = {"minute": 60, "min": 60, "hour": 3600, "hr": 3600,
+                 "day": 86400, "week": 604800}
+
+_weekday = "|".join(sorted(WEEKDAYS, key=len, reverse=True))
+_month = "|".join(sorted(MONTHS, key=len, reverse=True))
+_number = r"\d+|" + "|".join(sorted(NUMBER_WORDS, key=len, reverse=True))
+
+ISO_PATTERN = re.compile(
+    r"\b(\d{4})-(\d{2})-(\d{2})(?:[t ](\d{1,2}):(\d{2}))?\b"
+)
+DELTA_PATTERN = re.compile(
+    rf"\bin\s+({_number})\s+(minute|min|hour|hr|day|week)s?\b"
+)
+DAY_PATTERN = re.compile(
+    rf"\b(?:(day after tomorrow)|(today|tonight)|(tomorrow|tmrw|tmr)"
+    rf"|(next week)|(?:(next|this)\s+)?({_weekday})\b)"
+)
+MONTH_DAY_PATTERN = re.compile(
+    rf"\b(?:({_month})\.?\s+(\d{{1,2}})(?:st|nd|rd|th)?|(\d{{1,2}})(?:st|nd|rd|th)?\s+(?:of\s+)?({_month}))\b"
+)
+CLOCK_PATTERN = re.compile(
+    r"\b(?:(\d{1,2})(?::(\d{2}))?\s*([ap])\.?m\.?|at\s+(\d{1,2}):(\d{2})|(noon|midnight))\b"
+)
+
+
+@dataclass(frozen=True)
+class _Match:
+    """What the rules found, independent of the time of asking."""
+    when: datetime | None = None      # absolute (ISO, month-day, fallback)
+    delta: timedelta | None = None    # "in 2 hours" — from the moment of asking
+    days: int | None = None           # whole days ahead of today
+    clock: time | None = None         # time of day, if one was given
+    roll: bool = False                # bare clock already past → tomorrow
+
+
+# (text, day) → rule _Match, or None for "no date here"
+_memo: OrderedDict[tuple[str, date], _Match | None] = OrderedDict()
+
+_dateparser = None
+_import_lock = threading.Lock()
+
+
+def _load_dateparser():
+    global _dateparser
+    with _import_lock:
+        if _dateparser is None:
+            try:
+                import dateparser
+                _dateparser = dateparser
+            except ImportError:
+                _dateparser = False
+    return _dateparser
+
+
+def _number_value(word: str) -> int:
+    return int(word) if word.isdigit() else NUMBER_WORDS[word]
+
+
+def _clock(text: str) -> time | None:
+    m = CLOCK_PATTERN.search(text)
+    if not m:
+        return None
+    hour, minute, meridiem, hour24, minute24, named = m.groups()
+    if named:
+        return time(12, 0) if named == "noon" else time(0, 0)
+    if hour24 is not None:
+        hour, minute = int(hour24), int(minute24)
+    else:
+        hour, minute = int(hour), int(minute or 0)
+        if hour > 12:
+            return None
+        if meridiem == "p" and hour != 12:
+            hour += 12
+        elif meridiem == "a" and hour == 12:
+            hour = 0
+    if hour > 23 or minute > 59:
+        return None
+    return time(hour, minute)
+
+
+def _rules(text: str, today: date) -> _Match | None:
+    """Match the common shapes. text is lower-cased."""
+    m = ISO_PATTERN.search(text)
+    if m:
+        year, month, day, hour, minute = m.groups()
+        try:
+            return _Match(when=datetime(
+                int(year), int(month), int(day), int(hour or 0), int(minute or 0),
+            ))
+        except ValueError:
+            return None
+
+    m = DELTA_PATTERN.search(text)
+    if m:
+        seconds = _number_value(m.group(1)) * _UNIT_SECONDS[m.group(2)]
+        return _Match(delta=timedelta(seconds=seconds))
+
+    clock = _clock(text)
+
+    m = MONTH_DAY_PATTERN.search(text)
+    if m:
+        month = MONTHS[m.group(1) or m.group(4)]
+        day = int(m.group(2) or m.group(3))
+        for year in (today.year, today.year + 1):
+            try:
+                candidate = date(year, month, day)
+            except ValueError:
+                return None
+            if candidate >= today:
+                break
+        at = clock or time(0, 0)
+        return _Match(when=datetime.combine(candidate, at))
+
+    m = DAY_PATTERN.search(text)
+    if m:
+        after_tomorrow, today_word, tomorrow, next_week, modifier, weekday = m.groups()
+        if after_tomorrow:
+            days = 2
+        elif today_word:
+            days = 0
+            if today_word == "tonight" and clock is None:
+                clock = time(21, 0)
+        elif tomorrow:
+            days = 1
+        elif next_week:
+            days = 7
+        else:
+            days = (WEEKDAYS[weekday] - today.weekday()) % 7
+            if days == 0 and modifier != "this":
+                days = 7  # "tuesday" on a tuesday means next week's
+        return _Match(days=days, clock=clock)
+
+    if clock is not None:
+        return _Match(days=0, clock=clock, roll=True)
+
+    return None
+
+
+def _fallback(text: str, now: datetime) -> _Match | None:
+    """dateparser, if it's installed. Imported on first use."""
+    dateparser = _dateparser if _dateparser is not None else _load_dateparser()
+    if not dateparser:
+        return None
+    result = dateparser.parse(
+        text,
+        settings={
+            "RELATIVE_BASE": now.replace(tzinfo=None),
+            "PREFER_DATES_FROM": "future",
+        },
+    )
+    if result is None:
+        return None
+    if result.tzinfo is not None:
+        result = result.astimezone(timezone.utc)  # "3pm EST" → 20:00 UTC
+    return _Match(when=result.replace(tzinfo=None))
+
+
+def _resolve(match: _Match, now: datetime) -> datetime:
+    naive = now.replace(tzinfo=None)
+    if match.when is not None:
+        result = match.when
+    elif match.delta is not None:
+        result = naive + match.delta
+    else:
+        result = naive + timedelta(days=match.days)
+        if match.clock is not None:
+            result = datetime.combine(result.date(), match.clock)
+            if match.roll and result <= naive:
+                result += timedelta(days=1)  # "3pm" at 4pm is tomorrow's
+    return result.replace(tzinfo=timezone.utc)
+
+
+def parse_when(
+    text: str,
+    now: datetime | None = None,
+    fallback: bool = True,
+) -> datetime | None:
+    """The moment text refers to, as an aware UTC datetime, or None.
+
+    Rules first; dateparser only on a miss, and only if fallback.
+    Day-only forms keep the current time of day, as dateparser does.
+    """
+    now = now or datetime.now(timezone.utc)
+    key = (text.strip().lower(), now.date())
+
+    if key in _memo:
+        _memo.move_to_end(key)
+        match = _memo[key]
+    else:
+        match = _rules(key[0], key[1])
+        if match is None and fallback:
+            # Resolved against this exact moment — not kept
+            match = _fallback(text, now)
+            if match is not None:
+                return _resolve(match, now)
+        if match is not None or fallback:
+            _memo[key] = match
+            if len(_memo) > MEMO_SIZE:
+                _memo.popitem(last=False)
+
+    return _resolve(match, now) if match is not None else None
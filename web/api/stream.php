@@ -11,6 +11,7 @@ require_once __DIR__ . '/../lib/jobs.php';
  *
  * Events:
  *   event: chunk\ndata: {"t": "text"}\n\n
+ *   event: span\ndata: {"tag": "say", "content": "text"}\n\n   (a finished display block)
  *   event: done\ndata: {}\n\n
  *
  * Falls back gracefully if stream file doesn't exist (job already complete).
@@ -98,6 +99,13 @@ try {
                 break;
             }
 
+            if (isset($data['span']) && is_array($data['span'])) {
+                $encoded = json_encode($data['span'], JSON_UNESCAPED_UNICODE);
+                echo "event: span\ndata: " . $encoded . "\n\n";
+                flush();
+                continue;
+            }
+
             if (isset($data['t'])) {
                 $encoded = json_encode($data, JSON_UNESCAPED_UNICODE);
                 echo "event: chunk\ndata: " . $encoded . "\n\n";
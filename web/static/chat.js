@@ -961,6 +961,8 @@
     let bodyDiv = null;   // the body element inside it
     let sayRenderer = null;
     let lastBlockTag = null;
+    let spans = [];       // finished display blocks, parsed by the server
+    let sayShown = '';    // say text already streamed live for the open block
 
     function ensureMessageDiv() {
       if (msgDiv) return;
@@ -1016,27 +1018,58 @@
           // Breathing stops, text begins
         }
 
+        // Finished blocks arrive as span events; chunks only stream the
+        // say that is still open
         const newBlocks = parser.feed(data.t);
-        if (newBlocks.length > 0) {
-          renderNewBlocks(newBlocks);
-        } else if (parser.getCurrentTag() === 'say') {
-          // Still accumulating say content — stream it live
+        if (newBlocks.length === 0 && parser.getCurrentTag() === 'say') {
           ensureMessageDiv();
           if (!sayRenderer) {
             sayRenderer = createSayRenderer(bodyDiv);
           }
           if (data.t && !data.t.startsWith('<')) {
             sayRenderer.enqueue(data.t);
+            sayShown += data.t;
           }
         }
       } catch { /* ignore parse errors in stream */ }
     });
 
+    es.addEventListener('span', function(e) {
+      try {
+        const span = JSON.parse(e.data);
+        if (!span.tag) return;
+        spans.push(span);
+
+        if (span.tag === 'say') {
+          // Whatever of it wasn't streamed live yet
+          const shown = sayShown.trim();
+          let rest = span.content;
+          if (shown && span.content.startsWith(shown)) {
+            rest = span.content.substring(shown.length);
+          } else if (shown) {
+            rest = '';  // live text diverged; done re-renders from spans
+          }
+          if (rest) {
+            ensureMessageDiv();
+            if (!sayRenderer) sayRenderer = createSayRenderer(bodyDiv);
+            sayRenderer.enqueue(rest);
+          }
+          if (sayRenderer) { sayRenderer.finishBlock(); sayRenderer = null; }
+          sayShown = '';
+          lastBlockTag = 'say';
+        } else {
+          renderNewBlocks([span]);
+        }
+      } catch { /* ignore parse errors in stream */ }
+    });
+
     es.addEventListener('done', function() {
       es.close();
 
-      // Finalize any remaining content
-      const allBlocks = parser.finalize();
+      // Finalize any remaining content. The server's spans are
+      // authoritative; the local parse covers untagged replies.
+      const localBlocks = parser.finalize();
+      const allBlocks = spans.length > 0 ? spans : localBlocks;
       if (allBlocks.length > 0) {
         // Re-render complete message to ensure correctness
         ensureMessageDiv();
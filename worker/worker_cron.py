@@ -27,7 +27,10 @@ if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 
 from agents.orchestrator import turn, TurnConfig, TurnResult
+from agents.writebehind import ReplyJournal
 from agents.claude_client import ClaudeConfig
+from wake.schema import migrate
+from wake import fts_maintenance
 
 # How long the worker loops before exiting (cron restarts it next minute).
 # Set >60 so the next cron invocation overlaps and waits for handoff — zero gap.
@@ -36,6 +39,10 @@ MAX_RUN_SECONDS = 65
 IDLE_SLEEP = 0.05
 # Sleep between job checks when idle (no trigger)
 POLL_SLEEP = 0.5
+# How often an idle worker checks whether FTS maintenance is due
+FTS_CHECK_SECONDS = 60
+# Most an idle worker spends on FTS maintenance in one go
+FTS_IDLE_SECONDS = 2.0
 
 
 @dataclass
@@ -56,6 +63,8 @@ class CronConfig:
     summaries_path: Path | None = None
     prompt_dir: Path | None = None
     context_dir: Path | None = None
+    same_turn_recall: bool = False
+    write_behind: bool = False
 
 
 def load_config(path: Path) -> CronConfig:
@@ -95,6 +104,8 @@ def load_config(path: Path) -> CronConfig:
         claude_model=raw.get("claude_model"),
         claude_api_key=raw.get("claude_api_key"),
         verbose=bool(raw.get("verbose", True)),
+        same_turn_recall=bool(raw.get("same_turn_recall", False)),
+        write_behind=bool(raw.get("write_behind", False)),
         summaries_path=resolve(
             raw.get("summaries_path", ""),
             REPO_ROOT / "data" / "summaries.sqlite",
@@ -360,7 +371,42 @@ def maybe_run_mirror(cfg: CronConfig) -> None:
         log(f"mirror exception (non-fatal): {e}")
 
 
-def process_job(cfg: CronConfig, job: dict) -> None:
+def maybe_run_fts_maintenance(cfg: CronConfig) -> None:
+    """Merge FTS segments in idle time, if a run is due.
+
+    Stops between merge steps as soon as a job or trigger shows up.
+    Never raises — maintenance failures must not break conversation
+    processing.
+    """
+    try:
+        if not fts_maintenance.due(cfg.db_path):
+            return
+
+        def job_waiting() -> bool:
+            return (
+                (cfg.state_dir / "trigger").exists()
+                or find_queued_job(cfg.jobs_dir) is not None
+            )
+
+        report = fts_maintenance.run(
+            cfg.db_path,
+            time_budget=FTS_IDLE_SECONDS,
+            should_stop=job_waiting,
+            summaries_path=cfg.summaries_path,
+        )
+        merged = [
+            f"{r.index} {r.before.segments}→{r.after.segments}"
+            for r in report.indexes if r.before.segments != r.after.segments
+        ]
+        log(
+            f"fts maintenance: {', '.join(merged) or 'nothing to merge'}"
+            f"{'' if report.complete else ' (unfinished)'}"
+        )
+    except Exception as e:
+        log(f"fts maintenance exception (non-fatal): {e}")
+
+
+def process_job(cfg: CronConfig, job: dict, journal: ReplyJournal | None = None) -> None:
     job_id = str(job.get("id", ""))
     if not job_id:
         raise RuntimeError("Job missing ID")
@@ -390,6 +436,9 @@ def process_job(cfg: CronConfig, job: dict) -> None:
         ambient_path=cfg.ambient_path,
         claude_config=cc,
         context_dir=cfg.context_dir,
+        same_turn_recall=cfg.same_turn_recall,
+        write_behind=journal,
+        on_error=lambda msg: log(f"{msg} (non-fatal)"),
     )
 
     # Set up streaming
@@ -400,6 +449,11 @@ def process_job(cfg: CronConfig, job: dict) -> None:
         stream_fh.write(json.dumps({"t": text}) + "\n")
         stream_fh.flush()
 
+    def on_span(span: dict) -> None:
+        # A finished say/do/narrate block, parsed server-side
+        stream_fh.write(json.dumps({"span": span}) + "\n")
+        stream_fh.flush()
+
     try:
         # Run the turn
         result: TurnResult = turn(
@@ -409,6 +463,7 @@ def process_job(cfg: CronConfig, job: dict) -> None:
             tags=tags if tags else None,
             image_path=image_path,
             on_chunk=on_chunk,
+            on_span=on_span,
         )
 
         if not result.success:
@@ -449,7 +504,11 @@ def process_job(cfg: CronConfig, job: dict) -> None:
 
         log(f"job {job_id} done (turn {result.turn}, {len(display)} display spans)")
 
-        # Check if Mirror should fire after successful job processing
+        # Check if Mirror should fire after successful job processing.
+        # It reads the event log, so the reply goes in first — Mono
+        # already has it, this wait is off the turn's path
+        if journal is not None:
+            journal.drain()
         maybe_run_mirror(cfg)
 
     finally:
@@ -513,10 +572,26 @@ def run(cfg: CronConfig) -> int:
     signal.signal(signal.SIGTERM, handle_signal)
     signal.signal(signal.SIGINT, handle_signal)
 
+    # Schema migration happens once here, not per turn
+    migrate(cfg.db_path)
+
     start = time.monotonic()
     last_cleanup = 0.0
+    last_fts_check = 0.0
+    journal = None
 
     try:
+        # Claude's replies written behind: whatever the last worker
+        # journalled and didn't apply goes in before the first job
+        if cfg.write_behind:
+            journal = ReplyJournal(
+                cfg.db_path,
+                on_error=lambda e: log(f"write-behind error (retried at next drain): {e}"),
+            )
+            if journal.pending:
+                log(f"write-behind: applying {journal.pending} journalled replies")
+            journal.drain()
+
         while not shutdown:
             elapsed = time.monotonic() - start
             if elapsed >= MAX_RUN_SECONDS:
@@ -540,6 +615,10 @@ def run(cfg: CronConfig) -> int:
             # Look for a queued job
             queued = find_queued_job(cfg.jobs_dir)
             if queued is None:
+                if not triggered and now_mono - last_fts_check >= FTS_CHECK_SECONDS:
+                    maybe_run_fts_maintenance(cfg)
+                    last_fts_check = time.monotonic()
+                    continue
                 time.sleep(IDLE_SLEEP if triggered else POLL_SLEEP)
                 continue
 
@@ -551,7 +630,7 @@ def run(cfg: CronConfig) -> int:
             # Process
             update_bridge_state(cfg, busy=True)
             try:
-                process_job(cfg, claimed)
+                process_job(cfg, claimed, journal)
             except Exception as e:
                 job_id = str(claimed.get("id", ""))
                 log(f"job {job_id} error: {e}")
@@ -568,6 +647,9 @@ def run(cfg: CronConfig) -> int:
                 update_bridge_state(cfg, busy=False)
 
     finally:
+        # Apply what's journalled before the next worker takes the lock
+        if journal is not None:
+            journal.close()
         # Final heartbeat before exit
         try:
             update_bridge_state(cfg, busy=False)